@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+
+import httpx
+import pytest
+import respx
+
+from dequest import DequestClient, DequestConfig, PathParameter, async_client
+from dequest.http import ConsumerType, async_request
+from dequest.utils import AsyncLoopManager, map_json_to_dto
+
+CALLS = 100
+
+
+@dataclass
+class UserDto:
+    name: str
+
+
+@pytest.fixture
+def upstream():
+    with respx.mock:
+        respx.get(url__regex=r"https://api\.example\.com/users/\d+").mock(
+            return_value=httpx.Response(200, json={"name": "Alice"}),
+        )
+        yield
+
+
+@pytest.mark.benchmark(group="async-throughput")
+def test_async_request_batch(benchmark, upstream):
+    loop = AsyncLoopManager.get_event_loop()
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(
+                async_request("GET", f"https://api.example.com/users/{i}", {}, None, None, None, 30, ConsumerType.JSON)
+                for i in range(CALLS)
+            ),
+        )
+
+    def run_batch():
+        return asyncio.run_coroutine_threadsafe(fetch_all(), loop).result()
+
+    assert len(benchmark(run_batch)) == CALLS
+
+
+@pytest.mark.benchmark(group="async-throughput")
+def test_async_client_fire_and_forget(benchmark, upstream):
+    done = threading.Event()
+    completed = 0
+
+    async def on_response(response):
+        nonlocal completed
+        completed += 1
+        if completed == CALLS:
+            done.set()
+
+    @async_client(url="https://api.example.com/users/{user_id}", callback=on_response)
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    def run_batch():
+        nonlocal completed
+        completed = 0
+        done.clear()
+        for i in range(CALLS):
+            get_user(i)
+        return done.wait(timeout=30)
+
+    assert benchmark(run_batch)
+
+
+@pytest.fixture(params=[1, 2, 4], ids=lambda shards: f"{shards}-shards")
+def loop_shards(request):
+    AsyncLoopManager._stop()
+    DequestConfig.config(async_loop_shards=request.param)
+    yield request.param
+    AsyncLoopManager._stop()
+    DequestConfig.config(async_loop_shards=1)
+
+
+@pytest.mark.benchmark(group="async-loop-shards")
+@pytest.mark.usefixtures("loop_shards")
+def test_async_client_with_mapping_callbacks(benchmark, upstream):
+    # Each response is mapped to DTOs in its callback, CPU work that holds up the other calls of its loop
+    done = threading.Event()
+    completed = 0
+    lock = threading.Lock()
+
+    async def on_response(response):
+        nonlocal completed
+        map_json_to_dto(UserDto, [response] * 200)
+        with lock:
+            completed += 1
+            if completed == CALLS:
+                done.set()
+
+    @async_client(url="https://api.example.com/users/{user_id}", callback=on_response, client=DequestClient())
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    def run_batch():
+        nonlocal completed
+        completed = 0
+        done.clear()
+        for i in range(CALLS):
+            get_user(i)
+        return done.wait(timeout=30)
+
+    assert benchmark(run_batch)
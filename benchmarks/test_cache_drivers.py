@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+
+from dequest.cache.cache_drivers import InMemoryCacheDriver, TieredCacheDriver
+
+PAYLOAD = json.dumps({"users": [{"id": i, "name": f"User {i}"} for i in range(100)]})
+
+
+def _in_memory_driver():
+    return InMemoryCacheDriver()
+
+
+def _redis_driver():
+    # Runs against a real server, e.g. `DEQUEST_BENCHMARK_REDIS_HOST=localhost pytest benchmarks`
+    host = os.environ.get("DEQUEST_BENCHMARK_REDIS_HOST")
+    if not host:
+        pytest.skip("DEQUEST_BENCHMARK_REDIS_HOST is not set")
+    from redis.exceptions import ConnectionError as RedisConnectionError  # noqa: PLC0415
+
+    from dequest.cache.cache_drivers import RedisDriver  # noqa: PLC0415
+
+    driver = RedisDriver(host, port=int(os.environ.get("DEQUEST_BENCHMARK_REDIS_PORT", "6379")))
+    try:
+        driver.client.ping()
+    except RedisConnectionError:
+        pytest.skip(f"Redis is not reachable at {host}")
+    return driver
+
+
+def _tiered_driver():
+    return TieredCacheDriver(_redis_driver())
+
+
+def _django_driver():
+    pytest.importorskip("django")
+    from django.conf import settings  # noqa: PLC0415
+
+    if not settings.configured:
+        settings.configure(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    from dequest.cache.cache_drivers import DjangoCacheDriver  # noqa: PLC0415
+
+    return DjangoCacheDriver()
+
+
+@pytest.fixture(
+    params=[_in_memory_driver, _redis_driver, _tiered_driver, _django_driver],
+    ids=["in_memory", "redis", "tiered", "django"],
+)
+def driver(request):
+    driver = request.param()
+    driver.clear()
+    yield driver
+    driver.clear()
+
+
+@pytest.mark.benchmark(group="cache-set")
+def test_set_key(benchmark, driver):
+    benchmark(driver.set_key, "dequest-benchmark", PAYLOAD, 60)
+
+    assert driver.get_key("dequest-benchmark") == PAYLOAD
+
+
+@pytest.mark.benchmark(group="cache-get-hit")
+def test_get_key_hit(benchmark, driver):
+    driver.set_key("dequest-benchmark", PAYLOAD, 60)
+
+    assert benchmark(driver.get_key, "dequest-benchmark") == PAYLOAD
+
+
+@pytest.mark.benchmark(group="cache-get-miss")
+def test_get_key_miss(benchmark, driver):
+    assert benchmark(driver.get_key, "dequest-benchmark-missing") is None
@@ -0,0 +1,33 @@
+import hashlib
+import json
+
+import pytest
+
+from dequest.utils import generate_cache_key
+
+URL = "https://api.example.com/users/1/orders"
+PARAMS = {"page": 3, "per_page": 50, "sort": "-created_at", "status": ["paid", "shipped"]}
+HEADERS = {"Accept-Language": "fr"}
+
+
+def _json_md5_cache_key(url, params):
+    # Previous implementation, kept as the reference point
+    cache_string = json.dumps({"url": url, "params": params}, sort_keys=True)
+    return hashlib.md5(cache_string.encode()).hexdigest()
+
+
+@pytest.mark.benchmark(group="cache-key")
+@pytest.mark.parametrize("params", [None, PARAMS], ids=["no-params", "params"])
+def test_json_md5_cache_key(benchmark, params):
+    benchmark(_json_md5_cache_key, URL, params)
+
+
+@pytest.mark.benchmark(group="cache-key")
+@pytest.mark.parametrize("params", [None, PARAMS], ids=["no-params", "params"])
+def test_generate_cache_key(benchmark, params):
+    benchmark(generate_cache_key, URL, params)
+
+
+@pytest.mark.benchmark(group="cache-key")
+def test_generate_cache_key_with_headers(benchmark):
+    benchmark(generate_cache_key, URL, PARAMS, HEADERS)
@@ -0,0 +1,110 @@
+import inspect
+
+import httpx
+import pytest
+import respx
+
+from dequest import JsonBody, PathParameter, QueryParameter, get_cache, sync_client
+from dequest.utils import extract_parameters
+
+URL = "https://api.example.com/users/1"
+USER = {"id": 1, "name": "Alice", "email": "alice@example.com", "city": "Berlin"}
+
+
+class UserDTO:
+    id: int
+    name: str
+    email: str
+    city: str
+
+    def __init__(self, id, name, email, city):  # noqa: A002
+        self.id = id
+        self.name = name
+        self.email = email
+        self.city = city
+
+
+@pytest.fixture
+def upstream():
+    # The transport is mocked, so both sides of the comparison measure the client code only
+    with respx.mock:
+        respx.get(URL).mock(return_value=httpx.Response(200, json=USER))
+        yield
+
+
+@pytest.mark.benchmark(group="client-overhead")
+def test_raw_httpx(benchmark, upstream):
+    def get_user():
+        response = httpx.request("GET", URL, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    assert benchmark(get_user) == USER
+
+
+@pytest.mark.benchmark(group="client-overhead")
+def test_raw_httpx_shared_client(benchmark, upstream):
+    with httpx.Client(timeout=30) as client:
+
+        def get_user():
+            response = client.get(URL)
+            response.raise_for_status()
+            return response.json()
+
+        assert benchmark(get_user) == USER
+
+
+@pytest.mark.benchmark(group="client-overhead")
+def test_sync_client(benchmark, upstream):
+    @sync_client(url="https://api.example.com/users/{user_id}")
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    assert benchmark(get_user, 1) == USER
+
+
+@pytest.mark.benchmark(group="client-overhead")
+def test_sync_client_with_dto(benchmark, upstream):
+    @sync_client(url="https://api.example.com/users/{user_id}", dto_class=UserDTO)
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    assert benchmark(get_user, 1).name == USER["name"]
+
+
+@pytest.mark.benchmark(group="client-overhead")
+def test_sync_client_cache_hit(benchmark, upstream):
+    get_cache().clear()
+
+    @sync_client(url="https://api.example.com/users/{user_id}", enable_cache=True)
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+
+    assert benchmark(get_user, 1) == USER
+
+
+def _search_users(
+    city: QueryParameter[str, "city_name"],  # noqa: F821
+    user_id: PathParameter[int],
+    name: JsonBody,
+    limit: QueryParameter[int] = 10,
+):
+    pass
+
+
+@pytest.mark.benchmark(group="extract-parameters")
+def test_extract_parameters(benchmark):
+    signature = inspect.signature(_search_users)
+
+    path_params, query_params, _, json_body = benchmark(
+        extract_parameters,
+        signature,
+        ("Berlin",),
+        {"user_id": 1, "name": "Alice"},
+    )
+
+    assert path_params == {"user_id": 1}
+    assert query_params == {"city_name": "Berlin", "limit": 10}
+    assert json_body == {"name": "Alice"}
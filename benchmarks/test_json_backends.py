@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from dequest import DequestConfig
+from dequest.config import JsonBackend
+from dequest.serialization import json_dumps, json_loads
+
+BACKEND_MODULES = {
+    JsonBackend.STDLIB: "json",
+    JsonBackend.ORJSON: "orjson",
+    JsonBackend.UJSON: "ujson",
+    JsonBackend.MSGSPEC: "msgspec",
+}
+
+# Roughly 1 MB, so the reported timings read as the cost per MB
+PAYLOAD = json.dumps(
+    [
+        {"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "score": i / 3, "tags": ["a", "b"]}
+        for i in range(9_000)
+    ],
+).encode()
+PAYLOAD_MB = len(PAYLOAD) / 1_000_000
+
+
+@pytest.fixture(params=list(JsonBackend), ids=str)
+def json_backend(request):
+    pytest.importorskip(BACKEND_MODULES[request.param])
+    DequestConfig.config(JSON_BACKEND=request.param)
+    yield request.param
+    DequestConfig.config(JSON_BACKEND=JsonBackend.STDLIB)
+
+
+@pytest.mark.benchmark(group="json-decode-per-mb")
+def test_json_loads(benchmark, json_backend):
+    benchmark.extra_info["payload_mb"] = PAYLOAD_MB
+
+    result = benchmark(json_loads, PAYLOAD)
+
+    assert len(result) == 9_000  # noqa: PLR2004
+
+
+@pytest.mark.benchmark(group="json-encode-per-mb")
+def test_json_dumps(benchmark, json_backend):
+    benchmark.extra_info["payload_mb"] = PAYLOAD_MB
+    document = json.loads(PAYLOAD)
+
+    result = benchmark(json_dumps, document)
+
+    assert isinstance(result, bytes)
@@ -0,0 +1,102 @@
+import json
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import pytest
+
+from dequest.utils import map_json_to_dto
+
+
+@dataclass
+class UserDTO:
+    id: int
+    name: str
+    email: str
+    score: float
+
+
+@dataclass(slots=True)
+class SlottedUserDTO:
+    id: int
+    name: str
+    email: str
+    score: float
+
+
+class TupleUserDTO(NamedTuple):
+    id: int
+    name: str
+    email: str
+    score: float
+
+
+USERS = {
+    "users": [{"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "score": i / 3} for i in range(10_000)],
+}
+
+
+@pytest.mark.benchmark(group="json-mapping-single")
+@pytest.mark.parametrize("dto_class", [UserDTO, SlottedUserDTO, TupleUserDTO], ids=lambda dto: dto.__name__)
+def test_map_single_json_object_to_dto(benchmark, dto_class):
+    user = benchmark(map_json_to_dto, dto_class, USERS["users"][0])
+
+    assert user.name == "User 0"
+
+
+@pytest.mark.benchmark(group="json-mapping-10k")
+@pytest.mark.parametrize("dto_class", [UserDTO, SlottedUserDTO, TupleUserDTO], ids=lambda dto: dto.__name__)
+def test_map_json_to_dto(benchmark, dto_class):
+    users = benchmark(map_json_to_dto, dto_class, USERS, "users")
+
+    assert len(users) == len(USERS["users"])
+
+
+@pytest.mark.benchmark(group="json-mapping-10k")
+def test_map_json_to_dto_coerce_types(benchmark):
+    users = benchmark(map_json_to_dto, UserDTO, USERS, "users", coerce_types=True)
+
+    assert len(users) == len(USERS["users"])
+
+
+@pytest.mark.benchmark(group="json-mapping-10k")
+def test_map_json_to_columns(benchmark):
+    columns = benchmark(map_json_to_dto, UserDTO, USERS, "users", columnar=True)
+
+    assert len(columns["id"]) == len(USERS["users"])
+
+
+@pytest.mark.benchmark(group="json-mapping-10k-raw")
+def test_map_raw_json_to_pydantic_model(benchmark):
+    pydantic = pytest.importorskip("pydantic")
+
+    class UserModel(pydantic.BaseModel):
+        id: int
+        name: str
+        email: str
+        score: float
+
+    users = benchmark(map_json_to_dto, UserModel, json.dumps(USERS["users"]).encode())
+
+    assert len(users) == len(USERS["users"])
+
+
+@pytest.mark.benchmark(group="json-mapping-10k-raw")
+def test_map_raw_json_to_msgspec_struct(benchmark):
+    msgspec = pytest.importorskip("msgspec")
+
+    class UserStruct(msgspec.Struct):
+        id: int
+        name: str
+        email: str
+        score: float
+
+    users = benchmark(map_json_to_dto, UserStruct, json.dumps(USERS["users"]).encode())
+
+    assert len(users) == len(USERS["users"])
+
+
+@pytest.mark.benchmark(group="json-mapping-10k-raw")
+def test_map_raw_json_to_dataclass(benchmark):
+    users = benchmark(map_json_to_dto, UserDTO, json.dumps(USERS["users"]).encode())
+
+    assert len(users) == len(USERS["users"])
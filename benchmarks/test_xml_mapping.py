@@ -0,0 +1,99 @@
+import inspect
+from typing import get_type_hints
+
+import pytest
+from defusedxml import ElementTree
+
+from dequest.utils import _parse_element, map_xml_to_dto
+
+
+class AddressDTO:
+    street: str
+    city: str
+
+    def __init__(self, street, city):
+        self.street = street
+        self.city = city
+
+
+class UserDTO:
+    id: str
+    name: str
+    email: str
+    phone: str
+    website: str
+    address: AddressDTO
+
+    def __init__(self, id, name, email, phone, website, address):  # noqa: A002
+        self.id = id
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.website = website
+        self.address = address
+
+
+def _legacy_parse_element(dto_class, element):
+    """The per-element introspection implementation that the mapping plans replaced."""
+    dto_fields = get_type_hints(dto_class).keys()
+    init_params = inspect.signature(dto_class).parameters
+
+    mapped_data = {}
+    for key in dto_fields:
+        if key in element.attrib:
+            mapped_data[key] = element.attrib[key]
+        else:
+            child = element.find(key)
+            if child is not None:
+                field_annotation = get_type_hints(dto_class)[key]
+                if isinstance(field_annotation, type) and hasattr(field_annotation, "__annotations__"):
+                    mapped_data[key] = _legacy_parse_element(field_annotation, child)
+                else:
+                    mapped_data[key] = child.text
+
+    init_data = {k: v for k, v in mapped_data.items() if k in init_params}
+
+    return dto_class(**init_data)
+
+
+def _user_xml(index):
+    return (
+        f'<User id="{index}"><name>User {index}</name><email>user{index}@example.com</email>'
+        f"<phone>555-{index:04d}</phone><website>example.com</website><company>ACME</company>"
+        f"<address><street>{index} Main St</street><city>Hometown</city></address></User>"
+    )
+
+
+@pytest.fixture(scope="module", params=[1, 1_000], ids=["single", "1k-items"])
+def users_element(request):
+    return ElementTree.fromstring(f"<Users>{''.join(_user_xml(i) for i in range(request.param))}</Users>")
+
+
+@pytest.mark.benchmark(group="xml-mapping")
+def test_parse_elements_with_mapping_plan(benchmark, users_element):
+    users = benchmark(lambda: [_parse_element(UserDTO, child) for child in users_element])
+
+    assert users[0].address.city == "Hometown"
+
+
+@pytest.mark.benchmark(group="xml-mapping")
+def test_parse_elements_legacy(benchmark, users_element):
+    users = benchmark(lambda: [_legacy_parse_element(UserDTO, child) for child in users_element])
+
+    assert users[0].address.city == "Hometown"
+
+
+@pytest.mark.benchmark(group="xml-mapping-end-to-end")
+def test_map_xml_to_dto_single(benchmark):
+    user = benchmark(map_xml_to_dto, UserDTO, _user_xml(0))
+
+    assert user.address.city == "Hometown"
+
+
+@pytest.mark.benchmark(group="xml-mapping-end-to-end")
+def test_map_xml_to_dto_10k_items(benchmark):
+    xml_data = f"<Users>{''.join(_user_xml(i) for i in range(10_000))}</Users>"
+
+    users = benchmark(map_xml_to_dto, UserDTO, xml_data)
+
+    assert len(users) == 10_000  # noqa: PLR2004
@@ -1,20 +1,23 @@
 from . import exceptions
 from .cache import get_cache
 from .circuit_breaker import CircuitBreaker
-from .clients import async_client, sync_client
+from .clients import DequestClient, async_client, sync_client
 from .config import DequestConfig
 from .http import ConsumerType, HttpMethod
-from .parameter_types import FormParameter, JsonBody, PathParameter, QueryParameter
+from .parameter_types import FileBody, FormParameter, JsonBody, PathParameter, QueryParameter, StreamBody
 
 __all__ = [
     "CircuitBreaker",
     "ConsumerType",
+    "DequestClient",
     "DequestConfig",
+    "FileBody",
     "FormParameter",
     "HttpMethod",
     "JsonBody",
     "PathParameter",
     "QueryParameter",
+    "StreamBody",
     "async_client",
     "exceptions",
     "get_cache",
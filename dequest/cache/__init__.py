@@ -1,5 +1,12 @@
-from ._cache import Cache
+import functools
 
+from ._cache import Cache, CacheBatch
 
+
+@functools.cache
 def get_cache() -> Cache:
+    """Returns the process-wide cache of the provider set in DequestConfig.CACHE_PROVIDER."""
     return Cache()
+
+
+__all__ = ["Cache", "CacheBatch", "get_cache"]
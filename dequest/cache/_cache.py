@@ -1,28 +1,124 @@
+from collections import defaultdict
+
 from dequest.cache.cache_driver_factory import CacheDriverFactory
+from dequest.cache.cache_drivers.cache_driver import CacheDriver
 from dequest.config import DequestConfig
 
 
-class SingletonClass(type):
-    _instance = None
-
-    def __call__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super().__call__(*args, **kwargs)
-        return cls._instance
+class Cache:
+    def __init__(
+        self,
+        provider: str | None = None,
+        driver: CacheDriver | None = None,
+        namespace: str | None = None,
+        version: int | str | None = None,
+    ):
+        """
+        :param provider: Cache provider to create the driver of, defaults to DequestConfig.CACHE_PROVIDER.
+        :param driver: Ready-made cache driver to use instead of creating one for the provider.
+        :param namespace: Prefix of the keys of this cache, so that invalidate() only deletes them.
+        :param version: Version of the keys, bumping it makes the entries stored by older versions unreachable.
+        """
+        if driver is None:
+            self.provider = provider or DequestConfig.CACHE_PROVIDER
+            self.driver = CacheDriverFactory.create_driver(self.provider)
+        else:
+            self.provider = provider or type(driver).__name__
+            self.driver = driver
+        # Drivers reporting cache events themselves, e.g. the evictions of InMemoryCacheDriver, use the same label
+        if hasattr(self.driver, "provider"):
+            self.driver.provider = self.provider
+        self.namespace = namespace
+        self.version = version
+        if namespace is None:
+            self.key_prefix = ""
+        elif version is None:
+            self.key_prefix = f"{namespace}:"
+        else:
+            self.key_prefix = f"{namespace}:v{version}:"
 
-
-class Cache(metaclass=SingletonClass):
-    def __init__(self):
-        self.driver = CacheDriverFactory.create_driver(DequestConfig.CACHE_PROVIDER)
+    def _key(self, key):
+        return self.key_prefix + key
 
     def delete_key(self, key):
-        return self.driver.delete_key(key)
+        return self.driver.delete_key(self._key(key))
 
     def set_key(self, key, value, expire=None):
-        return self.driver.set_key(key, value, expire)
+        return self.driver.set_key(self._key(key), value, expire)
+
+    def record_lookups(self, values: list):
+        """
+        Reports the values read with `record_metrics=False` as hits or misses to the metrics collector,
+        a None value is a miss.
+        """
+        metrics = DequestConfig.METRICS_COLLECTOR
+        if metrics is not None:
+            for value in values:
+                metrics.cache_event(self.provider, "hit" if value is not None else "miss")
+
+    def get_key(self, key, record_metrics: bool = True):
+        """
+        :param record_metrics: Whether the lookup is reported as a hit or miss to the metrics collector,
+                               disable it for the lookups of entries that aren't cached responses.
+        """
+        value = self.driver.get_key(self._key(key))
+        if record_metrics:
+            self.record_lookups([value])
+        return value
+
+    def get_many(self, keys: list[str], record_metrics: bool = True) -> list:
+        """Returns the values of the keys in order (None for the missing ones), in one round-trip when supported."""
+        keys = [self._key(key) for key in keys]
+        get_many = getattr(self.driver, "get_many", None)
+        values = get_many(keys) if get_many is not None else [self.driver.get_key(key) for key in keys]
+        if record_metrics:
+            self.record_lookups(values)
+        return values
+
+    def set_many(self, mapping: dict, expire=None):
+        mapping = {self._key(key): value for key, value in mapping.items()}
+        set_many = getattr(self.driver, "set_many", None)
+        if set_many is not None:
+            return set_many(mapping, expire)
+        for key, value in mapping.items():
+            self.driver.set_key(key, value, expire)
+        return None
 
-    def get_key(self, key):
-        return self.driver.get_key(key)
+    def invalidate(self):
+        """
+        Deletes the entries of the namespace, of every version, without touching the other keys of the
+        backend. Without a namespace, clears the whole cache.
+        """
+        if self.namespace is None:
+            return self.driver.clear()
+        return self.driver.delete_prefix(f"{self.namespace}:")
 
     def clear(self):
         return self.driver.clear()
+
+
+class CacheBatch:
+    """
+    Cache accesses of a batch of calls: the cached responses are read upfront with one get_many
+    and the fresh ones are buffered, to be written with one set_many per expiration by flush().
+    """
+
+    def __init__(self, cache: Cache, keys: list[str], prefetch_keys: list[str] = ()):
+        """
+        :param keys: Keys of the cached responses, their lookups are reported as hits or misses.
+        :param prefetch_keys: Keys of other entries the calls may read, fetched in the same round-trip.
+        """
+        self.cache = cache
+        all_keys = [*keys, *prefetch_keys]
+        values = cache.get_many(all_keys, record_metrics=False)
+        cache.record_lookups(values[: len(keys)])
+        self.cached = dict(zip(all_keys, values, strict=True))
+        self.writes: dict[int | None, dict] = defaultdict(dict)
+
+    def set_key(self, key, value, expire=None):
+        self.writes[expire][key] = value
+
+    def flush(self):
+        for expire, mapping in self.writes.items():
+            self.cache.set_many(mapping, expire)
+        self.writes.clear()
@@ -2,6 +2,7 @@ from dequest.cache.cache_drivers.cache_driver import CacheDriver
 from dequest.cache.cache_drivers.django_driver import DjangoCacheDriver
 from dequest.cache.cache_drivers.local_memory_driver import InMemoryCacheDriver
 from dequest.cache.cache_drivers.redis_driver import RedisDriver
+from dequest.cache.cache_drivers.tiered_driver import TieredCacheDriver
 from dequest.config import DequestConfig
 
 
@@ -11,13 +12,29 @@ class CacheDriverFactory:
         if strategy == "in_memory":
             return InMemoryCacheDriver()
         if strategy == "redis":
-            return RedisDriver(
-                host=DequestConfig.REDIS_HOST,
-                port=DequestConfig.REDIS_PORT,
-                db=DequestConfig.REDIS_DB,
-                password=DequestConfig.REDIS_PASSWORD,
-                ssl=DequestConfig.REDIS_SSL,
+            return CacheDriverFactory._create_redis_driver()
+        if strategy == "tiered":
+            return TieredCacheDriver(
+                CacheDriverFactory._create_redis_driver(),
+                l1_max_entries=DequestConfig.TIERED_L1_MAX_ENTRIES,
+                l1_ttl=DequestConfig.TIERED_L1_TTL,
+                invalidation=DequestConfig.TIERED_INVALIDATION,
             )
         if strategy == "django":
             return DjangoCacheDriver()
         raise ValueError("Invalid cache provider")
+
+    @staticmethod
+    def _create_redis_driver() -> RedisDriver:
+        return RedisDriver(
+            host=DequestConfig.REDIS_HOST,
+            port=DequestConfig.REDIS_PORT,
+            db=DequestConfig.REDIS_DB,
+            password=DequestConfig.REDIS_PASSWORD,
+            ssl=DequestConfig.REDIS_SSL,
+            max_connections=DequestConfig.REDIS_MAX_CONNECTIONS,
+            socket_timeout=DequestConfig.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=DequestConfig.REDIS_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=DequestConfig.REDIS_HEALTH_CHECK_INTERVAL,
+            key_prefix=DequestConfig.REDIS_KEY_PREFIX,
+        )
@@ -1,9 +1,11 @@
 from .django_driver import DjangoCacheDriver
 from .local_memory_driver import InMemoryCacheDriver
 from .redis_driver import RedisDriver
+from .tiered_driver import TieredCacheDriver
 
 __all__ = [
     "DjangoCacheDriver",
     "InMemoryCacheDriver",
     "RedisDriver",
+    "TieredCacheDriver",
 ]
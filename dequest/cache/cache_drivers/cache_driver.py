@@ -17,3 +17,15 @@ class CacheDriver(ABC):
     @abstractmethod
     def clear(self):
         pass
+
+    def delete_prefix(self, prefix):
+        """Deletes every key starting with the prefix."""
+        raise NotImplementedError(f"{type(self).__name__} can't delete keys by prefix")
+
+    def get_many(self, keys):
+        """Returns the values of the keys in order, None for the missing ones."""
+        return [self.get_key(key) for key in keys]
+
+    def set_many(self, mapping, expire=None):
+        for key, value in mapping.items():
+            self.set_key(key, value, expire)
@@ -1,4 +1,6 @@
-from dequest.utils import get_logger
+import logging
+
+from dequest.utils import get_logger, is_logged
 
 logger = get_logger()
 
@@ -18,10 +20,24 @@ class DjangoCacheDriver:
 
     def get_key(self, key):
         value = self.cache.get(key)
-        if value is not None:
-            logger.info("Cache hit for key: %s", key)
+        if value is not None and is_logged(logger, logging.DEBUG):
+            logger.debug("Cache hit for key: %s", key)
         return value
 
+    def get_many(self, keys):
+        values = self.cache.get_many(keys)
+        return [values.get(key) for key in keys]
+
+    def set_many(self, mapping, expire=None):
+        self.cache.set_many(mapping, timeout=expire)
+
+    def delete_prefix(self, prefix):
+        # Only some backends (e.g. django-redis) can find keys by pattern
+        delete_pattern = getattr(self.cache, "delete_pattern", None)
+        if delete_pattern is None:
+            raise NotImplementedError("The Django cache backend can't delete keys by prefix")
+        delete_pattern(f"{prefix}*")
+
     def clear(self):
         self.cache.clear()
         logger.info("Django cache cleared")
@@ -1,14 +1,18 @@
+import logging
 import time
 from collections import defaultdict
 
-from dequest.utils import get_logger
+from dequest.config import CacheProvider, DequestConfig
+from dequest.utils import get_logger, is_logged
 
 logger = get_logger()
 
 
 class InMemoryCacheDriver:
-    def __init__(self):
+    def __init__(self, provider: str = CacheProvider.IN_MEMORY):
+        """:param provider: Provider label of the eviction metrics, a Cache sets it to its own label."""
         self.store = defaultdict(dict)
+        self.provider = provider
         logger.info("Local memory cache initialized")
 
     def delete_key(self, key):
@@ -25,14 +29,38 @@ class InMemoryCacheDriver:
         cached_entry = self.store[key]
 
         if cached_entry and (cached_entry["expires_at"] is None or time.time() < cached_entry["expires_at"]):
-            logger.info("Cache hit for key: %s", key)
+            if is_logged(logger, logging.DEBUG):
+                logger.debug("Cache hit for key: %s", key)
             return cached_entry["data"]
 
         if cached_entry and cached_entry["expires_at"] is not None and time.time() > cached_entry["expires_at"]:
-            logger.info("Cache expired for key: %s", key)
+            if is_logged(logger, logging.DEBUG):
+                logger.debug("Cache expired for key: %s", key)
             self.store.pop(key, None)
+            if DequestConfig.METRICS_COLLECTOR is not None:
+                DequestConfig.METRICS_COLLECTOR.cache_event(self.provider, "eviction")
 
         return None
 
+    def get_many(self, keys):
+        return [self.get_key(key) for key in keys]
+
+    def get_many_with_ttl(self, keys):
+        """Returns the (value, remaining TTL in seconds, None without expiration) of the keys."""
+        entries = []
+        for key in keys:
+            value = self.get_key(key)
+            expires_at = self.store[key]["expires_at"] if value is not None else None
+            entries.append((value, None if expires_at is None else max(expires_at - time.time(), 0)))
+        return entries
+
+    def set_many(self, mapping, expire=None):
+        for key, value in mapping.items():
+            self.set_key(key, value, expire)
+
+    def delete_prefix(self, prefix):
+        for key in [key for key in self.store if key.startswith(prefix)]:
+            self.store.pop(key, None)
+
     def clear(self):
         self.store.clear()
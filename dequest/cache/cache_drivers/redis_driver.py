@@ -1,6 +1,9 @@
+import logging
+import re
+
 import redis
 
-from dequest.utils import get_logger
+from dequest.utils import get_logger, is_logged
 
 logger = get_logger()
 
@@ -14,7 +17,14 @@ class RedisDriver:
         db=0,
         password=None,
         ssl=False,
+        max_connections=None,
+        socket_timeout=None,
+        socket_connect_timeout=None,
+        health_check_interval=0,
+        key_prefix="dequest:",
     ):
+        # Every key is stored under the prefix, so clearing never touches the other data of the Redis DB
+        self.key_prefix = key_prefix
         self.client = redis.StrictRedis(
             host=host,
             port=port,
@@ -22,22 +32,65 @@ class RedisDriver:
             db=db,
             password=password,
             ssl=ssl,
+            max_connections=max_connections,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_connect_timeout,
+            health_check_interval=health_check_interval,
         )
         logger.info("Redis client initialized")
 
     def delete_key(self, key):
-        return self.client.delete(key)
+        return self.client.delete(self.key_prefix + key)
 
     def set_key(self, key, value, expire=None):
-        self.client.set(key, value, ex=expire)
+        self.client.set(self.key_prefix + key, value, ex=expire)
 
     def get_key(self, key):
-        value = self.client.get(key)
+        value = self.client.get(self.key_prefix + key)
         if value is not None:
-            logger.info("Cache hit for key: %s", key)
+            if is_logged(logger, logging.DEBUG):
+                logger.debug("Cache hit for key: %s", key)
             return value
 
         return None
 
+    def get_many(self, keys):
+        # A single MGET round-trip for all the keys
+        return self.client.mget([self.key_prefix + key for key in keys]) if keys else []
+
+    def get_many_with_ttl(self, keys):
+        """Returns the (value, remaining TTL in seconds, None without expiration) of the keys, in one round-trip."""
+        if not keys:
+            return []
+        keys = [self.key_prefix + key for key in keys]
+        with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.mget(keys)
+            for key in keys:
+                pipeline.pttl(key)
+            values, *ttls = pipeline.execute()
+        # PTTL is -1 for keys without expiration and -2 for missing ones
+        return [(value, ttl / 1000 if ttl >= 0 else None) for value, ttl in zip(values, ttls, strict=True)]
+
+    def set_many(self, mapping, expire=None):
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key, value in mapping.items():
+                pipeline.set(self.key_prefix + key, value, ex=expire)
+            pipeline.execute()
+
+    def delete_prefix(self, prefix, batch_size=1000):
+        """
+        Deletes the keys starting with the prefix. Keys are found incrementally with SCAN and deleted
+        with UNLINK, which frees the memory in the background, so large caches don't block the server.
+        """
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", self.key_prefix + prefix) + "*"
+        batch = []
+        for key in self.client.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                self.client.unlink(*batch)
+                batch.clear()
+        if batch:
+            self.client.unlink(*batch)
+
     def clear(self):
-        self.client.flushdb()
+        self.delete_prefix("")
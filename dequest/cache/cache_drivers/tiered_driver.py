@@ -0,0 +1,242 @@
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+from dequest.config import DequestConfig
+from dequest.utils import get_logger
+
+logger = get_logger()
+
+INVALIDATION_CHANNEL = "dequest:invalidate"
+# Kinds of invalidation messages, "{sender}:{kind}:{key or prefix}", a prefix evicts every key starting with it
+_KEY_INVALIDATION = "key"
+_PREFIX_INVALIDATION = "prefix"
+# Keyspace events of SET (with EX), the ones a write of this process triggers
+_WRITE_EVENTS = frozenset({"set", "expire"})
+# Seconds the keyspace events of the keys this process wrote are ignored for, their L1 entry is up to date
+_OWN_WRITE_WINDOW = 1.0
+
+
+class TieredCacheDriver:
+    """
+    Two-tier cache: a bounded in-process L1 (LRU, short TTL) in front of a shared L2 driver, e.g. RedisDriver.
+    Hits served by L1 skip the L2 round-trip. L1 entries live at most `l1_ttl` seconds, and never longer than
+    their L2 entry when L2 reports the remaining TTLs (get_many_with_ttl), so other workers' writes become visible
+    within that delay, or right away with invalidation enabled.
+    """
+
+    def __init__(
+        self,
+        l2,
+        l1_max_entries: int = 1024,
+        l1_ttl: float = 5,
+        invalidation: str | None = None,
+        channel: str = INVALIDATION_CHANNEL,
+    ):
+        """
+        :param l2: Shared cache driver behind the in-process tier.
+        :param l1_max_entries: Maximum number of entries kept in process, the least recently used are evicted.
+        :param l1_ttl: Maximum lifetime in seconds of an in-process entry.
+        :param invalidation: Keeps L1 coherent across processes when L2 is a RedisDriver. "pubsub" publishes every
+                             write of this driver to the other ones, "keyspace" listens to Redis keyspace
+                             notifications (the server must have notify-keyspace-events enabled). None disables it.
+        :param channel: Pub/sub channel of the "pubsub" invalidation.
+        """
+        self.l2 = l2
+        self.l1_max_entries = l1_max_entries
+        self.l1_ttl = l1_ttl
+        self.invalidation = invalidation
+        self.channel = channel
+        self._l1: OrderedDict[str, tuple[object, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        self._id = uuid.uuid4().hex
+        # Keys written by this process, with the deadline of their keyspace events, oldest first
+        self._own_writes: OrderedDict[str, float] = OrderedDict()
+        self._listener = None
+        if invalidation is not None:
+            self._listen(invalidation)
+
+    def _listen(self, invalidation: str):
+        client = getattr(self.l2, "client", None)
+        if client is None or not hasattr(client, "pubsub"):
+            raise ValueError("Cache invalidation requires a RedisDriver as L2")
+
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        if invalidation == "pubsub":
+            pubsub.subscribe(**{self.channel: self._on_invalidation})
+        elif invalidation == "keyspace":
+            db = client.connection_pool.connection_kwargs.get("db", 0)
+            pubsub.psubscribe(**{f"__keyspace@{db}__:*": self._on_keyspace_event})
+        else:
+            raise ValueError(f"Invalid cache invalidation: {invalidation}")
+        self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+        logger.info("Tiered cache listening to %s invalidations", invalidation)
+
+    def _on_invalidation(self, message: dict):
+        sender, _, invalidation = message["data"].partition(":")
+        if sender == self._id:
+            return
+        kind, _, key = invalidation.partition(":")
+        if kind == _PREFIX_INVALIDATION:
+            self._evict_l1_prefix(key)
+        else:
+            self._evict_l1(key)
+
+    def _on_keyspace_event(self, message: dict):
+        key = message["channel"].partition(":")[2]
+        key_prefix = getattr(self.l2, "key_prefix", "")
+        if not key.startswith(key_prefix):
+            return
+        key = key[len(key_prefix) :]
+        if message["data"] in _WRITE_EVENTS:
+            with self._lock:
+                deadline = self._own_writes.get(key)
+            # Our own write, the L1 entry holds the value it wrote
+            if deadline is not None and deadline > time.monotonic():
+                return
+        self._evict_l1(key)
+
+    def _remember_writes(self, keys):
+        if self.invalidation != "keyspace":
+            return
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                self._own_writes[key] = now + _OWN_WRITE_WINDOW
+                self._own_writes.move_to_end(key)
+            while self._own_writes and next(iter(self._own_writes.values())) <= now:
+                self._own_writes.popitem(last=False)
+
+    def _evict_l1(self, key: str):
+        with self._lock:
+            self._l1.pop(key, None)
+
+    def _evict_l1_prefix(self, prefix: str):
+        with self._lock:
+            for cached_key in [cached_key for cached_key in self._l1 if cached_key.startswith(prefix)]:
+                del self._l1[cached_key]
+
+    def _publish(self, *keys: str, kind: str = _KEY_INVALIDATION):
+        if self.invalidation != "pubsub":
+            return
+        if len(keys) == 1:
+            self.l2.client.publish(self.channel, f"{self._id}:{kind}:{keys[0]}")
+            return
+        with self.l2.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.publish(self.channel, f"{self._id}:{kind}:{key}")
+            pipeline.execute()
+
+    def _record(self, tier: str, event: str):
+        with self._lock:
+            self._stats[(tier, event)] += 1
+        if DequestConfig.METRICS_COLLECTOR is not None:
+            DequestConfig.METRICS_COLLECTOR.cache_event(f"tiered.{tier}", event)
+
+    def _set_l1(self, key: str, value, expire: float | None):
+        """:param expire: Remaining TTL of the L2 entry, None when it doesn't expire."""
+        ttl = min(self.l1_ttl, expire) if expire is not None else self.l1_ttl
+        with self._lock:
+            self._l1[key] = (value, time.monotonic() + ttl)
+            self._l1.move_to_end(key)
+            evicted = len(self._l1) > self.l1_max_entries
+            if evicted:
+                self._l1.popitem(last=False)
+        if evicted:
+            self._record("l1", "eviction")
+
+    def get_key_l1(self, key):
+        """Returns the value of the key from the in-process tier only, None when it is not there."""
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    self._l1.move_to_end(key)
+                else:
+                    del self._l1[key]
+                    entry = None
+        self._record("l1", "hit" if entry is not None else "miss")
+        return entry[0] if entry is not None else None
+
+    def _get_l2(self, keys: list[str]) -> list:
+        """Reads the keys from L2 and keeps the values found in L1, no longer than their remaining L2 TTL."""
+        get_many_with_ttl = getattr(self.l2, "get_many_with_ttl", None)
+        if get_many_with_ttl is not None:
+            entries = get_many_with_ttl(keys)
+        elif len(keys) == 1:
+            entries = [(self.l2.get_key(keys[0]), None)]
+        else:
+            entries = [(value, None) for value in self.l2.get_many(keys)]
+
+        values = []
+        for key, (value, ttl) in zip(keys, entries, strict=True):
+            self._record("l2", "hit" if value is not None else "miss")
+            if value is not None:
+                self._set_l1(key, value, ttl)
+            values.append(value)
+        return values
+
+    def get_key(self, key):
+        value = self.get_key_l1(key)
+        if value is not None:
+            return value
+        return self._get_l2([key])[0]
+
+    def get_many(self, keys):
+        values = [self.get_key_l1(key) for key in keys]
+        missing = [key for key, value in zip(keys, values, strict=True) if value is None]
+        if missing:
+            l2_values = dict(zip(missing, self._get_l2(missing), strict=True))
+            values = [l2_values.get(key) if value is None else value for key, value in zip(keys, values, strict=True)]
+        return values
+
+    def set_key(self, key, value, expire=None):
+        self._remember_writes([key])
+        self.l2.set_key(key, value, expire)
+        self._set_l1(key, value, expire or None)
+        self._publish(key)
+
+    def set_many(self, mapping, expire=None):
+        self._remember_writes(mapping)
+        self.l2.set_many(mapping, expire)
+        for key, value in mapping.items():
+            self._set_l1(key, value, expire or None)
+        self._publish(*mapping)
+
+    def delete_key(self, key):
+        result = self.l2.delete_key(key)
+        self._evict_l1(key)
+        self._publish(key)
+        return result
+
+    def delete_prefix(self, prefix):
+        self.l2.delete_prefix(prefix)
+        self._evict_l1_prefix(prefix)
+        self._publish(prefix, kind=_PREFIX_INVALIDATION)
+
+    def clear(self):
+        self.l2.clear()
+        self._evict_l1_prefix("")
+        self._publish("", kind=_PREFIX_INVALIDATION)
+
+    def stats(self) -> dict:
+        """Returns the hits, misses and hit ratio of each tier, and the evictions of L1."""
+        stats = {}
+        for tier in ("l1", "l2"):
+            hits, misses = self._stats[(tier, "hit")], self._stats[(tier, "miss")]
+            stats[tier] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / (hits + misses) if hits + misses else None,
+            }
+        stats["l1"]["evictions"] = self._stats[("l1", "eviction")]
+        stats["l1"]["size"] = len(self._l1)
+        return stats
+
+    def close(self):
+        """Stops listening to invalidations."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
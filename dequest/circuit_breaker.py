@@ -3,6 +3,7 @@ from collections.abc import Callable
 from enum import Enum
 from typing import Any
 
+from dequest.config import DequestConfig
 from dequest.utils import get_logger
 
 logger = get_logger()
@@ -20,12 +21,15 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         recovery_timeout: int = 30,
         fallback_function: Callable[[], Any] | None = None,
+        name: str = "default",
     ):
         """
         :param failure_threshold: Number of consecutive failures before switching to OPEN state
         :param recovery_timeout: Time in seconds before allowing a test request after breaker is OPEN
         :param fallback_function: Function to execute when circuit breaker is OPEN (optional).
+        :param name: Name identifying the breaker in metrics.
         """
+        self.name = name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.fallback_function = fallback_function
@@ -37,7 +41,7 @@ class CircuitBreaker:
         """Determines if a request is allowed based on the breaker state."""
         if self.state == CircuitBreakerState.OPEN:
             if time.time() - self.last_failure_time > self.recovery_timeout:
-                self.state = CircuitBreakerState.HALF_OPEN  # Allow a test request
+                self._set_state(CircuitBreakerState.HALF_OPEN)  # Allow a test request
                 return True
             return False  # Still in OPEN state, block requests
         return True  # Requests allowed in CLOSED and HALF-OPEN state
@@ -46,14 +50,19 @@ class CircuitBreaker:
         """Records a failure and potentially opens the circuit."""
         self.failures += 1
         if self.failures >= self.failure_threshold:
-            self.state = CircuitBreakerState.OPEN
+            self._set_state(CircuitBreakerState.OPEN)
             self.last_failure_time = time.time()
             logger.warning("Circuit breaker OPEN: Too many failures!")
 
     def record_success(self):
         """Resets failure count and closes the circuit breaker."""
         self.failures = 0
-        self.state = CircuitBreakerState.CLOSED
+        self._set_state(CircuitBreakerState.CLOSED)
+
+    def _set_state(self, state: CircuitBreakerState):
+        if state != self.state and DequestConfig.METRICS_COLLECTOR is not None:
+            DequestConfig.METRICS_COLLECTOR.breaker_transition(self.name, self.state.value, state.value)
+        self.state = state
 
     def get_state(self) -> CircuitBreakerState:
         """Returns the current state of the circuit breaker."""
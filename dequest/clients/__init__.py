@@ -1,4 +1,5 @@
 from ._async import async_client
+from ._client import DequestClient, get_default_client
 from ._sync import sync_client
 
-__all__ = ["async_client", "sync_client"]
+__all__ = ["DequestClient", "async_client", "get_default_client", "sync_client"]
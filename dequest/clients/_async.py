@@ -1,78 +1,191 @@
 import asyncio
+import concurrent.futures
+import functools
 import inspect
-import json
-from collections.abc import Callable, Iterator
+import logging
+from collections.abc import Callable, Iterator, Sequence
 from functools import wraps
-from typing import TypeVar, Union
+from typing import Literal, TypeVar, Union
+
+import httpx
 
-from dequest.cache import get_cache
 from dequest.circuit_breaker import CircuitBreaker
+from dequest.clients._client import DequestClient, get_default_client
+from dequest.clients._http_cache import (
+    cache_error_status,
+    cache_response,
+    get_stale_key,
+    get_stale_response,
+    lookup_cached_response,
+    raise_for_negative_entry,
+    renew_stale_response,
+)
+from dequest.clients._refresh import RefreshAhead
 from dequest.config import DequestConfig
 from dequest.exceptions import CircuitBreakerOpenError, DequestError
-from dequest.http import ConsumerType, async_request
+from dequest.http import AsyncResponseStream, ConsumerType, async_request
+from dequest.parameter_types import FileBody, StreamBody
+from dequest.serialization import json_dumps, json_loads
+from dequest.tracing import start_span
 from dequest.utils import (
     AsyncLoopManager,
+    CallSummary,
     extract_parameters,
-    generate_cache_key,
     get_logger,
     get_next_delay,
+    is_logged,
     map_json_to_dto,
     map_xml_to_dto,
+    split_argument_sets,
 )
 
 T = TypeVar("T")
 logger = get_logger()
-cache = get_cache()
 
 background_tasks: set[asyncio.Task] = set()
 
 
-async def _perform_request(
+def _run_in_background(coroutine):
+    # The loop only keeps weak references to its tasks
+    task = asyncio.create_task(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+async def _consume_stream(stream: AsyncResponseStream, callback: Callable | None):
+    async with stream:
+        if callback:
+            await callback(stream)
+
+
+async def _perform_request(  # noqa: PLR0912
     url: str,
     method: str,
-    headers: dict | None,
-    json_body: dict | None,
+    headers: dict | Callable[[], dict] | None,
+    json_body: dict | bytes | FileBody | StreamBody | None,
     params: dict | None,
     data: dict | None,
     timeout: int,
     enable_cache: bool,
-    cache_ttl: int | None,
+    cache_ttl: int | Literal["auto"] | None,
     consume: ConsumerType,
+    summary: CallSummary | None = None,
+    client: DequestClient | None = None,
+    revalidate: bool = False,
+    vary_on: Sequence[str] = (),
+    negative_cache_ttl: int | None = None,
+    refresher: RefreshAhead | None = None,
+    refresh: bool = False,
+    client_name: str = "",
 ):
+    """
+    :param headers: Request headers, or a function building them, called again by the refreshes so that they
+                    send fresh auth tokens.
+    :param refresher: Schedules the refresh of the stored responses ahead of their expiration.
+    :param refresh: Whether the request refreshes the cached response, the cache lookup is skipped.
+    :param client_name: Name of the calling function, the client label of its request metrics.
+    """
     method = method.upper()
+    client = client or get_default_client()
+    request_headers = headers() if callable(headers) else headers
 
     if (enable_cache or cache_ttl) and method != "GET":
         raise ValueError("Cache is only supported for GET requests.")
 
     if enable_cache:
-        cache_key = generate_cache_key(url, params)
-        cached_response = cache.get_key(cache_key)
-        if cached_response:
-            logger.info(
-                "Cache hit for %s (provider: %s)",
-                url,
-                DequestConfig.CACHE_PROVIDER,
-            )
-            return json.loads(cached_response) if consume == ConsumerType.JSON else cached_response
-
-    response_data = await async_request(
-        method,
-        url,
-        headers,
-        json_body,
-        params,
-        data,
-        timeout,
-        consume,
-    )
+        cache = client.cache
+        cache_key = client.get_cache_key(url, params, request_headers, vary_on)
+    # An expired response with validators is revalidated with a conditional request
+    revalidate = enable_cache and revalidate and bool(cache_ttl)
+    stale = None
+    if enable_cache and not refresh:
+        with start_span("dequest.cache.lookup", {"dequest.cache.provider": cache.provider}) as span:
+            cached_response, stale = lookup_cached_response(cache, cache_key, revalidate)
+            if span is not None:
+                span.set_attribute("dequest.cache.hit", cached_response is not None)
+        # Cached payloads are strings, falsy ones ("" or a cached "null") are hits too
+        if cached_response is not None:
+            if summary is not None:
+                summary.cache_hit = True
+            if refresher is not None:
+                refresher.touch(cache_key)
+            raise_for_negative_entry(cached_response, method, url, params)
+            if is_logged(logger, logging.DEBUG):
+                logger.debug("Cache hit for %s (provider: %s)", url, cache.provider)
+            return json_loads(cached_response) if consume == ConsumerType.JSON else cached_response
+
+    refresh_request = None
+    if refresher is not None:
+        refresh_request = functools.partial(
+            _perform_request,
+            url,
+            method,
+            headers,
+            json_body,
+            params,
+            data,
+            timeout,
+            enable_cache,
+            cache_ttl,
+            consume,
+            client=client,
+            revalidate=revalidate,
+            vary_on=vary_on,
+            negative_cache_ttl=negative_cache_ttl,
+            refresher=refresher,
+            refresh=True,
+            client_name=client_name,
+        )
+
+    if refresh and revalidate:
+        # The lookup was skipped, only the stale copy is read
+        stale = get_stale_response(cache, cache_key)
+    if stale is not None:
+        request_headers = {**(request_headers or {}), **stale.conditional_headers}
+
+    try:
+        response = await async_request(
+            method,
+            url,
+            request_headers,
+            json_body,
+            params,
+            data,
+            timeout,
+            consume,
+            http_client=client.get_async_http_client(),
+            client_name=client_name,
+            conditional=stale is not None,
+        )
+    except httpx.HTTPStatusError as e:
+        if enable_cache:
+            cache_error_status(cache, cache_key, e, negative_cache_ttl)
+        raise
+    # A 304 only gets through for the requests sent with the validators of a stale response
+    if stale is not None and response.not_modified:
+        payload = renew_stale_response(cache, url, stale)
+        response_data = json_loads(payload) if consume == ConsumerType.JSON else payload
+    else:
+        response_data = response.data
+        payload = None
 
     if enable_cache:
-        cache.set_key(
+        if payload is None:
+            payload = json_dumps(response_data).decode() if consume == ConsumerType.JSON else response_data
+        cached = cache_response(
+            cache,
             cache_key,
-            (json.dumps(response_data) if consume == ConsumerType.JSON else response_data),
+            response,
+            payload,
             cache_ttl,
+            revalidate,
+            stale,
+            refresher=refresher,
+            refresh=refresh_request,
+            vary_on=client.get_vary_on(vary_on),
         )
-        logger.info("Cached response for %s in %s", url, DequestConfig.CACHE_PROVIDER)
+        if cached and is_logged(logger, logging.DEBUG):
+            logger.debug("Cached response for %s in %s", url, cache.provider)
 
     return response_data
 
@@ -91,10 +204,16 @@ def async_client(  # noqa: PLR0915
     api_key: Union[str, Callable[[], str]] | None = None,
     headers: Union[dict[str, str], Callable[[], dict[str, str]]] | None = None,
     enable_cache: bool = False,
-    cache_ttl: int | None = None,
+    cache_ttl: int | Literal["auto"] | None = None,
     circuit_breaker: CircuitBreaker | None = None,
     callback: Callable[[Union[T, dict]], None] | None = None,
     consume: ConsumerType = ConsumerType.JSON,
+    coerce_types: bool = False,
+    client: DequestClient | None = None,
+    revalidate: bool = False,
+    vary_on: Sequence[str] = (),
+    negative_cache_ttl: int | None = None,
+    refresh_ahead: float | None = None,
 ):
     """
     A decorator to make asynchronous HTTP requests without requiring the user to handle async execution.
@@ -113,21 +232,65 @@ def async_client(  # noqa: PLR0915
     :param api_key: Optional API key (static string or function returning a string).
     :param headers: Optional default headers (can be a dict or a function returning a dict).
     :param enable_cache: Whether to cache GET responses.
-    :param cache_ttl: Cache expiration time in seconds.
+    :param cache_ttl: Cache expiration time in seconds, or "auto" to follow the Cache-Control and Expires headers
+                      of the responses.
     :param circuit_breaker: Instance of CircuitBreaker (optional).
     :param callback: Optional function to process the response when available.
-    :param consume: Type of data to consume. ConsumerType.JSON, ConsumerType.XML or ConsumerType.TEXT
+    :param consume: Type of data to consume. ConsumerType.JSON, ConsumerType.XML, ConsumerType.TEXT,
+                    ConsumerType.BYTES or ConsumerType.STREAM. With STREAM, the callback gets an AsyncResponseStream
+                    to consume, the connection is released once the callback returns.
+    :param coerce_types: Whether to convert mapped values to the annotated types of the DTO fields.
+    :param client: DequestClient providing the connection pools, cache and default circuit breaker.
+    :param revalidate: Whether expired cached responses having an ETag or Last-Modified header are revalidated with a
+                       conditional request, a 304 Not Modified answer renews them without downloading the body again.
+                       Their copies are kept DequestConfig.CACHE_STALE_TTL_FACTOR times the TTL.
+    :param vary_on: Request headers the responses depend on, e.g. Accept-Language, their values are part of the
+                    cache keys in addition to the ones the client varies on.
+    :param negative_cache_ttl: Seconds the error statuses of DequestConfig.NEGATIVE_CACHE_STATUS_CODES (404 and 410
+                               by default) are cached for, defaults to DequestConfig.NEGATIVE_CACHE_TTL.
+    :param refresh_ahead: Share of the TTL (e.g. 0.8) after which the cached responses read in the meantime are
+                          refreshed in the background, so they don't expire on the request path.
     """
+    if refresh_ahead is not None and not enable_cache:
+        raise ValueError("refresh_ahead requires enable_cache=True")
+    if enable_cache and consume in (ConsumerType.BYTES, ConsumerType.STREAM):
+        raise ValueError(f"ConsumerType.{consume.name} responses cannot be cached")
 
     def decorator(func):  # noqa: PLR0915
         signature = inspect.signature(func)
+        span_name = f"dequest {func.__qualname__}"
+        span_attributes = {"http.request.method": method.upper(), "url.template": url}
+        refresher = RefreshAhead(refresh_ahead) if refresh_ahead is not None else None
+
+        def build_headers() -> dict:
+            request_headers = headers() if callable(headers) else dict(headers or {})
+            token_value = auth_token() if callable(auth_token) else auth_token
+            api_key_value = api_key() if callable(api_key) else api_key
+
+            if token_value:
+                request_headers["Authorization"] = f"Bearer {token_value}"
+            if api_key_value:
+                request_headers["x-api-key"] = api_key_value
+            return request_headers
+
+        def get_cache_key(args: tuple, kwargs: dict) -> str:
+            path_params, query_params, _, _ = extract_parameters(signature, args, kwargs)
+            return (client or get_default_client()).get_cache_key(
+                url.format(**path_params),
+                query_params,
+                build_headers(),
+                vary_on,
+            )
 
         @wraps(func)
-        def wrapper(*args, **kwargs) -> None:  # noqa: PLR0915
+        def wrapper(*args, **kwargs) -> concurrent.futures.Future:  # noqa: PLR0915
             """
             Executes the decorated function asynchronously inside an event loop.
-            The user does NOT need to `await` the function.
+            The user does NOT need to `await` the function, the returned future can be ignored
+            or used to wait for the call and observe its errors.
             """
+            if consume in (ConsumerType.TEXT, ConsumerType.BYTES, ConsumerType.STREAM) and dto_class:
+                raise DequestError(f"ConsumerType.{consume.name} cannot be used with dto_class.")
 
             path_params, query_params, form_params, json_body = extract_parameters(
                 signature,
@@ -137,28 +300,33 @@ def async_client(  # noqa: PLR0915
 
             formatted_url = url.format(**path_params)
 
-            request_headers = headers() if callable(headers) else (headers or {})
-            token_value = auth_token() if callable(auth_token) else auth_token
-            api_key_value = api_key() if callable(api_key) else api_key
             _retry_delay = retry_delay() if callable(retry_delay) else retry_delay
 
-            if token_value:
-                request_headers["Authorization"] = f"Bearer {token_value}"
-            if api_key_value:
-                request_headers["x-api-key"] = api_key_value
+            dequest_client = client or get_default_client()
+            breaker = circuit_breaker or dequest_client.circuit_breaker
 
             async def run_request():
-                if circuit_breaker and not circuit_breaker.allow_request():
+                summary, sampling = CallSummary.start(logger, func.__qualname__, method, formatted_url)
+                try:
+                    with start_span(span_name, span_attributes):
+                        await perform_call(summary)
+                except Exception:
+                    if summary is not None:
+                        summary.outcome = "error"
+                    raise
+                finally:
+                    CallSummary.finish(summary, sampling, logger)
+
+            async def perform_call(summary):  # noqa: PLR0912
+                if breaker and not breaker.allow_request():
                     logger.warning(
                         "Circuit breaker blocking requests to %s",
                         formatted_url,
                     )
-                    if circuit_breaker.fallback_function:
-                        task = asyncio.create_task(
-                            circuit_breaker.fallback_function(*args, **kwargs),
-                        )
-                        background_tasks.add(task)
-                        task.add_done_callback(background_tasks.discard)
+                    if breaker.fallback_function:
+                        if summary is not None:
+                            summary.outcome = "fallback"
+                        _run_in_background(breaker.fallback_function(*args, **kwargs))
                         return
 
                     raise CircuitBreakerOpenError(
@@ -166,11 +334,13 @@ def async_client(  # noqa: PLR0915
                     )
 
                 for attempt in range(1, retries + 2):  # 1st call + retries
+                    if summary is not None:
+                        summary.attempts = attempt
                     try:
                         response_data = await _perform_request(
                             formatted_url,
                             method,
-                            request_headers,
+                            build_headers,
                             json_body,
                             query_params,
                             form_params,
@@ -178,33 +348,33 @@ def async_client(  # noqa: PLR0915
                             enable_cache,
                             cache_ttl,
                             consume,
+                            summary=summary,
+                            client_name=func.__qualname__,
+                            client=dequest_client,
+                            revalidate=revalidate,
+                            vary_on=vary_on,
+                            negative_cache_ttl=negative_cache_ttl,
+                            refresher=refresher,
                         )
 
-                        if circuit_breaker:
-                            circuit_breaker.record_success()
+                        if breaker:
+                            breaker.record_success()
 
                         if dto_class:
-                            dto_object = (
-                                map_json_to_dto(dto_class, response_data, source_field)
-                                if consume == ConsumerType.JSON
-                                else map_xml_to_dto(
-                                    dto_class,
-                                    response_data,
-                                    source_field,
-                                )
-                            )
+                            if consume == ConsumerType.JSON:
+                                with start_span("dequest.map_json_to_dto"):
+                                    dto_object = map_json_to_dto(dto_class, response_data, source_field, coerce_types)
+                            else:
+                                with start_span("dequest.map_xml_to_dto"):
+                                    dto_object = map_xml_to_dto(dto_class, response_data, source_field, coerce_types)
                             if callback:
-                                task = asyncio.create_task(
-                                    callback(dto_object),
-                                )
-                                background_tasks.add(task)
-                                task.add_done_callback(background_tasks.discard)
+                                _run_in_background(callback(dto_object))
                                 return
 
-                        if callback and response_data:
-                            task = asyncio.create_task(callback(response_data))
-                            background_tasks.add(task)
-                            task.add_done_callback(background_tasks.discard)
+                        if consume == ConsumerType.STREAM:
+                            _run_in_background(_consume_stream(response_data, callback))
+                        elif callback and response_data:
+                            _run_in_background(callback(response_data))
 
                         return
 
@@ -213,6 +383,8 @@ def async_client(  # noqa: PLR0915
                         if retry_on_exceptions and isinstance(e, retry_on_exceptions) and not _giveup:
                             logger.error("Dequest client error: %s", e)
                             if attempt < retries + 1:
+                                if DequestConfig.METRICS_COLLECTOR is not None:
+                                    DequestConfig.METRICS_COLLECTOR.retry(func.__qualname__)
                                 delay = get_next_delay(_retry_delay)
                                 logger.info(
                                     "Retrying in %s seconds... (Attempt %s/%s)",
@@ -220,24 +392,59 @@ def async_client(  # noqa: PLR0915
                                     attempt,
                                     retries,
                                 )
-                                await asyncio.sleep(delay)
+                                with start_span("dequest.retry.backoff", {"dequest.retry.delay": delay}):
+                                    await asyncio.sleep(delay)
                             else:
                                 # Record single failure when all attempts fail
-                                if circuit_breaker:
-                                    circuit_breaker.record_failure()
+                                if breaker:
+                                    breaker.record_failure()
                                 raise DequestError(
                                     f"Dequest client failed after {retries} attempts: {e!s}",
                                 ) from e
                         else:
-                            if circuit_breaker:
-                                circuit_breaker.record_failure()
+                            if breaker:
+                                breaker.record_failure()
                             raise DequestError(
                                 f"Dequest client failed: {e!s}",
                             ) from e
 
-            loop = AsyncLoopManager.get_event_loop()
-            asyncio.run_coroutine_threadsafe(run_request(), loop)
+            loop = AsyncLoopManager.get_event_loop(dequest_client)
+            return asyncio.run_coroutine_threadsafe(run_request(), loop)
+
+        def invalidate(*args, **kwargs):
+            """Deletes the cached response of the call with these arguments."""
+            cache_key = get_cache_key(args, kwargs)
+            cache = (client or get_default_client()).cache
+            cache.delete_key(cache_key)
+            cache.delete_key(get_stale_key(cache_key))
+
+        def invalidate_all():
+            """Deletes the cached responses of the client, every function sharing it included."""
+            (client or get_default_client()).invalidate()
+
+        def warm(argument_sets) -> concurrent.futures.Future:
+            """
+            Prefills the cache with the responses of the calls with the argument sets, e.g. at startup. An argument
+            set is a tuple of positional arguments or a dict of keyword arguments. Failed calls are logged.
+            Returns a future of the number of responses cached, or already in the cache.
+            """
+            if not enable_cache:
+                raise ValueError("warm() requires enable_cache=True")
+
+            futures = [wrapper(*args, **kwargs) for args, kwargs in split_argument_sets(argument_sets)]
+
+            async def wait_calls() -> int:
+                results = await asyncio.gather(*map(asyncio.wrap_future, futures), return_exceptions=True)
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.warning("Failed to warm the cache of %s: %s", func.__qualname__, result)
+                return sum(not isinstance(result, Exception) for result in results)
+
+            return asyncio.run_coroutine_threadsafe(wait_calls(), AsyncLoopManager.get_event_loop())
 
+        wrapper.invalidate = invalidate
+        wrapper.invalidate_all = invalidate_all
+        wrapper.warm = warm
         return wrapper
 
     return decorator
@@ -0,0 +1,158 @@
+import asyncio
+import functools
+import threading
+import weakref
+from collections.abc import Callable, Sequence
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+
+from dequest.cache import Cache, get_cache
+from dequest.cache.cache_drivers.cache_driver import CacheDriver
+from dequest.circuit_breaker import CircuitBreaker
+from dequest.utils import AsyncLoopManager, generate_cache_key
+
+
+class DequestClient:
+    """
+    Resources shared by the decorated functions calling one upstream: the HTTP connection pools,
+    the cache and the circuit breaker. Pass it to `sync_client`/`async_client` with `client=`,
+    functions without a client share the default one built from DequestConfig.
+    """
+
+    def __init__(
+        self,
+        cache_provider: str | None = None,
+        cache_driver: CacheDriver | None = None,
+        limits: httpx.Limits | None = None,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        namespace: str | None = None,
+        cache_version: int | str | None = None,
+        vary_on: Sequence[str] = (),
+        cache_key_func: Callable[[str, dict | None, dict], str] | None = None,
+        **http_options,
+    ):
+        """
+        :param cache_provider: Cache provider of this client, defaults to the process-wide cache of DequestConfig.
+        :param cache_driver: Ready-made cache driver, e.g. a RedisDriver pointing to the server of this upstream.
+        :param limits: Connection pool limits of the HTTP clients.
+        :param transport: Transport of the sync HTTP client.
+        :param async_transport: Transport of the async HTTP clients.
+        :param circuit_breaker: Circuit breaker used by the functions that don't set their own.
+        :param namespace: Prefix of the cache keys of this client, so that invalidate() only deletes its entries.
+        :param cache_version: Version of the cache keys, bump it when the shape of the cached responses changes.
+        :param vary_on: Request headers the responses depend on (e.g. Accept-Language or Authorization),
+                        their values are part of the cache keys of every function of the client.
+        :param cache_key_func: Function building the cache keys instead of generate_cache_key, called with the URL,
+                               the query parameters and all the request headers.
+        :param http_options: Other options of httpx.Client/httpx.AsyncClient, e.g. verify, cert or proxy.
+                             Cookies set by the responses are never stored, the pooled clients are shared by every
+                             call, and every end user, of the decorated functions.
+        """
+        self.cache_provider = cache_provider
+        self.cache_driver = cache_driver
+        self.limits = limits or httpx.Limits()
+        self.transport = transport
+        self.async_transport = async_transport
+        self.circuit_breaker = circuit_breaker
+        self.namespace = namespace
+        self.cache_version = cache_version
+        self.vary_on = tuple(vary_on)
+        self.cache_key_func = cache_key_func
+        self.http_options = http_options
+        if "cookies" not in http_options:
+            # A jar accepting no domain, a Set-Cookie must not leak into the calls made for other users
+            self.http_options["cookies"] = CookieJar(DefaultCookiePolicy(allowed_domains=[]))
+        self._cache = None
+        self._http_client = None
+        # httpx.AsyncClient connections belong to the event loop they were opened on
+        self._async_http_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> Cache:
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    if self.cache_provider is None and self.cache_driver is None:
+                        cache = get_cache()
+                        if self.namespace is not None:
+                            # Namespaced view of the process-wide cache, sharing its driver
+                            cache = Cache(cache.provider, cache.driver, self.namespace, self.cache_version)
+                        self._cache = cache
+                    else:
+                        self._cache = Cache(
+                            self.cache_provider,
+                            self.cache_driver,
+                            self.namespace,
+                            self.cache_version,
+                        )
+        return self._cache
+
+    def get_cache_key(self, url: str, params: dict | None, headers: dict | None, vary_on: Sequence[str] = ()) -> str:
+        """Returns the cache key of a request, `vary_on` adds headers to the ones the client varies on."""
+        if self.cache_key_func is not None:
+            return self.cache_key_func(url, params, headers or {})
+        varied_headers = None
+        vary_on = self.get_vary_on(vary_on)
+        if vary_on and headers:
+            varied_headers = {name: value for name, value in headers.items() if name.lower() in vary_on}
+        return generate_cache_key(url, params, varied_headers)
+
+    def get_vary_on(self, vary_on: Sequence[str] = ()) -> frozenset[str]:
+        """Returns the lowercased names of the request headers that are part of the cache keys."""
+        return frozenset(name.lower() for name in (*self.vary_on, *vary_on))
+
+    def invalidate(self):
+        """Deletes the cached responses of this client, or the whole cache when it has no namespace."""
+        return self.cache.invalidate()
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """The sync HTTP client, its connections are reused by every call."""
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(
+                        limits=self.limits,
+                        transport=self.transport,
+                        **self.http_options,
+                    )
+        return self._http_client
+
+    def get_async_http_client(self) -> httpx.AsyncClient:
+        """Returns the async HTTP client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        http_client = self._async_http_clients.get(loop)
+        if http_client is None:
+            http_client = httpx.AsyncClient(
+                limits=self.limits,
+                transport=self.async_transport,
+                **self.http_options,
+            )
+            with self._lock:
+                self._async_http_clients[loop] = http_client
+            AsyncLoopManager.on_shutdown(loop, http_client.aclose)
+        return http_client
+
+    def close(self):
+        """Closes the connection pools, the async ones are closed on their event loops."""
+        with self._lock:
+            http_client, self._http_client = self._http_client, None
+            async_http_clients = list(self._async_http_clients.items())
+            self._async_http_clients.clear()
+        if http_client is not None:
+            http_client.close()
+        for loop, async_http_client in async_http_clients:
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(async_http_client.aclose(), loop)
+
+
+@functools.cache
+def get_default_client() -> DequestClient:
+    """Returns the client used by the decorated functions that don't set one."""
+    return DequestClient()
@@ -0,0 +1,242 @@
+import logging
+import time
+from collections.abc import Callable, Collection
+from email.utils import parsedate_to_datetime
+from typing import Literal, NamedTuple
+
+import httpx
+
+from dequest.cache import Cache, CacheBatch
+from dequest.clients._refresh import RefreshAhead
+from dequest.config import DequestConfig
+from dequest.http import HttpResponse
+from dequest.serialization import json_dumps, json_loads
+from dequest.utils import get_logger, is_logged
+
+logger = get_logger()
+
+# cache_ttl of the functions whose responses are cached as long as their Cache-Control/Expires headers allow
+AUTO_TTL = "auto"
+
+# Entries caching an error status instead of a payload start with a NUL character, which no JSON document does
+_NEGATIVE_ENTRY_PREFIX = "\0status:"
+
+# Validators sent back in conditional requests, by response header
+_CONDITIONAL_HEADERS = {"etag": "If-None-Match", "last-modified": "If-Modified-Since"}
+
+# httpx negotiates the content encoding and decodes the bodies, they don't vary on it once decoded
+_DECODED_VARY_HEADERS = frozenset({"accept-encoding"})
+
+
+class StaleResponse(NamedTuple):
+    """Copy of a cached response kept past its TTL with its validators, to be revalidated with a conditional request."""
+
+    validators: dict[str, str]
+    payload: str
+
+    @property
+    def conditional_headers(self) -> dict[str, str]:
+        return {_CONDITIONAL_HEADERS[name]: value for name, value in self.validators.items()}
+
+
+def _parse_cache_control(value: str) -> dict[str, str | None]:
+    directives = {}
+    for directive in value.split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _parse_seconds(value: str | None) -> int:
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _parse_http_date(value: str) -> float | None:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _varies_outside_the_key(headers: httpx.Headers, vary_on: Collection[str]) -> bool:
+    varied = {name.strip().lower() for value in headers.get_list("vary") for name in value.split(",")}
+    return bool(varied - _DECODED_VARY_HEADERS - {""} - {name.lower() for name in vary_on})
+
+
+def get_auto_cache_ttl(headers: httpx.Headers, vary_on: Collection[str] = ()) -> int | None:
+    """
+    Returns the seconds a response can be cached for according to its Cache-Control and Expires headers,
+    bounded by DequestConfig.CACHE_AUTO_MIN_TTL and CACHE_AUTO_MAX_TTL, or None when it must not be stored.
+    0 keeps it only to be revalidated (no-cache). Responses without these headers get the minimum TTL.
+    dequest caches are shared by every caller: private responses, and responses varying on request headers that are
+    not part of the cache keys (`vary_on`), are not stored.
+    """
+    directives = _parse_cache_control(headers.get("cache-control", ""))
+    if "no-store" in directives or "private" in directives or _varies_outside_the_key(headers, vary_on):
+        return None
+
+    if "no-cache" in directives:
+        ttl = 0
+    elif "s-maxage" in directives or "max-age" in directives:
+        # dequest caches are shared (e.g. Redis), so s-maxage takes precedence. stale-while-revalidate is not added,
+        # nothing would revalidate the entry while it is served stale
+        max_age = directives["s-maxage"] if "s-maxage" in directives else directives["max-age"]
+        ttl = _parse_seconds(max_age) - _parse_seconds(headers.get("age"))
+    elif "expires" in headers:
+        # An invalid date means the response is already expired
+        expires = _parse_http_date(headers["expires"])
+        date = _parse_http_date(headers.get("date", "")) or time.time()
+        ttl = int(expires - date) if expires is not None else 0
+    else:
+        return DequestConfig.CACHE_AUTO_MIN_TTL
+
+    ttl = max(ttl, DequestConfig.CACHE_AUTO_MIN_TTL)
+    if DequestConfig.CACHE_AUTO_MAX_TTL is not None:
+        ttl = min(ttl, DequestConfig.CACHE_AUTO_MAX_TTL)
+    return ttl
+
+
+def raise_for_negative_entry(entry: str, method: str, url: str, params: dict | None):
+    """Raises the HTTPStatusError of a cached error status, like the upstream response did."""
+    if entry.startswith(_NEGATIVE_ENTRY_PREFIX):
+        request = httpx.Request(method, url, params=params)
+        httpx.Response(int(entry.removeprefix(_NEGATIVE_ENTRY_PREFIX)), request=request).raise_for_status()
+
+
+def cache_error_status(
+    cache: Cache,
+    cache_key: str,
+    error: httpx.HTTPStatusError,
+    negative_cache_ttl: int | None,
+    batch: CacheBatch | None = None,
+) -> bool:
+    """
+    Caches the status of an error response when it is one of DequestConfig.NEGATIVE_CACHE_STATUS_CODES, so the
+    next calls fail the same way without reaching the upstream. Returns whether it was cached.
+    """
+    if negative_cache_ttl is None:
+        negative_cache_ttl = DequestConfig.NEGATIVE_CACHE_TTL
+    status_code = error.response.status_code
+    if not negative_cache_ttl or status_code not in DequestConfig.NEGATIVE_CACHE_STATUS_CODES:
+        return False
+    (batch or cache).set_key(cache_key, f"{_NEGATIVE_ENTRY_PREFIX}{status_code}", negative_cache_ttl)
+    if is_logged(logger, logging.DEBUG):
+        logger.debug("Cached status %s for %s in %s", status_code, error.request.url, cache.provider)
+    return True
+
+
+def get_stale_key(cache_key: str) -> str:
+    return f"{cache_key}:stale"
+
+
+def get_validators(headers: httpx.Headers) -> dict[str, str]:
+    """Returns the ETag and Last-Modified headers of a response."""
+    return {name: headers[name] for name in _CONDITIONAL_HEADERS if name in headers}
+
+
+def _load_stale_response(entry: str | None) -> StaleResponse | None:
+    if entry is None:
+        return None
+    entry = json_loads(entry)
+    return StaleResponse(entry["validators"], entry["payload"])
+
+
+def get_stale_response(cache: Cache, cache_key: str) -> StaleResponse | None:
+    return _load_stale_response(cache.get_key(get_stale_key(cache_key), record_metrics=False))
+
+
+def lookup_cached_response(
+    cache: Cache,
+    cache_key: str,
+    revalidate: bool,
+    batch: CacheBatch | None = None,
+) -> tuple[str | None, StaleResponse | None]:
+    """
+    Returns the cached response of the key and, on a miss when revalidating, its stale copy, read in the same
+    round-trip (or from the batch). Only the lookup of the cached response is reported to the metrics collector.
+    """
+    stale_key = get_stale_key(cache_key)
+    if batch is not None and cache_key in batch.cached:
+        cached, stale = batch.cached[cache_key], batch.cached.get(stale_key)
+    elif revalidate:
+        cached, stale = cache.get_many([cache_key, stale_key], record_metrics=False)
+        cache.record_lookups([cached])
+    else:
+        cached, stale = cache.get_key(cache_key), None
+    if cached is not None or not revalidate:
+        return cached, None
+    return cached, _load_stale_response(stale)
+
+
+def renew_stale_response(cache: Cache, url: str, stale: StaleResponse) -> str:
+    """Returns the payload of a stale response the upstream answered 304 Not Modified for."""
+    if is_logged(logger, logging.DEBUG):
+        logger.debug("Revalidated cached response for %s (provider: %s)", url, cache.provider)
+    if DequestConfig.METRICS_COLLECTOR is not None:
+        DequestConfig.METRICS_COLLECTOR.cache_event(cache.provider, "revalidated")
+    return stale.payload
+
+
+def update_stale_response(
+    cache: Cache,
+    cache_key: str,
+    response: HttpResponse,
+    payload: str,
+    cache_ttl: int,
+    stale: StaleResponse | None,
+    batch: CacheBatch | None = None,
+):
+    """
+    Keeps the payload of a fresh (or revalidated) response with its validators for DequestConfig.CACHE_STALE_TTL_FACTOR
+    times its TTL, or drops the stale copy when the upstream stopped sending validators.
+    """
+    validators = get_validators(response.headers)
+    if not validators and stale is not None and response.not_modified:
+        # A 304 may omit the validators, the stored ones still apply
+        validators = stale.validators
+    if validators:
+        entry = json_dumps({"validators": validators, "payload": payload}).decode()
+        stale_ttl = max(cache_ttl * DequestConfig.CACHE_STALE_TTL_FACTOR, DequestConfig.CACHE_STALE_MIN_TTL)
+        (batch or cache).set_key(get_stale_key(cache_key), entry, stale_ttl)
+    elif stale is not None:
+        cache.delete_key(get_stale_key(cache_key))
+
+
+def cache_response(
+    cache: Cache,
+    cache_key: str,
+    response: HttpResponse,
+    payload: str,
+    cache_ttl: int | Literal["auto"] | None,
+    revalidate: bool,
+    stale: StaleResponse | None,
+    batch: CacheBatch | None = None,
+    refresher: RefreshAhead | None = None,
+    refresh: Callable | None = None,
+    vary_on: Collection[str] = (),
+) -> bool:
+    """
+    Stores the payload of a response, in the batch when one is given, and returns whether it was stored.
+    With the "auto" TTL, responses the upstream doesn't allow to cache are skipped, `vary_on` being the request
+    headers that are part of the cache key.
+    With a refresher, the `refresh` request is scheduled ahead of the expiration of the entry.
+    """
+    if cache_ttl == AUTO_TTL:
+        cache_ttl = get_auto_cache_ttl(response.headers, vary_on)
+        if cache_ttl is None:
+            if stale is not None:
+                cache.delete_key(get_stale_key(cache_key))
+            return False
+    if revalidate:
+        update_stale_response(cache, cache_key, response, payload, cache_ttl, stale, batch)
+    if cache_ttl == 0:
+        # Must be revalidated before every use, only the stale copy is kept
+        return False
+    (batch or cache).set_key(cache_key, payload, cache_ttl)
+    if refresher is not None and cache_ttl:
+        refresher.schedule(cache_key, cache_ttl, refresh)
+    return True
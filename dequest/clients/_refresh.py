@@ -0,0 +1,103 @@
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import weakref
+from collections.abc import Callable
+
+from dequest.utils import AsyncLoopManager, get_logger, is_logged
+
+logger = get_logger()
+
+
+class RefreshAhead:
+    """
+    Refreshes cached responses before they expire, so hot entries are never missed on the request path.
+    Every stored response gets a refresh scheduled on the AsyncLoopManager loop after `ratio` of its TTL,
+    which only runs if the entry was read in the meantime. Entries nobody reads are left to expire, and so are all
+    the entries once the loops are shut down.
+    """
+
+    def __init__(self, ratio: float):
+        """
+        :param ratio: Share of the TTL after which the entries are refreshed, between 0 and 1 (e.g. 0.8).
+        """
+        if not 0 < ratio < 1:
+            raise ValueError("refresh_ahead must be between 0 and 1")
+        self.ratio = ratio
+        # Loop of the refresh scheduled for each entry
+        self._scheduled: dict[str, asyncio.AbstractEventLoop] = {}
+        self._accessed: set[str] = set()
+        # Loops whose shutdown forgets the refreshes scheduled on them
+        self._loops: weakref.WeakSet[asyncio.AbstractEventLoop] = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def touch(self, cache_key: str):
+        """Records a read of the entry, making it eligible for its next refresh."""
+        with self._lock:
+            if cache_key in self._scheduled:
+                self._accessed.add(cache_key)
+
+    def schedule(self, cache_key: str, ttl: float, refresh: Callable):
+        """
+        Schedules the refresh of an entry just stored with the TTL, unless one is already scheduled.
+        :param refresh: Function or coroutine function performing the request and storing the fresh response.
+        """
+        try:
+            loop = AsyncLoopManager.get_event_loop()
+        except RuntimeError:
+            # The loops are shut down, the entry is left to expire
+            return
+        with self._lock:
+            scheduled_loop = self._scheduled.get(cache_key)
+            # A refresh scheduled on a loop stopped since then never runs
+            if scheduled_loop is not None and scheduled_loop.is_running():
+                return
+            self._scheduled[cache_key] = loop
+            self._accessed.discard(cache_key)
+            register_shutdown = loop not in self._loops
+            self._loops.add(loop)
+        if register_shutdown:
+            AsyncLoopManager.on_shutdown(loop, functools.partial(self._forget, loop))
+        try:
+            loop.call_soon_threadsafe(loop.call_later, ttl * self.ratio, self._on_due, cache_key, refresh)
+        except RuntimeError:
+            # The loop closed in the meantime
+            with self._lock:
+                self._scheduled.pop(cache_key, None)
+
+    async def _forget(self, loop: asyncio.AbstractEventLoop):
+        """Forgets the refreshes scheduled on a loop being shut down, they will never run."""
+        with self._lock:
+            for cache_key in [cache_key for cache_key, scheduled in self._scheduled.items() if scheduled is loop]:
+                del self._scheduled[cache_key]
+                self._accessed.discard(cache_key)
+            self._loops.discard(loop)
+
+    def _on_due(self, cache_key: str, refresh: Callable):
+        with self._lock:
+            self._scheduled.pop(cache_key, None)
+            accessed = cache_key in self._accessed
+            self._accessed.discard(cache_key)
+        if not accessed:
+            return
+
+        if is_logged(logger, logging.DEBUG):
+            logger.debug("Refreshing cached response %s ahead of its expiration", cache_key)
+        if inspect.iscoroutinefunction(refresh):
+            future = asyncio.ensure_future(refresh())
+        else:
+            # Sync requests block, they run on the loop's executor
+            future = asyncio.get_running_loop().run_in_executor(None, refresh)
+        future.add_done_callback(self._on_refreshed)
+
+    @staticmethod
+    def _on_refreshed(future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Refresh ahead failed: %s", future.exception())
+
+    def pending(self) -> int:
+        """Returns the number of entries with a scheduled refresh."""
+        with self._lock:
+            return len(self._scheduled)
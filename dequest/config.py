@@ -5,10 +5,69 @@ class CacheProvider(StrEnum):
     IN_MEMORY = auto()
     REDIS = auto()
     DJANGO = auto()
+    # In-process L1 in front of Redis
+    TIERED = auto()
+
+
+class JsonBackend(StrEnum):
+    STDLIB = auto()
+    ORJSON = auto()
+    UJSON = auto()
+    MSGSPEC = auto()
+
+
+class LoopRouting(StrEnum):
+    # Calls spread over the loops in turn
+    ROUND_ROBIN = auto()
+    # Every call of a DequestClient on the same loop, sharing its connection pool
+    CLIENT = auto()
+
+
+class Compression(StrEnum):
+    GZIP = auto()
+    # Requires zstandard
+    ZSTD = auto()
 
 
 class DequestConfig:
     CACHE_PROVIDER = CacheProvider.IN_MEMORY
+    # With revalidate=True, expired responses are kept with their ETag/Last-Modified for this multiple of their TTL
+    # (at least CACHE_STALE_MIN_TTL seconds), to be revalidated with conditional requests
+    CACHE_STALE_TTL_FACTOR = 2
+    CACHE_STALE_MIN_TTL = 60
+    # Bounds of the TTLs derived from the Cache-Control/Expires headers with cache_ttl="auto", None for no maximum
+    CACHE_AUTO_MIN_TTL = 0
+    CACHE_AUTO_MAX_TTL = 24 * 60 * 60
+    # Seconds error responses with these status codes are cached for, 0 disables negative caching
+    NEGATIVE_CACHE_TTL = 0
+    NEGATIVE_CACHE_STATUS_CODES = frozenset({404, 410})
+
+    # JSON library used for responses, request bodies and cache payloads
+    JSON_BACKEND = JsonBackend.STDLIB
+    # Callable encoding the JSON request bodies to bytes (e.g. orjson.dumps with options), JSON_BACKEND when None
+    REQUEST_JSON_ENCODER = None
+    # Content-Encoding of the request bodies of at least REQUEST_COMPRESSION_MIN_SIZE bytes, None sends them as is
+    REQUEST_COMPRESSION = None
+    REQUEST_COMPRESSION_MIN_SIZE = 1024
+    # Size of the chunks read from the responses consumed with ConsumerType.STREAM
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    # Instance of dequest.metrics.MetricsCollector, metrics are disabled when None
+    METRICS_COLLECTOR = None
+
+    # Share (0 to 1) of the per-request info records and call summaries that are logged
+    LOG_SAMPLE_RATE = 1.0
+
+    # OpenTelemetry tracer used to trace every call, tracing is disabled when None
+    TRACER = None
+
+    # Number of background event loops (each on its own thread) running the async clients
+    ASYNC_LOOP_SHARDS = 1
+    ASYNC_LOOP_ROUTING = LoopRouting.ROUND_ROBIN
+    # Whether the background loops are uvloop loops, requires uvloop
+    ASYNC_LOOP_UVLOOP = False
+    # Seconds the in-flight async work is given to finish when the process exits, 0 cancels it right away
+    ASYNC_LOOP_SHUTDOWN_TIMEOUT = 5.0
 
     # Redis Settings
     REDIS_HOST = "localhost"
@@ -16,6 +75,19 @@ class DequestConfig:
     REDIS_DB = 0
     REDIS_PASSWORD = None
     REDIS_SSL = False
+    # Connection pool of the Redis client, None keeps the redis-py defaults
+    REDIS_MAX_CONNECTIONS = None
+    REDIS_SOCKET_TIMEOUT = None
+    REDIS_SOCKET_CONNECT_TIMEOUT = None
+    REDIS_HEALTH_CHECK_INTERVAL = 0
+    # Prefix of every key stored by dequest, clearing the cache only deletes these keys
+    REDIS_KEY_PREFIX = "dequest:"
+
+    # Tiered cache settings (in-process L1 in front of Redis)
+    TIERED_L1_MAX_ENTRIES = 1024
+    TIERED_L1_TTL = 5
+    # None, "pubsub" or "keyspace"
+    TIERED_INVALIDATION = None
 
     @classmethod
     def config(cls, **kwargs):
@@ -1,8 +1,22 @@
+import asyncio
+import contextlib
+import gzip
+import logging
+import os
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterator
 from enum import StrEnum, auto
+from pathlib import Path
+from typing import IO, Any, NamedTuple, Union
 
 import httpx
 
-from dequest.utils import get_logger
+from dequest.config import Compression, DequestConfig
+from dequest.metrics import MetricsCollector
+from dequest.parameter_types import FileBody, StreamBody
+from dequest.serialization import json_dumps, json_loads
+from dequest.tracing import inject_trace_context, start_span
+from dequest.utils import get_logger, is_logged
 
 logger = get_logger()
 
@@ -19,53 +33,531 @@ class ConsumerType(StrEnum):
     XML = auto()
     JSON = auto()
     TEXT = auto()
+    # Raw body, not decoded
+    BYTES = auto()
+    # ResponseStream reading the body chunk by chunk
+    STREAM = auto()
+
+
+class HttpResponse(NamedTuple):
+    """Decoded body of a response, with its status code and headers."""
+
+    status_code: int
+    headers: httpx.Headers
+    data: Any
+
+    @property
+    def not_modified(self) -> bool:
+        """Whether the upstream answered a conditional request with 304 Not Modified, the response has no body."""
+        return self.status_code == httpx.codes.NOT_MODIFIED
+
+
+StreamTarget = Union[str, os.PathLike, IO[bytes], bytearray, memoryview]
+
+
+def _get_writer(target: IO[bytes] | bytearray | memoryview) -> Callable[[bytes], None]:
+    """Returns a function writing the chunks to a file object, or to a writable buffer from its start."""
+    if hasattr(target, "write"):
+        return target.write
+
+    view = memoryview(target).cast("B")
+    if view.readonly:
+        raise TypeError("Cannot write the response body to a read-only buffer")
+    offset = 0
+
+    def write(chunk: bytes):
+        nonlocal offset
+        end = offset + len(chunk)
+        if end > len(view):
+            raise ValueError("The response body does not fit in the buffer")
+        view[offset:end] = chunk
+        offset = end
+
+    return write
+
+
+class ResponseStream:
+    """
+    Body of a response consumed with ConsumerType.STREAM, read from the connection chunk by chunk so it is never held
+    in memory as a whole. Iterating it or writing it somewhere consumes it and releases the connection, use it as a
+    context manager to release the connection when the body may not be read. The request metrics and span are
+    recorded once the stream is closed, with the bytes actually read.
+    """
+
+    def __init__(self, response: httpx.Response, owned_client: httpx.Client | None = None):
+        self.response = response
+        self._owned_client = owned_client
+        self._on_close: Callable[[], None] | None = None
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def headers(self) -> httpx.Headers:
+        return self.response.headers
+
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            yield from self.response.iter_bytes(DequestConfig.STREAM_CHUNK_SIZE)
+        finally:
+            self.close()
+
+    def write_to(self, target: StreamTarget) -> int:
+        """
+        Writes the body to a file path, a binary file object or a writable buffer (e.g. a preallocated bytearray or
+        memoryview) and returns the number of bytes written.
+        """
+        if isinstance(target, str | os.PathLike):
+            with Path(target).open("wb") as file:
+                return self.write_to(file)
+
+        write = _get_writer(target)
+        size = 0
+        for chunk in self:
+            write(chunk)
+            size += len(chunk)
+        return size
+
+    def close(self):
+        self.response.close()
+        if self._owned_client is not None:
+            self._owned_client.close()
+        _call_on_close(self)
+
+    def __enter__(self) -> "ResponseStream":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncResponseStream:
+    """Body of a response consumed with ConsumerType.STREAM by the async clients, see ResponseStream."""
+
+    def __init__(self, response: httpx.Response, owned_client: httpx.AsyncClient | None = None):
+        self.response = response
+        self._owned_client = owned_client
+        self._on_close: Callable[[], None] | None = None
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def headers(self) -> httpx.Headers:
+        return self.response.headers
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self.response.aiter_bytes(DequestConfig.STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await self.aclose()
+
+    async def write_to(self, target: StreamTarget) -> int:
+        """
+        Writes the body to a file path, a binary file object or a writable buffer (e.g. a preallocated bytearray or
+        memoryview) and returns the number of bytes written.
+        """
+        if isinstance(target, str | os.PathLike):
+            with Path(target).open("wb") as file:
+                return await self.write_to(file)
+
+        write = _get_writer(target)
+        size = 0
+        async for chunk in self:
+            write(chunk)
+            size += len(chunk)
+        return size
+
+    async def aclose(self):
+        await self.response.aclose()
+        if self._owned_client is not None:
+            await self._owned_client.aclose()
+        _call_on_close(self)
+
+    async def __aenter__(self) -> "AsyncResponseStream":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+def _call_on_close(stream: ResponseStream | AsyncResponseStream):
+    # Runs once, the stream may be closed again
+    on_close, stream._on_close = stream._on_close, None
+    if on_close is not None:
+        on_close()
+
+
+def _open_file(body: FileBody) -> contextlib.AbstractContextManager[IO[bytes]]:
+    if isinstance(body.source, str | os.PathLike):
+        return Path(body.source).open("rb")
+    if body.position is not None:
+        body.source.seek(body.position)
+    else:
+        # An unseekable file object would be sent again from where the failed attempt stopped
+        _start_stream(body)
+    # The caller's file object is left open
+    return contextlib.nullcontext(body.source)
+
+
+def _get_file_size(body: FileBody) -> int | None:
+    if isinstance(body.source, str | os.PathLike):
+        return Path(body.source).stat().st_size
+    try:
+        return os.fstat(body.source.fileno()).st_size - body.source.tell()
+    except (AttributeError, OSError, ValueError):
+        # In-memory or unseekable file objects are sent with chunked transfer encoding
+        return None
+
+
+def _start_stream(body: FileBody | StreamBody):
+    if body.consumed:
+        if isinstance(body, FileBody):
+            raise RuntimeError("An unseekable FileBody can only be sent once, its request cannot be retried")
+        raise RuntimeError("A StreamBody can only be sent once, its request cannot be retried")
+    body.consumed = True
+
+
+class _Upload:
+    """Reads a FileBody or StreamBody chunk by chunk while the request is sent, counting the bytes sent."""
+
+    def __init__(self, body: FileBody | StreamBody):
+        self.body = body
+        self.size = 0
+
+    def chunks(self) -> Iterator[bytes]:
+        for chunk in self._read():
+            self.size += len(chunk)
+            yield chunk
+
+    def _read(self) -> Iterator[bytes]:
+        if isinstance(self.body, StreamBody):
+            if isinstance(self.body.chunks, AsyncIterable):
+                raise TypeError("Async iterables can only be streamed by the async clients")
+            _start_stream(self.body)
+            yield from self.body.chunks
+            return
+        with _open_file(self.body) as file:
+            while chunk := file.read(DequestConfig.STREAM_CHUNK_SIZE):
+                yield chunk
+
+    async def achunks(self) -> AsyncIterator[bytes]:
+        async for chunk in self._aread():
+            self.size += len(chunk)
+            yield chunk
+
+    async def _aread(self) -> AsyncIterator[bytes]:
+        if isinstance(self.body, StreamBody):
+            _start_stream(self.body)
+            if isinstance(self.body.chunks, AsyncIterable):
+                async for chunk in self.body.chunks:
+                    yield chunk
+            else:
+                for chunk in self.body.chunks:
+                    yield chunk
+            return
+        # Disk reads run on the executor, they would block the event loop
+        loop = asyncio.get_running_loop()
+        with _open_file(self.body) as file:
+            while chunk := await loop.run_in_executor(None, file.read, DequestConfig.STREAM_CHUNK_SIZE):
+                yield chunk
+
+
+def _compress(content: bytes, compression: Compression) -> bytes:
+    if compression == Compression.GZIP:
+        # mtime=0 keeps the output of identical bodies identical
+        return gzip.compress(content, compresslevel=6, mtime=0)
+    if compression == Compression.ZSTD:
+        import zstandard  # noqa: PLC0415
+
+        return zstandard.ZstdCompressor().compress(content)
+    raise ValueError("Invalid request compression")
+
+
+def _encode_json_body(
+    headers: dict | None,
+    json: dict | bytes | FileBody | StreamBody | None,
+    data: dict | None,
+) -> tuple[httpx.Headers, bytes | _Upload | None]:
+    """
+    Encodes the JSON body with DequestConfig.REQUEST_JSON_ENCODER, or the configured JSON backend, pre-encoded
+    bodies are sent as is. Bodies of at least REQUEST_COMPRESSION_MIN_SIZE bytes are compressed when
+    REQUEST_COMPRESSION is set. Like httpx, form data takes precedence over the JSON body.
+    File and stream bodies are uploaded as they are read, with their size as Content-Length when it is known.
+    """
+    request_headers = httpx.Headers(headers)
+    if isinstance(json, FileBody | StreamBody):
+        request_headers.setdefault("Content-Type", json.content_type)
+        size = _get_file_size(json) if isinstance(json, FileBody) else None
+        if size is not None:
+            request_headers.setdefault("Content-Length", str(size))
+        return request_headers, _Upload(json)
+    if data or json is None:
+        return request_headers, None
+
+    request_headers.setdefault("Content-Type", "application/json")
+    if isinstance(json, bytes | bytearray | memoryview):
+        content = bytes(json)
+    else:
+        encoder = DequestConfig.REQUEST_JSON_ENCODER
+        content = encoder(json) if encoder is not None else json_dumps(json)
+        if isinstance(content, str):
+            content = content.encode()
+
+    compression = DequestConfig.REQUEST_COMPRESSION
+    if (
+        compression is not None
+        and len(content) >= DequestConfig.REQUEST_COMPRESSION_MIN_SIZE
+        and "Content-Encoding" not in request_headers
+    ):
+        content = _compress(content, compression)
+        request_headers["Content-Encoding"] = compression
+    return request_headers, content
+
+
+def _decode_response(response: httpx.Response, consume: ConsumerType, conditional: bool = False) -> HttpResponse:
+    """:param conditional: Whether the request revalidates a stale response, a 304 Not Modified is then expected."""
+    if conditional and response.status_code == httpx.codes.NOT_MODIFIED:
+        # Answer to a conditional request, raise_for_status() would take it for a failed redirect
+        return HttpResponse(response.status_code, response.headers, None)
+    response.raise_for_status()
+    if consume == ConsumerType.JSON:
+        # Empty responses, e.g. 204 No Content, are decoded as None
+        data = json_loads(response.content) if response.content else None
+    elif consume == ConsumerType.BYTES:
+        data = response.content
+    else:
+        data = response.text
+    return HttpResponse(response.status_code, response.headers, data)
+
+
+def _open_stream(http_client: httpx.Client | None, method: str, url: str, **kwargs) -> ResponseStream:
+    """Sends the request and returns as soon as the response headers are received."""
+    # A one-off client lives as long as the stream
+    client = http_client or httpx.Client()
+    try:
+        response = client.send(client.build_request(method, url, **kwargs), stream=True)
+    except BaseException:
+        if http_client is None:
+            client.close()
+        raise
+    return ResponseStream(response, None if http_client is not None else client)
+
+
+async def _aopen_stream(http_client: httpx.AsyncClient | None, method: str, url: str, **kwargs) -> AsyncResponseStream:
+    """Sends the request and returns as soon as the response headers are received."""
+    client = http_client or httpx.AsyncClient()
+    try:
+        response = await client.send(client.build_request(method, url, **kwargs), stream=True)
+    except BaseException:
+        if http_client is None:
+            await client.aclose()
+        raise
+    return AsyncResponseStream(response, None if http_client is not None else client)
+
+
+def _stream_response(stream: ResponseStream) -> HttpResponse:
+    if not stream.response.is_success:
+        # Error bodies are short, they are read for the HTTPStatusError
+        with stream:
+            stream.response.read()
+            stream.response.raise_for_status()
+    return HttpResponse(stream.status_code, stream.headers, stream)
+
+
+async def _astream_response(stream: AsyncResponseStream) -> HttpResponse:
+    if not stream.response.is_success:
+        async with stream:
+            await stream.response.aread()
+            stream.response.raise_for_status()
+    return HttpResponse(stream.status_code, stream.headers, stream)
+
+
+def _request_started(metrics: MetricsCollector, client_name: str, method: str, url: str) -> tuple[str, float]:
+    host = httpx.URL(url).host
+    metrics.request_started(client_name, method, host)
+    return host, time.perf_counter()
+
+
+def _request_finished(
+    metrics: MetricsCollector,
+    client_name: str,
+    method: str,
+    host: str,
+    started_at: float,
+    content: bytes | _Upload | None,
+    response: httpx.Response | None,
+):
+    if isinstance(content, _Upload):
+        sent = content.size
+    else:
+        sent = len(response.request.content) if response is not None else len(content or b"")
+    metrics.request_finished(
+        client_name,
+        method,
+        host,
+        response.status_code if response is not None else None,
+        time.perf_counter() - started_at,
+        sent,
+        response.num_bytes_downloaded if response is not None else 0,
+    )
 
 
 def sync_request(
     method: str,
     url: str,
     headers: dict,
-    json: dict,
+    json: dict | bytes | FileBody | StreamBody,
     params: dict,
     data: dict,
     timeout: int,
     consume: ConsumerType,
-):
-    logger.info("Sending %s request to %s", method, url)
-    response = httpx.request(
-        method.upper(),
-        url,
-        headers=headers,
-        json=json,
-        params=params,
-        data=data,
-        timeout=timeout,
-    )
-    response.raise_for_status()
+    http_client: httpx.Client | None = None,
+    client_name: str = "",
+    conditional: bool = False,
+) -> HttpResponse:
+    if is_logged(logger, logging.DEBUG):
+        logger.debug("Sending %s request to %s", method, url)
+    method = method.upper()
+    request_headers, content = _encode_json_body(headers, json, data)
+    request_content = content.chunks() if isinstance(content, _Upload) else content
+    metrics = DequestConfig.METRICS_COLLECTOR
+    if metrics is not None:
+        host, started_at = _request_started(metrics, client_name, method, url)
+
+    response = None
+    stream = None
+    span = None
+    streaming = consume == ConsumerType.STREAM
 
-    return response.json() if consume == ConsumerType.JSON else response.text
+    def finish_stream():
+        # A streamed request finishes once its body is read or the stream is closed
+        if metrics is not None:
+            _request_finished(metrics, client_name, method, host, started_at, content, response)
+        if span is not None:
+            span.end()
+
+    try:
+        with start_span(method, {"http.request.method": method, "url.full": url}, end_on_exit=not streaming) as span:
+            if span is not None:
+                inject_trace_context(request_headers)
+            try:
+                if streaming:
+                    stream = _open_stream(
+                        http_client,
+                        method,
+                        url,
+                        headers=request_headers,
+                        content=request_content,
+                        params=params,
+                        data=data,
+                        timeout=timeout,
+                    )
+                    response = stream.response
+                else:
+                    response = (http_client or httpx).request(
+                        method,
+                        url,
+                        headers=request_headers,
+                        content=request_content,
+                        params=params,
+                        data=data,
+                        timeout=timeout,
+                    )
+            finally:
+                if metrics is not None and not streaming:
+                    _request_finished(metrics, client_name, method, host, started_at, content, response)
+            if span is not None:
+                span.set_attribute("http.response.status_code", response.status_code)
+            if stream is not None:
+                result = _stream_response(stream)
+                stream._on_close = finish_stream
+                return result
+            return _decode_response(response, consume, conditional)
+    except BaseException:
+        if streaming:
+            finish_stream()
+        raise
 
 
 async def async_request(
     method: str,
     url: str,
     headers: dict,
-    json: dict,
+    json: dict | bytes | FileBody | StreamBody,
     params: dict,
     data: dict,
     timeout: int,
     consume: ConsumerType,
-):
-    logger.info("Sending %s request to %s", method, url)
-    async with httpx.AsyncClient() as client:
-        response = await client.request(
-            method.upper(),
-            url,
-            headers=headers,
-            json=json,
-            params=params,
-            data=data,
-            timeout=timeout,
-        )
-        response.raise_for_status()
-    return response.json() if consume == ConsumerType.JSON else response.text
+    http_client: httpx.AsyncClient | None = None,
+    client_name: str = "",
+    conditional: bool = False,
+) -> HttpResponse:
+    if is_logged(logger, logging.DEBUG):
+        logger.debug("Sending %s request to %s", method, url)
+    method = method.upper()
+    request_headers, content = _encode_json_body(headers, json, data)
+    request_content = content.achunks() if isinstance(content, _Upload) else content
+    metrics = DequestConfig.METRICS_COLLECTOR
+    if metrics is not None:
+        host, started_at = _request_started(metrics, client_name, method, url)
+
+    response = None
+    stream = None
+    span = None
+    streaming = consume == ConsumerType.STREAM
+
+    def finish_stream():
+        # A streamed request finishes once its body is read or the stream is closed
+        if metrics is not None:
+            _request_finished(metrics, client_name, method, host, started_at, content, response)
+        if span is not None:
+            span.end()
+
+    try:
+        with start_span(method, {"http.request.method": method, "url.full": url}, end_on_exit=not streaming) as span:
+            if span is not None:
+                inject_trace_context(request_headers)
+            try:
+                if streaming:
+                    stream = await _aopen_stream(
+                        http_client,
+                        method,
+                        url,
+                        headers=request_headers,
+                        content=request_content,
+                        params=params,
+                        data=data,
+                        timeout=timeout,
+                    )
+                    response = stream.response
+                else:
+                    # Without a pooled client, a one-off client is opened for the request
+                    pool = contextlib.nullcontext(http_client) if http_client is not None else httpx.AsyncClient()
+                    async with pool as client:
+                        response = await client.request(
+                            method,
+                            url,
+                            headers=request_headers,
+                            content=request_content,
+                            params=params,
+                            data=data,
+                            timeout=timeout,
+                        )
+            finally:
+                if metrics is not None and not streaming:
+                    _request_finished(metrics, client_name, method, host, started_at, content, response)
+            if span is not None:
+                span.set_attribute("http.response.status_code", response.status_code)
+            if stream is not None:
+                result = await _astream_response(stream)
+                stream._on_close = finish_stream
+                return result
+            return _decode_response(response, consume, conditional)
+    except BaseException:
+        if streaming:
+            finish_stream()
+        raise
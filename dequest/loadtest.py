@@ -0,0 +1,409 @@
+"""
+Load-test harness driving dequest clients against a local stand-in upstream.
+
+Run it with ``dequest-loadtest --help`` (or ``python -m dequest.loadtest --help``).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import httpx
+
+from dequest.circuit_breaker import CircuitBreaker
+from dequest.clients import DequestClient, async_client, sync_client
+from dequest.parameter_types import PathParameter
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+
+def latency_sampler(
+    distribution: str,
+    mean: float,
+    sigma: float = 0.5,
+    rng: random.Random | None = None,
+) -> Callable[[], float]:
+    """
+    Returns a function sampling latencies in seconds.
+
+    :param distribution: One of "constant", "uniform" (between 0 and twice the mean), "exponential" or "lognormal".
+    :param mean: Mean latency in seconds.
+    :param sigma: Standard deviation of the underlying normal distribution of "lognormal" latencies.
+    :param rng: Random generator to sample from, for reproducible runs.
+    """
+    rng = rng or random.Random()  # noqa: S311
+    if mean <= 0:
+        return lambda: 0.0
+    if distribution == "constant":
+        return lambda: mean
+    if distribution == "uniform":
+        return lambda: rng.uniform(0, 2 * mean)
+    if distribution == "exponential":
+        return lambda: rng.expovariate(1 / mean)
+    if distribution == "lognormal":
+        # Shift mu so the distribution keeps the requested mean
+        mu = math.log(mean) - sigma**2 / 2
+        return lambda: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"Invalid latency distribution: {distribution}")
+
+
+class FakeUpstream:
+    """
+    A local HTTP/1.1 server standing in for an upstream API. Every response is delayed by a sampled latency,
+    a share of the requests fails with a 500 and another share is throttled with a 429 and a Retry-After header.
+    The server runs its own event loop in a background thread, use it as a context manager.
+    """
+
+    def __init__(
+        self,
+        latency: Callable[[], float] = lambda: 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = None,
+    ):
+        """
+        :param latency: Function returning the delay of each response in seconds, see latency_sampler.
+        :param error_rate: Share of the requests answered with a 500 Internal Server Error.
+        :param throttle_rate: Share of the requests answered with a 429 Too Many Requests.
+        :param retry_after: Value in seconds of the Retry-After header of 429 responses.
+        :param host: Interface to listen on.
+        :param port: Port to listen on, 0 picks a free one.
+        :param seed: Seed of the random generator choosing the failing requests.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.host = host
+        self.port = port
+        self.responses = Counter()
+        self._rng = random.Random(seed)  # noqa: S311
+        self._loop = None
+        self._thread = None
+        self._server = None
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def requests(self) -> int:
+        """Number of requests received so far."""
+        return self.responses.total()
+
+    def start(self) -> "FakeUpstream":
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle, self.host, self.port, backlog=4096),
+            self._loop,
+        ).result()
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "FakeUpstream":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    async def _shutdown(self):
+        self._server.close()
+        # Closing the sockets ends the handlers waiting for the next request of kept-alive connections
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    def _pick_response(self) -> tuple[int, str, dict[str, str]]:
+        draw = self._rng.random()
+        if draw < self.throttle_rate:
+            return 429, "Too Many Requests", {"Retry-After": str(self.retry_after)}
+        if draw < self.throttle_rate + self.error_rate:
+            return 500, "Internal Server Error", {}
+        return 200, "OK", {}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+                path = head[0].split(" ")[1]
+                headers = {}
+                for line in head[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length", 0)):
+                    await reader.readexactly(int(headers["content-length"]))
+
+                status, reason, response_headers = self._pick_response()
+                self.responses[status] += 1
+                await asyncio.sleep(self.latency())
+
+                body = json.dumps({"path": path, "status": status}).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                response_headers |= {
+                    "Content-Type": "application/json",
+                    "Content-Length": str(len(body)),
+                    "Connection": "keep-alive" if keep_alive else "close",
+                }
+                writer.write(
+                    f"HTTP/1.1 {status} {reason}\r\n".encode()
+                    + "".join(f"{name}: {value}\r\n" for name, value in response_headers.items()).encode()
+                    + b"\r\n"
+                    + body,
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank - 1, 0)]
+
+
+def _failure_reason(error: BaseException) -> str:
+    cause = error.__cause__ or error
+    if isinstance(cause, httpx.HTTPStatusError):
+        return f"HTTP {cause.response.status_code}"
+    return type(cause).__name__
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a load-test run. Latencies are in seconds."""
+
+    calls: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    failures: Counter = field(default_factory=Counter)
+    upstream_responses: Counter = field(default_factory=Counter)
+
+    @property
+    def throughput(self) -> float:
+        """Completed calls per second."""
+        return self.calls / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def upstream_requests(self) -> int:
+        return self.upstream_responses.total()
+
+    @property
+    def amplification(self) -> float:
+        """Upstream requests sent per client call, retries push it above 1 and cache hits below."""
+        return self.upstream_requests / self.calls if self.calls else 0.0
+
+    def record(self, latency: float, error: BaseException | None = None):
+        self.calls += 1
+        self.latencies.append(latency)
+        if error is not None:
+            self.failures[_failure_reason(error)] += 1
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "succeeded": self.calls - self.failures.total(),
+            "failed": dict(self.failures),
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": round(self.throughput, 1),
+            "latency_ms": {
+                name: round(_percentile(latencies, percent) * 1000, 2)
+                for name, percent in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+            },
+            "upstream_requests": self.upstream_requests,
+            "upstream_responses": {str(status): count for status, count in sorted(self.upstream_responses.items())},
+            "amplification": round(self.amplification, 3),
+        }
+
+    def format(self) -> str:
+        report = self.as_dict()
+        latency = report["latency_ms"]
+        lines = [
+            f"calls:          {report['calls']} ({report['succeeded']} succeeded)",
+            f"elapsed:        {report['elapsed_s']} s",
+            f"throughput:     {report['throughput_rps']} calls/s",
+            f"latency (ms):   p50 {latency['p50']}  p90 {latency['p90']}  p99 {latency['p99']}  max {latency['max']}",
+            f"upstream:       {report['upstream_requests']} requests {report['upstream_responses']}",
+            f"amplification:  {report['amplification']}x",
+        ]
+        if report["failed"]:
+            lines.append(f"failures:       {report['failed']}")
+        return "\n".join(lines)
+
+
+def run_sync_load(func: Callable, concurrency: int, calls: int, duration: float | None = None) -> LoadReport:
+    """
+    Calls a sync_client function from `concurrency` threads until `calls` calls are made or `duration` seconds pass.
+    The function receives the index of the call as its only argument.
+    """
+    report = LoadReport()
+    counter = itertools.count()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration if duration else math.inf
+
+    def worker():
+        while (index := next(counter)) < calls and time.perf_counter() < deadline:
+            started_at = time.perf_counter()
+            error = None
+            try:
+                func(index)
+            except Exception as e:  # noqa: BLE001
+                error = e
+            latency = time.perf_counter() - started_at
+            with lock:
+                report.record(latency, error)
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+    report.elapsed = time.perf_counter() - started_at
+    return report
+
+
+def run_async_load(func: Callable, concurrency: int, calls: int, duration: float | None = None) -> LoadReport:
+    """
+    Calls an async_client function keeping at most `concurrency` calls in flight on the AsyncLoopManager loop
+    until `calls` calls are made or `duration` seconds pass. The function receives the index of the call.
+    """
+    report = LoadReport()
+    slots = threading.BoundedSemaphore(concurrency)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration if duration else math.inf
+
+    def on_done(future, started_at):
+        latency = time.perf_counter() - started_at
+        with lock:
+            report.record(latency, future.exception())
+        slots.release()
+
+    started_at = time.perf_counter()
+    for index in range(calls):
+        slots.acquire()
+        if time.perf_counter() >= deadline:
+            slots.release()
+            break
+        call_started_at = time.perf_counter()
+        try:
+            future = func(index)
+        except Exception as e:  # noqa: BLE001
+            # The call failed before it was scheduled, e.g. an invalid argument or the loops shut down
+            with lock:
+                report.record(time.perf_counter() - call_started_at, e)
+            slots.release()
+            continue
+        future.add_done_callback(lambda future, at=call_started_at: on_done(future, at))
+    # Wait for the calls in flight
+    for _ in range(concurrency):
+        slots.acquire()
+    report.elapsed = time.perf_counter() - started_at
+    return report
+
+
+def _build_client(args: argparse.Namespace, upstream_url: str) -> tuple[DequestClient, Callable]:
+    breaker = (
+        CircuitBreaker(
+            failure_threshold=args.breaker_threshold,
+            recovery_timeout=args.breaker_recovery,
+            name="loadtest",
+        )
+        if args.breaker_threshold
+        else None
+    )
+    client = DequestClient(limits=httpx.Limits(max_connections=args.max_connections), circuit_breaker=breaker)
+    decorator = sync_client if args.client == "sync" else async_client
+    keys = args.keys
+
+    @decorator(
+        url=f"{upstream_url}/items/{{item_id}}",
+        timeout=args.timeout,
+        retries=args.retries,
+        retry_on_exceptions=(httpx.HTTPError,),
+        retry_delay=args.retry_delay,
+        enable_cache=bool(args.cache_ttl),
+        cache_ttl=args.cache_ttl or None,
+        client=client,
+    )
+    def get_item(item_id: PathParameter[int]):
+        pass
+
+    return client, lambda index: get_item(index % keys)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="dequest-loadtest",
+        description="Drives dequest clients against a local fake upstream and reports throughput, "
+        "latency percentiles and upstream request amplification.",
+    )
+    client = parser.add_argument_group("client")
+    client.add_argument("--client", choices=["sync", "async"], default="sync", help="Client decorator to drive.")
+    client.add_argument("--concurrency", type=int, default=50, help="Calls in flight at once.")
+    client.add_argument("--calls", type=int, default=1000, help="Number of calls to make.")
+    client.add_argument("--duration", type=float, help="Stop after this many seconds even if calls are left.")
+    client.add_argument("--max-connections", type=int, default=100, help="Size of the connection pool.")
+    client.add_argument("--timeout", type=float, default=30, help="Request timeout in seconds.")
+    client.add_argument("--retries", type=int, default=0, help="Retries of failed calls.")
+    client.add_argument("--retry-delay", type=float, default=0.0, help="Delay in seconds between retries.")
+    client.add_argument("--breaker-threshold", type=int, default=0, help="Circuit breaker failures, 0 disables it.")
+    client.add_argument("--breaker-recovery", type=int, default=30, help="Circuit breaker recovery in seconds.")
+    client.add_argument("--cache-ttl", type=int, default=0, help="Cache responses for this many seconds, 0 disables.")
+    client.add_argument("--keys", type=int, default=100, help="Distinct URLs called, in round robin.")
+    upstream = parser.add_argument_group("upstream")
+    upstream.add_argument("--latency-ms", type=float, default=20.0, help="Mean response latency in milliseconds.")
+    upstream.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="constant")
+    upstream.add_argument("--latency-sigma", type=float, default=0.5, help="Sigma of lognormal latencies.")
+    upstream.add_argument("--error-rate", type=float, default=0.0, help="Share of 500 responses.")
+    upstream.add_argument("--throttle-rate", type=float, default=0.0, help="Share of 429 responses.")
+    upstream.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds of 429 responses.")
+    upstream.add_argument("--seed", type=int, help="Seed for reproducible latencies and failures.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    rng = random.Random(args.seed)  # noqa: S311
+    latency = latency_sampler(args.latency_distribution, args.latency_ms / 1000, args.latency_sigma, rng)
+
+    with FakeUpstream(latency, args.error_rate, args.throttle_rate, args.retry_after, seed=args.seed) as upstream:
+        client, func = _build_client(args, upstream.url)
+        run_load = run_sync_load if args.client == "sync" else run_async_load
+        report = run_load(func, args.concurrency, args.calls, args.duration)
+        report.upstream_responses = upstream.responses.copy()
+        client.close()
+
+    print(json.dumps(report.as_dict(), indent=2) if args.json else report.format())  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
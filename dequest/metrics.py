@@ -0,0 +1,259 @@
+import bisect
+import threading
+from collections import Counter, defaultdict
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricsCollector:
+    """
+    Receives the metrics of dequest. Every hook is a no-op, subclasses override the ones they collect.
+    Set an instance as DequestConfig.METRICS_COLLECTOR to enable metrics, they cost nothing while it is None.
+    """
+
+    def request_started(self, client: str, method: str, host: str) -> None:
+        """
+        Called when an HTTP request is sent. client is the qualified name of the decorated function, the same label
+        as in retry().
+        """
+
+    def request_finished(
+        self,
+        client: str,
+        method: str,
+        host: str,
+        status_code: int | None,
+        duration: float,
+        bytes_sent: int,
+        bytes_received: int,
+    ) -> None:
+        """Called when an HTTP request completes. status_code is None when no response was received."""
+
+    def cache_event(self, provider: str, event: str) -> None:
+        """Called on cache "hit", "miss", "eviction" and "revalidated" (304 Not Modified) events."""
+
+    def retry(self, client: str) -> None:
+        """Called every time a client retries a failed request."""
+
+    def breaker_transition(self, breaker: str, from_state: str, to_state: str) -> None:
+        """Called when a circuit breaker changes state."""
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        return {
+            "buckets": dict(zip([*self.buckets, float("inf")], self.counts, strict=True)),
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+class InMemoryMetricsCollector(MetricsCollector):
+    """Zero-dependency collector keeping the metrics in process, read them with snapshot()."""
+
+    def __init__(self, latency_buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        """
+        :param latency_buckets: Upper bounds in seconds of the request latency histogram buckets.
+        """
+        self.latency_buckets = latency_buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latency = defaultdict(lambda: _Histogram(self.latency_buckets))
+            self.responses = Counter()
+            self.in_flight = Counter()
+            self.bytes_sent = Counter()
+            self.bytes_received = Counter()
+            self.cache_events = Counter()
+            self.retries = Counter()
+            self.breaker_transitions = Counter()
+
+    def request_started(self, client, method, host):
+        with self._lock:
+            self.in_flight[(client, host)] += 1
+
+    def request_finished(self, client, method, host, status_code, duration, bytes_sent, bytes_received):
+        with self._lock:
+            self.in_flight[(client, host)] -= 1
+            self.latency[(client, method, host)].observe(duration)
+            self.responses[(client, method, host, status_code)] += 1
+            self.bytes_sent[(client, host)] += bytes_sent
+            self.bytes_received[(client, host)] += bytes_received
+
+    def cache_event(self, provider, event):
+        with self._lock:
+            self.cache_events[(provider, event)] += 1
+
+    def retry(self, client):
+        with self._lock:
+            self.retries[client] += 1
+
+    def breaker_transition(self, breaker, from_state, to_state):
+        with self._lock:
+            self.breaker_transitions[(breaker, from_state, to_state)] += 1
+
+    def cache_hit_ratio(self, provider: str) -> float | None:
+        """Returns the ratio of hits among the lookups of a cache provider, None before any lookup."""
+        with self._lock:
+            hits = self.cache_events[(provider, "hit")]
+            lookups = hits + self.cache_events[(provider, "miss")]
+        return hits / lookups if lookups else None
+
+    def snapshot(self) -> dict:
+        """Returns a copy of every metric collected so far."""
+        with self._lock:
+            return {
+                "latency": {key: histogram.snapshot() for key, histogram in self.latency.items()},
+                "responses": dict(self.responses),
+                "in_flight": dict(self.in_flight),
+                "bytes_sent": dict(self.bytes_sent),
+                "bytes_received": dict(self.bytes_received),
+                "cache_events": dict(self.cache_events),
+                "retries": dict(self.retries),
+                "breaker_transitions": dict(self.breaker_transitions),
+            }
+
+
+class PrometheusMetricsCollector(MetricsCollector):
+    """Exports the metrics through prometheus_client, which must be installed."""
+
+    def __init__(self, registry=None, namespace: str = "dequest", latency_buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        :param registry: Prometheus registry to register the metrics in, defaults to the global registry.
+        :param namespace: Prefix of the metric names.
+        :param latency_buckets: Upper bounds in seconds of the request latency histogram buckets.
+        """
+        from prometheus_client import REGISTRY, Counter, Gauge, Histogram  # noqa: PLC0415
+
+        registry = registry if registry is not None else REGISTRY
+        self.request_duration = Histogram(
+            "request_duration_seconds",
+            "Latency of HTTP requests sent by dequest.",
+            ["client", "method", "host", "status"],
+            namespace=namespace,
+            buckets=latency_buckets,
+            registry=registry,
+        )
+        self.requests_in_flight = Gauge(
+            "requests_in_flight",
+            "HTTP requests sent by dequest awaiting a response.",
+            ["client", "host"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.bytes_sent = Counter(
+            "sent_bytes",
+            "Bytes of HTTP request bodies sent by dequest.",
+            ["client", "host"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.bytes_received = Counter(
+            "received_bytes",
+            "Bytes of HTTP responses received by dequest.",
+            ["client", "host"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.cache_events = Counter(
+            "cache_events",
+            "Cache hits, misses and evictions.",
+            ["provider", "event"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.retries = Counter(
+            "retries",
+            "Retries of failed requests.",
+            ["client"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.breaker_transitions = Counter(
+            "circuit_breaker_transitions",
+            "State changes of circuit breakers.",
+            ["breaker", "from_state", "to_state"],
+            namespace=namespace,
+            registry=registry,
+        )
+
+    def request_started(self, client, method, host):
+        self.requests_in_flight.labels(client, host).inc()
+
+    def request_finished(self, client, method, host, status_code, duration, bytes_sent, bytes_received):
+        self.requests_in_flight.labels(client, host).dec()
+        self.request_duration.labels(client, method, host, str(status_code or "error")).observe(duration)
+        self.bytes_sent.labels(client, host).inc(bytes_sent)
+        self.bytes_received.labels(client, host).inc(bytes_received)
+
+    def cache_event(self, provider, event):
+        self.cache_events.labels(provider, event).inc()
+
+    def retry(self, client):
+        self.retries.labels(client).inc()
+
+    def breaker_transition(self, breaker, from_state, to_state):
+        self.breaker_transitions.labels(breaker, from_state, to_state).inc()
+
+
+class OpenTelemetryMetricsCollector(MetricsCollector):
+    """Exports the metrics through the OpenTelemetry metrics API, which must be installed."""
+
+    def __init__(self, meter_provider=None):
+        """
+        :param meter_provider: OpenTelemetry meter provider, defaults to the global meter provider.
+        """
+        from opentelemetry import metrics  # noqa: PLC0415
+
+        meter = metrics.get_meter("dequest", meter_provider=meter_provider)
+        self.request_duration = meter.create_histogram(
+            "dequest.request.duration",
+            unit="s",
+            description="Latency of HTTP requests sent by dequest.",
+        )
+        self.requests_in_flight = meter.create_up_down_counter(
+            "dequest.requests.in_flight",
+            description="HTTP requests sent by dequest awaiting a response.",
+        )
+        self.bytes_sent = meter.create_counter("dequest.sent", unit="By", description="Bytes of request bodies.")
+        self.bytes_received = meter.create_counter("dequest.received", unit="By", description="Bytes of responses.")
+        self.cache_events = meter.create_counter("dequest.cache.events", description="Cache hits, misses, evictions.")
+        self.retries = meter.create_counter("dequest.retries", description="Retries of failed requests.")
+        self.breaker_transitions = meter.create_counter(
+            "dequest.circuit_breaker.transitions",
+            description="State changes of circuit breakers.",
+        )
+
+    def request_started(self, client, method, host):
+        self.requests_in_flight.add(1, {"client": client, "server.address": host})
+
+    def request_finished(self, client, method, host, status_code, duration, bytes_sent, bytes_received):
+        attributes = {"client": client, "http.request.method": method, "server.address": host}
+        self.requests_in_flight.add(-1, {"client": client, "server.address": host})
+        self.bytes_sent.add(bytes_sent, attributes)
+        self.bytes_received.add(bytes_received, attributes)
+        if status_code is not None:
+            attributes["http.response.status_code"] = status_code
+        self.request_duration.record(duration, attributes)
+
+    def cache_event(self, provider, event):
+        self.cache_events.add(1, {"provider": provider, "event": event})
+
+    def retry(self, client):
+        self.retries.add(1, {"client": client})
+
+    def breaker_transition(self, breaker, from_state, to_state):
+        self.breaker_transitions.add(1, {"breaker": breaker, "from_state": from_state, "to_state": to_state})
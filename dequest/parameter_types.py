@@ -1,4 +1,6 @@
-from typing import Any, Generic, Protocol, TypeVar
+import os
+from collections.abc import AsyncIterable, Iterable
+from typing import IO, Any, Generic, Protocol, TypeVar, Union
 
 T = TypeVar("T")
 
@@ -70,3 +72,41 @@ class JsonBody:
     @classmethod
     def __class_getitem__(cls, params: Any):
         return _make_parameter(cls, params)
+
+
+class FileBody:
+    """
+    Request body streamed from a file path or a binary file object, so uploads never sit in memory. A parameter
+    annotated with FileBody is given the path or the file object, or a FileBody to set the content type.
+    File objects are read from their position at the time of the call, and rewound for retries when seekable.
+    Unseekable file objects can only be sent once, like a StreamBody.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, IO[bytes]],
+        content_type: str = "application/octet-stream",
+    ):
+        self.source = source
+        self.content_type = content_type
+        self.position = None
+        if not isinstance(source, str | os.PathLike) and source.seekable():
+            self.position = source.tell()
+        self.consumed = False
+
+
+class StreamBody:
+    """
+    Request body streamed with chunked transfer encoding from an iterable of bytes, e.g. a generator, or an async
+    iterable with the async clients. A parameter annotated with StreamBody is given the iterable, or a StreamBody
+    to set the content type. The chunks can only be sent once, so the request cannot be retried.
+    """
+
+    def __init__(
+        self,
+        chunks: Union[Iterable[bytes], AsyncIterable[bytes]],
+        content_type: str = "application/octet-stream",
+    ):
+        self.chunks = chunks
+        self.content_type = content_type
+        self.consumed = False
@@ -0,0 +1,41 @@
+import functools
+import json
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from dequest.config import DequestConfig, JsonBackend
+
+
+class JsonCodec(NamedTuple):
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], bytes]
+
+
+@functools.cache
+def get_json_codec(backend: JsonBackend) -> JsonCodec:
+    """Returns the decoding and encoding functions of a JSON backend, importing it on first use."""
+    if backend == JsonBackend.STDLIB:
+        return JsonCodec(json.loads, lambda obj: json.dumps(obj).encode())
+    if backend == JsonBackend.ORJSON:
+        import orjson  # noqa: PLC0415
+
+        return JsonCodec(orjson.loads, orjson.dumps)
+    if backend == JsonBackend.UJSON:
+        import ujson  # noqa: PLC0415
+
+        return JsonCodec(ujson.loads, lambda obj: ujson.dumps(obj).encode())
+    if backend == JsonBackend.MSGSPEC:
+        import msgspec  # noqa: PLC0415
+
+        return JsonCodec(msgspec.json.decode, msgspec.json.encode)
+    raise ValueError("Invalid JSON backend")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decodes a JSON document, straight from bytes when possible, with the configured JSON backend."""
+    return get_json_codec(DequestConfig.JSON_BACKEND).loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encodes an object to a UTF-8 JSON document with the configured JSON backend."""
+    return get_json_codec(DequestConfig.JSON_BACKEND).dumps(obj)
@@ -0,0 +1,26 @@
+import contextlib
+from collections.abc import MutableMapping
+from typing import Any
+
+from dequest.config import DequestConfig
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+def start_span(name: str, attributes: dict[str, Any] | None = None, end_on_exit: bool = True):
+    """
+    Starts a span, as a child of the current one, with the tracer set in DequestConfig.TRACER.
+    Returns a context manager yielding the span, or yielding None when no tracer is configured.
+    :param end_on_exit: Whether the span ends with the context manager, otherwise the caller ends it.
+    """
+    tracer = DequestConfig.TRACER
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.start_as_current_span(name, attributes=attributes, end_on_exit=end_on_exit)
+
+
+def inject_trace_context(headers: MutableMapping[str, str]):
+    """Adds the headers propagating the current trace context (e.g. traceparent) to the outgoing request."""
+    from opentelemetry.propagate import inject  # noqa: PLC0415
+
+    inject(headers)
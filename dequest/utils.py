@@ -1,106 +1,541 @@
 import asyncio
+import atexit
 import collections
+import concurrent.futures
+import contextvars
+import dataclasses
+import datetime
+import decimal
+import enum
+import functools
 import hashlib
 import inspect
-import json
+import io
+import itertools
 import logging
+import random
+import re
+import reprlib
+import signal
 import threading
-from typing import Any, TypeVar, get_origin, get_type_hints
+import time
+import types
+import weakref
+from collections.abc import Awaitable, Callable, Iterator
+from typing import IO, Any, NamedTuple, TypeVar, Union, get_args, get_origin, get_type_hints
 from xml.etree.ElementTree import Element
 
 from defusedxml import ElementTree
 
+from dequest.config import DequestConfig, LoopRouting
 from dequest.exceptions import InvalidParameterValueError
 from dequest.parameter_types import (
+    FileBody,
     FormParameter,
     JsonBody,
     PathParameter,
     QueryParameter,
+    StreamBody,
 )
+from dequest.serialization import json_loads
 
 T = TypeVar("T")  # Generic Type for DTO
 
 
-class AsyncLoopManager:
-    """Ensures a single background event loop runs in a dedicated thread."""
+# Seconds a loop gets past the shutdown deadline to cancel its tasks and close its connection pools
+_SHUTDOWN_GRACE = 1.0
+
+
+class ShutdownReport(NamedTuple):
+    """Outcome of AsyncLoopManager.shutdown(): tasks finished while draining, and tasks cancelled at the deadline."""
+
+    completed: int
+    dropped: int
 
-    _background_loop: asyncio.AbstractEventLoop | None = None
+
+class AsyncLoopManager:
+    """
+    Runs the background event loops, DequestConfig.ASYNC_LOOP_SHARDS of them, each in a dedicated thread.
+    Several shards keep slow callbacks or DTO mapping on one loop from stalling the requests of the others.
+    The loops are drained and stopped by shutdown(), which also runs when the process exits.
+    """
+
+    _loops: list[asyncio.AbstractEventLoop] = []
+    _threads: list[threading.Thread] = []
+    _next_loop: Iterator[asyncio.AbstractEventLoop] | None = None
     _lock = threading.Lock()
+    _shut_down = False
+    _exit_handler_registered = False
+    # Coroutine functions closing the resources (e.g. connection pools) of each loop
+    _closers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, list[Callable[[], Awaitable]]] = (
+        weakref.WeakKeyDictionary()
+    )
 
     @classmethod
-    def get_event_loop(cls) -> asyncio.AbstractEventLoop:
-        """Returns an event loop that runs forever in a background thread."""
+    def get_event_loop(cls, key: Any = None) -> asyncio.AbstractEventLoop:
+        """
+        Returns the running event loop, or a background loop that runs forever in its own thread.
+        :param key: Routing key, e.g. the DequestClient of the call. With LoopRouting.CLIENT, calls with the same key
+            always run on the same loop. Calls are spread over the loops in turn otherwise.
+        """
         try:
             return asyncio.get_running_loop()
         except RuntimeError:
+            loops = cls.get_event_loops()
+            if len(loops) == 1:
+                return loops[0]
+            if key is not None and DequestConfig.ASYNC_LOOP_ROUTING == LoopRouting.CLIENT:
+                return loops[hash(key) % len(loops)]
+            with cls._lock:
+                # The loops may have been stopped since they were read
+                if cls._next_loop is None:
+                    raise RuntimeError("The background event loops are shut down") from None
+                return next(cls._next_loop)
+
+    @classmethod
+    def get_event_loops(cls) -> list[asyncio.AbstractEventLoop]:
+        """Returns the background loops, starting them on first use."""
+        if not cls._loops:
             with cls._lock:
-                if cls._background_loop is None:
-                    cls._background_loop = asyncio.new_event_loop()
-                    thread = threading.Thread(
-                        target=cls._background_loop.run_forever,
-                        daemon=True,
-                    )
-                    thread.start()
-                return cls._background_loop
+                if cls._shut_down:
+                    raise RuntimeError("The background event loops are shut down")
+                if not cls._loops:
+                    cls._start(max(1, DequestConfig.ASYNC_LOOP_SHARDS))
+        return cls._loops
+
+    @classmethod
+    def on_shutdown(cls, loop: asyncio.AbstractEventLoop, close: Callable[[], Awaitable]):
+        """Registers a coroutine function closing a resource of the loop, awaited on the loop when it is shut down."""
+        with cls._lock:
+            cls._closers.setdefault(loop, []).append(close)
+
+    @classmethod
+    def shutdown(cls, timeout: float | None = None) -> ShutdownReport:
+        """
+        Stops accepting work, then gives the in-flight requests and callbacks until the timeout to finish. The tasks
+        still running at the deadline are cancelled and reported as dropped. The connection pools are closed and the
+        loops stopped.
+        :param timeout: Seconds to wait for the in-flight work, defaults to DequestConfig.ASYNC_LOOP_SHUTDOWN_TIMEOUT.
+        """
+        timeout = DequestConfig.ASYNC_LOOP_SHUTDOWN_TIMEOUT if timeout is None else timeout
+        with cls._lock:
+            cls._shut_down = True
+            loops = list(cls._loops)
+
+        deadline = time.monotonic() + timeout
+        drains = [asyncio.run_coroutine_threadsafe(cls._drain(deadline), loop) for loop in loops]
+        completed = dropped = 0
+        for drain in drains:
+            try:
+                # A loop blocked by a callback never runs its drain, it is left behind after a grace period
+                drain_completed, drain_dropped = drain.result(max(0, deadline - time.monotonic()) + _SHUTDOWN_GRACE)
+            except concurrent.futures.TimeoutError:
+                get_logger().warning("A background event loop did not drain in time on shutdown")
+                continue
+            completed += drain_completed
+            dropped += drain_dropped
+        cls._stop(_SHUTDOWN_GRACE)
+
+        if dropped:
+            get_logger().warning("Dropped %s in-flight tasks of the background event loops on shutdown", dropped)
+        return ShutdownReport(completed, dropped)
+
+    @classmethod
+    async def _drain(cls, deadline: float) -> tuple[int, int]:
+        current = asyncio.current_task()
+        completed = 0
+        # Finishing requests may start callbacks, the loop is drained until no task is left
+        while tasks := asyncio.all_tasks() - {current}:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = await asyncio.wait(tasks, timeout=remaining)
+            completed += len(done)
+
+        dropped = asyncio.all_tasks() - {current}
+        for task in dropped:
+            task.cancel()
+        await asyncio.gather(*dropped, return_exceptions=True)
+
+        with cls._lock:
+            closers = cls._closers.pop(asyncio.get_running_loop(), [])
+        for close in closers:
+            try:
+                await close()
+            except Exception as e:  # noqa: BLE001
+                get_logger().warning("Failed to close a resource of the event loop on shutdown: %s", e)
+        return completed, len(dropped)
+
+    @classmethod
+    def _shutdown_at_exit(cls):
+        if cls._loops:
+            cls.shutdown()
 
+    @classmethod
+    def install_signal_handlers(cls, signals: tuple[int, ...] = (signal.SIGTERM,), timeout: float | None = None):
+        """
+        Shuts the loops down when the process receives one of the signals, e.g. SIGTERM at the start of a rolling
+        deploy, then hands the signal to the previous handler. Must be called from the main thread.
+        """
+
+        def handle(signum, frame):
+            cls.shutdown(timeout)
+            previous = previous_handlers[signum]
+            if callable(previous):
+                previous(signum, frame)
+            elif previous == signal.SIG_DFL:
+                signal.signal(signum, signal.SIG_DFL)
+                signal.raise_signal(signum)
+
+        previous_handlers = {signum: signal.signal(signum, handle) for signum in signals}
+
+    @classmethod
+    def _start(cls, shards: int):
+        new_event_loop = asyncio.new_event_loop
+        if DequestConfig.ASYNC_LOOP_UVLOOP:
+            import uvloop  # noqa: PLC0415
+
+            new_event_loop = uvloop.new_event_loop
+
+        loops = [new_event_loop() for _ in range(shards)]
+        threads = [
+            threading.Thread(target=loop.run_forever, name=f"dequest-loop-{index}", daemon=True)
+            for index, loop in enumerate(loops)
+        ]
+        for thread in threads:
+            thread.start()
+        cls._threads = threads
+        cls._next_loop = itertools.cycle(loops)
+        if not cls._exit_handler_registered:
+            # Runs before the daemon threads of the loops are killed
+            atexit.register(cls._shutdown_at_exit)
+            cls._exit_handler_registered = True
+        # Published last, get_event_loops() reads it without the lock
+        cls._loops = loops
 
-def generate_cache_key(url: str, params: dict[str, Any] | None) -> str:
-    """Generates a unique cache key using URL and query parameters."""
-    cache_data = {"url": url, "params": params}
-    cache_string = json.dumps(cache_data, sort_keys=True)
-    return hashlib.md5(cache_string.encode()).hexdigest()
+    @classmethod
+    def _stop(cls, timeout: float | None = None):
+        """Stops and closes the background loops, the next call starts new ones with the current configuration."""
+        with cls._lock:
+            loops, threads = cls._loops, cls._threads
+            cls._loops, cls._threads, cls._next_loop = [], [], None
+        for loop in loops:
+            loop.call_soon_threadsafe(loop.stop)
+        for loop, thread in zip(loops, threads, strict=True):
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+
+# Types whose repr is the same for equal values in every process
+_STABLE_REPR_TYPES = frozenset({str, int, float, bool, bytes, type(None)})
+
+# Address in the default repr of objects (e.g. <Filter object at 0x7f...>), which differs between equal values
+_ADDRESS_IN_REPR = re.compile(r" at 0x[0-9a-fA-F]+>")
+
+
+def _canonical_repr(value: Any) -> str:
+    """
+    Returns the repr of a value, with the items of its dicts and the elements of its sets sorted so that equal values
+    get the same repr whatever their insertion order. Values with no stable repr are rejected.
+    """
+    if type(value) in _STABLE_REPR_TYPES:
+        return repr(value)
+    if isinstance(value, dict):
+        items = sorted(f"{_canonical_repr(key)}: {_canonical_repr(item)}" for key, item in value.items())
+        return "{" + ", ".join(items) + "}"
+    if isinstance(value, set | frozenset):
+        elements = sorted(_canonical_repr(element) for element in value)
+        return f"{type(value).__name__}({{{', '.join(elements)}}})"
+    if isinstance(value, list):
+        return "[" + ", ".join(_canonical_repr(element) for element in value) + "]"
+    if isinstance(value, tuple):
+        return "(" + ", ".join(_canonical_repr(element) for element in value) + ("," if len(value) == 1 else "") + ")"
+    value_repr = repr(value)
+    if _ADDRESS_IN_REPR.search(value_repr):
+        raise InvalidParameterValueError(
+            f"{type(value).__name__} values cannot be part of a cache key, define their __repr__ or pass "
+            "a cache_key_func to the DequestClient",
+        )
+    return value_repr
+
+
+def generate_cache_key(url: str, params: dict[str, Any] | None, headers: dict[str, str] | None = None) -> str:
+    """
+    Generates a unique cache key using URL, query parameters and the request headers the response varies on.
+    The parameters and headers are sorted and their canonical reprs joined line by line (repr escapes the separators,
+    and the values don't need to be JSON-serializable), then the canonical string is hashed with BLAKE2b.
+    """
+    lines = [url]
+    if params:
+        lines.extend(f"{name!r}={_canonical_repr(value)}" for name, value in sorted(params.items()))
+    if headers:
+        # The blank line keeps headers apart from parameters of the same name
+        lines.append("")
+        lines.extend(f"{name!r}={value!r}" for name, value in sorted((k.lower(), v) for k, v in headers.items()))
+    return hashlib.blake2b("\n".join(lines).encode(), digest_size=16).hexdigest()
+
+
+def split_argument_sets(argument_sets) -> list[tuple[tuple, dict]]:
+    """Splits argument sets, tuples of positional arguments or dicts of keyword arguments, into (args, kwargs)."""
+    return [
+        ((), dict(arguments)) if isinstance(arguments, dict) else (tuple(arguments), {}) for arguments in argument_sets
+    ]
 
 
 def map_json_to_dto(
     dto_class: type[T],
-    data: dict[str, Any],
+    data: dict[str, Any] | list | bytes | str,
     source_field: str | None = None,
-) -> T:
+    coerce_types: bool = False,
+    columnar: bool = False,
+) -> T | list[T] | dict[str, list]:
+    """
+    Maps JSON data to a DTO object, or to a list of DTO objects when the (source) data is a list.
+
+    Pydantic v2 models and msgspec Structs are validated by their own compiled validators,
+    straight from the raw JSON document when it is given and no source_field is used.
+
+    :param dto_class: The DTO class to map the data to. Plain classes, dataclasses (slotted or not),
+        NamedTuples, attrs classes, pydantic models and msgspec Structs are supported.
+    :param data: The decoded JSON data or the raw JSON document.
+    :param source_field: Source field holding the data to map. Leave None to map the whole data.
+    :param coerce_types: Whether to convert values to the annotated field types.
+    :param columnar: Whether to return a dict of field name to the list of its values
+        instead of one DTO object per item.
+    """
+    validator = None if columnar else _get_compiled_validator(dto_class)
+
+    if isinstance(data, bytes | bytearray | memoryview | str):
+        if validator is not None and not source_field:
+            return validator.validate_json(data, coerce_types)
+        data = json_loads(data)
+
     source_data = data[source_field] if source_field else data
 
+    if validator is not None:
+        return validator.validate_python(source_data, coerce_types)
+
+    if columnar:
+        return _map_json_to_columns(
+            dto_class,
+            source_data if isinstance(source_data, list) else [source_data],
+            coerce_types,
+        )
+
     return (
-        [_map_json_to_dto(dto_class, item) for item in source_data]
+        [_map_json_to_dto(dto_class, item, coerce_types) for item in source_data]
         if isinstance(source_data, list)
-        else _map_json_to_dto(dto_class, source_data)
+        else _map_json_to_dto(dto_class, source_data, coerce_types)
     )
 
 
-def _map_json_to_dto(dto_class: type[T], data: dict[str, Any]) -> T:
-    dto_fields = get_type_hints(dto_class).keys()  # Get type hints for all fields
-    init_params = inspect.signature(dto_class).parameters  # Get __init__ parameters
+def _map_json_to_dto(dto_class: type[T], data: dict[str, Any], coerce_types: bool = False) -> T:
+    plan = _get_mapping_plan(dto_class)
 
-    mapped_data = {}
-    for key in dto_fields:
-        if key in data:
-            field_value = data[key]
-            field_annotation = get_type_hints(dto_class)[key]
-
-            # Check if the field is a nested DTO
-            if isinstance(field_annotation, type) and hasattr(
-                field_annotation,
-                "__annotations__",
-            ):
-                mapped_data[key] = map_json_to_dto(field_annotation, field_value)
-            else:
-                mapped_data[key] = field_value
-
-    # Filter out attributes that are not in the constructor parameters
-    init_data = {k: v for k, v in mapped_data.items() if k in init_params}
+    init_data = {}
+    for key, field in plan.items():
+        if key not in data:
+            continue
+        field_value = data[key]
+        if coerce_types:
+            init_data[field.name] = None if field_value is None else field.convert_json(field_value)
+        elif field.nested_dto:
+            init_data[field.name] = map_json_to_dto(field.nested_dto, field_value)
+        else:
+            init_data[field.name] = field_value
 
     return dto_class(**init_data)
 
 
+def _map_json_to_columns(dto_class: type, items: list[dict[str, Any]], coerce_types: bool) -> dict[str, list]:
+    plan = _get_mapping_plan(dto_class)
+
+    columns = {key: [] for key in plan}
+    for item in items:
+        for key, field in plan.items():
+            if key not in item:
+                columns[key].append(field.default())
+                continue
+            field_value = item[key]
+            if field_value is not None:
+                if coerce_types:
+                    field_value = field.convert_json(field_value)
+                elif field.nested_dto:
+                    field_value = map_json_to_dto(field.nested_dto, field_value)
+            columns[key].append(field_value)
+
+    return columns
+
+
+class _CompiledValidator(NamedTuple):
+    validate_python: Callable[[Any, bool], Any]
+    validate_json: Callable[[bytes | str, bool], Any]
+
+
+_JSON_ARRAY_START = re.compile(rb"\s*\[")
+_JSON_ARRAY_START_STR = re.compile(r"\s*\[")
+
+
+def _is_json_array(raw: bytes | str) -> bool:
+    return bool((_JSON_ARRAY_START_STR if isinstance(raw, str) else _JSON_ARRAY_START).match(raw))
+
+
+@functools.cache
+def _get_compiled_validator(dto_class: type) -> _CompiledValidator | None:
+    """Returns the validators of pydantic v2 models and msgspec Structs, None for any other DTO class."""
+    if hasattr(dto_class, "__pydantic_validator__") and hasattr(dto_class, "model_validate_json"):
+        from pydantic import TypeAdapter  # noqa: PLC0415
+
+        # Pydantic follows the strictness configured on the model itself
+        list_adapter = TypeAdapter(list[dto_class])
+        return _CompiledValidator(
+            lambda data, _coerce_types: (
+                list_adapter.validate_python(data) if isinstance(data, list) else dto_class.model_validate(data)
+            ),
+            lambda raw, _coerce_types: (
+                list_adapter.validate_json(raw) if _is_json_array(raw) else dto_class.model_validate_json(raw)
+            ),
+        )
+
+    if hasattr(dto_class, "__struct_fields__"):
+        import msgspec  # noqa: PLC0415
+
+        return _CompiledValidator(
+            lambda data, coerce_types: msgspec.convert(
+                data,
+                type=list[dto_class] if isinstance(data, list) else dto_class,
+                strict=not coerce_types,
+            ),
+            lambda raw, coerce_types: msgspec.json.decode(
+                raw,
+                type=list[dto_class] if _is_json_array(raw) else dto_class,
+                strict=not coerce_types,
+            ),
+        )
+
+    return None
+
+
 def get_logger() -> logging.Logger:
     logger = logging.getLogger("dequest")
-    logger.addHandler(logging.NullHandler())
+    # Every module asks for the logger, attach the handler once so records don't walk a pile of handlers
+    if not any(isinstance(handler, logging.NullHandler) for handler in logger.handlers):
+        logger.addHandler(logging.NullHandler())
 
     return logger
 
 
+# Sampling decision of the client call running in the context, None outside of calls
+_call_sampled: contextvars.ContextVar[bool | None] = contextvars.ContextVar("dequest_call_sampled", default=None)
+
+
+def _sample() -> bool:
+    sample_rate = DequestConfig.LOG_SAMPLE_RATE
+    return sample_rate >= 1 or random.random() < sample_rate  # noqa: S311
+
+
+def is_logged(logger: logging.Logger, level: int) -> bool:
+    """
+    Tells whether a per-request record should be emitted: the level must be enabled and the call sampled in
+    according to DequestConfig.LOG_SAMPLE_RATE. The decision is made once per call by CallSummary.start, so the
+    records of a call are all kept or all dropped, records outside of a call are sampled one by one.
+    """
+    if not logger.isEnabledFor(level):
+        return False
+    sampled = _call_sampled.get()
+    return _sample() if sampled is None else sampled
+
+
+_response_repr = reprlib.Repr()
+_response_repr.maxstring = 200
+_response_repr.maxother = 200
+_response_repr.maxlist = _response_repr.maxdict = 10
+_response_repr.maxlevel = 3
+
+
+class LazyRepr:
+    """Defers the (truncated) repr of a potentially huge object until a log record is actually formatted."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return _response_repr.repr(self.obj)
+
+
+class CallSummary:
+    """Collects what happened during a client call and logs it as a single structured record."""
+
+    __slots__ = ("attempts", "cache_hit", "client", "method", "outcome", "started_at", "url")
+
+    def __init__(self, client: str, method: str, url: str):
+        self.client = client
+        self.method = method.upper()
+        self.url = url
+        self.attempts = 0
+        self.cache_hit = False
+        self.outcome = "ok"
+        self.started_at = time.perf_counter()
+
+    @classmethod
+    def start(
+        cls,
+        logger: logging.Logger,
+        client: str,
+        method: str,
+        url: str,
+    ) -> tuple["CallSummary | None", contextvars.Token]:
+        """
+        Samples the call in or out for all its records (see is_logged) and returns a new summary, or None when the
+        summary record of this call is not logged, with the token passed to finish() to end the sampling decision.
+        """
+        sampled = _sample()
+        token = _call_sampled.set(sampled)
+        return (cls(client, method, url) if sampled and logger.isEnabledFor(logging.INFO) else None), token
+
+    @staticmethod
+    def finish(summary: "CallSummary | None", token: contextvars.Token, logger: logging.Logger):
+        """
+        Logs the summary returned by start(), if any, and ends the sampling decision of the call. The decision of an
+        enclosing call, e.g. a client called from a callback, is restored.
+        """
+        _call_sampled.reset(token)
+        if summary is not None:
+            summary.log(logger)
+
+    def log(self, logger: logging.Logger):
+        duration_ms = (time.perf_counter() - self.started_at) * 1000
+        logger.info(
+            "%s %s %s: %s in %.1f ms (attempts: %s, cache hit: %s)",
+            self.client,
+            self.method,
+            self.url,
+            self.outcome,
+            duration_ms,
+            self.attempts,
+            self.cache_hit,
+            extra={
+                "dequest": {
+                    "client": self.client,
+                    "method": self.method,
+                    "url": self.url,
+                    "outcome": self.outcome,
+                    "duration_ms": duration_ms,
+                    "attempts": self.attempts,
+                    "cache_hit": self.cache_hit,
+                },
+            },
+        )
+
+
 def map_xml_to_dto(
     dto_class: type[T],
     xml_data: str,
     source_field: str | None = None,
+    coerce_types: bool = False,
 ) -> T | list[T]:
     root = ElementTree.fromstring(xml_data)
 
@@ -112,37 +547,305 @@ def map_xml_to_dto(
 
     # If multiple elements exist, return a list
     if len(source_root) > 1 and all(child.tag == source_root[0].tag for child in source_root):
-        return [_parse_element(dto_class, child) for child in source_root]
+        return [_parse_element(dto_class, child, coerce_types) for child in source_root]
 
-    return _parse_element(dto_class, source_root)
+    return _parse_element(dto_class, source_root, coerce_types)
 
 
-def _parse_element(dto_class: type[T], element: Element) -> T:
-    dto_fields = get_type_hints(dto_class).keys()
-    init_params = inspect.signature(dto_class).parameters
+def _parse_element(dto_class: type[T], element: Element, coerce_types: bool = False) -> T:
+    plan = _get_mapping_plan(dto_class)
 
+    # Attributes take precedence over child elements, except for the fields a text value cannot hold
     mapped_data = {}
-    for key in dto_fields:
-        if key in element.attrib:
-            mapped_data[key] = element.attrib[key]
+    for name, value in element.attrib.items():
+        field = plan.get(name)
+        if field is not None and field.convert_text is not None:
+            mapped_data[field.name] = field.convert_text(value) if coerce_types else value
+
+    # Single pass over the children, the first element with a matching tag wins
+    for child in element:
+        field = plan.get(child.tag)
+        if field is None or field.name in mapped_data:
+            continue
+        if coerce_types:
+            mapped_data[field.name] = field.convert_xml(child)
+        elif field.nested_dto:
+            mapped_data[field.name] = _parse_element(field.nested_dto, child)
         else:
-            child = element.find(key)
-            if child is not None:
-                field_annotation = get_type_hints(dto_class)[key]
-
-                # Check if the field is a nested DTO
-                if isinstance(field_annotation, type) and hasattr(
-                    field_annotation,
-                    "__annotations__",
-                ):
-                    mapped_data[key] = _parse_element(field_annotation, child)
-                else:
-                    mapped_data[key] = child.text
-
-    # Filter out attributes that are not in the constructor parameters
-    init_data = {k: v for k, v in mapped_data.items() if k in init_params}
+            mapped_data[field.name] = child.text
 
-    return dto_class(**init_data)
+    return dto_class(**mapped_data)
+
+
+def iter_xml_to_dto(
+    dto_class: type[T],
+    source: str | bytes | IO[bytes],
+    source_field: str | None = None,
+    coerce_types: bool = False,
+) -> Iterator[T]:
+    """
+    Incrementally maps the repeated elements of an XML document to DTOs.
+
+    Elements directly under ``source_field`` (or under the root element when it is None) are yielded one
+    by one and released as soon as they are mapped, so memory stays flat regardless of the document size.
+
+    :param dto_class: The DTO class to map each element to.
+    :param source: XML content (str or bytes) or a binary file object to read it from.
+    :param source_field: Tag of the root's child element holding the repeated elements.
+    :param coerce_types: Whether to convert values to the annotated field types.
+    """
+    if isinstance(source, str):
+        source = source.encode()
+    if isinstance(source, bytes | bytearray | memoryview):
+        source = io.BytesIO(source)
+
+    container_depth = 2 if source_field else 1
+    depth = 0
+    root = None
+    container = None
+
+    for event, element in ElementTree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if root is None:
+                root = element
+            if container is None and depth == container_depth and (source_field is None or element.tag == source_field):
+                container = element
+            continue
+
+        depth -= 1
+        if element is container:
+            return
+        if container is not None and depth == container_depth:
+            yield _parse_element(dto_class, element, coerce_types)
+            # Drop the mapped element so the partially built tree never grows
+            del container[:]
+        elif depth == 1:
+            # Siblings of source_field are never mapped
+            del root[:]
+
+    if source_field:
+        raise ValueError(f"Source field '{source_field}' not found in the XML element.")
+
+
+class _FieldPlan(NamedTuple):
+    name: str
+    nested_dto: type | None
+    convert_json: Callable[[Any], Any]
+    convert_xml: Callable[[Element], Any]
+    # None for the nested DTOs and collections, which are only mapped from child elements
+    convert_text: Callable[[str], Any] | None
+    # Returns the default value of the field, None for the required ones
+    default: Callable[[], Any]
+
+
+@functools.cache
+def _get_mapping_plan(dto_class: type) -> dict[str, _FieldPlan]:
+    """
+    Builds the mapping plan of a DTO class once: every field accepted by its constructor,
+    keyed by the name it is looked up with in the source data, along with its constructor argument,
+    its nested DTO class, the converters coercing JSON values, XML elements and XML attributes to its annotated type,
+    and its default.
+    """
+    init_params = inspect.signature(dto_class).parameters
+
+    plan = {}
+    for key, init_name, field_annotation, default in _get_dto_fields(dto_class):
+        # Attributes that are not in the constructor parameters are never mapped
+        if init_name not in init_params:
+            continue
+        plan[key] = _FieldPlan(
+            init_name,
+            field_annotation if _is_dto(field_annotation) else None,
+            _compile_json_converter(field_annotation),
+            _compile_xml_converter(field_annotation),
+            _compile_text_converter(field_annotation),
+            default,
+        )
+
+    return plan
+
+
+def _get_dto_fields(dto_class: type) -> list[tuple[str, str, Any, Callable[[], Any]]]:
+    """
+    Lists the (field name, constructor argument, annotation, default) of every field declared by a DTO class,
+    the default being a function returning the default value of the field (None for the required ones).
+    """
+    type_hints = get_type_hints(dto_class)
+    init_params = inspect.signature(dto_class).parameters
+
+    attrs_attributes = getattr(dto_class, "__attrs_attrs__", None)
+    if attrs_attributes is None:
+        factories = {}
+        if dataclasses.is_dataclass(dto_class):
+            factories = {
+                field.name: field.default_factory
+                for field in dataclasses.fields(dto_class)
+                if field.default_factory is not dataclasses.MISSING
+            }
+        return [
+            (key, key, field_annotation, _field_default(init_params.get(key), factories.get(key)))
+            for key, field_annotation in type_hints.items()
+        ]
+
+    # attrs classes may declare untyped attributes and strip the leading underscores of private
+    # attributes (or use an explicit alias) for their constructor arguments
+    fields = []
+    for attribute in attrs_attributes:
+        if not attribute.init:
+            continue
+        init_name = getattr(attribute, "alias", None) or attribute.name.lstrip("_")
+        default = _field_default(init_params.get(init_name), _attrs_factory(attribute.default))
+        fields.append((attribute.name, init_name, type_hints.get(attribute.name, attribute.type), default))
+    return fields
+
+
+def _attrs_factory(default: Any) -> Callable[[], Any] | None:
+    # attrs.Factory defaults, the ones taking the instance being built cannot be called without it
+    factory = getattr(default, "factory", None)
+    return factory if factory is not None and not getattr(default, "takes_self", False) else None
+
+
+def _field_default(parameter: inspect.Parameter | None, factory: Callable[[], Any] | None) -> Callable[[], Any]:
+    """Returns a function returning the default value of a DTO field, from its factory or its constructor argument."""
+    if factory is not None:
+        return factory
+    if parameter is None or parameter.default is inspect.Parameter.empty:
+        return _no_default
+    return functools.partial(_identity, parameter.default)
+
+
+def _no_default() -> None:
+    return None
+
+
+def _is_dto(annotation: Any) -> bool:
+    return (
+        isinstance(annotation, type)
+        and hasattr(annotation, "__annotations__")
+        and not issubclass(annotation, enum.Enum)
+    )
+
+
+def _optional_inner_type(annotation: Any) -> Any | None:
+    """Returns X for Optional[X] (or X | None) annotations, None for any other annotation."""
+    if get_origin(annotation) not in (Union, types.UnionType):
+        return None
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    return args[0] if len(args) == 1 else None
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "1", "yes", "on"):
+            return True
+        if lowered in ("false", "0", "no", "off"):
+            return False
+        raise ValueError(f"Invalid boolean value: {value!r}")
+    return bool(value)
+
+
+def _to_decimal(value: Any) -> decimal.Decimal:
+    # Going through str keeps floats like 0.1 from dragging their binary representation along
+    return value if isinstance(value, decimal.Decimal) else decimal.Decimal(str(value))
+
+
+def _iso_converter(annotation: type) -> Callable[[Any], Any]:
+    def convert(value):
+        return value if isinstance(value, annotation) else annotation.fromisoformat(value)
+
+    return convert
+
+
+def _instance_converter(annotation: type) -> Callable[[Any], Any]:
+    def convert(value):
+        return value if isinstance(value, annotation) else annotation(value)
+
+    return convert
+
+
+def _to_int(value: Any) -> int:
+    # int() would truncate 1.9 to 1
+    if isinstance(value, float | decimal.Decimal) and value % 1 != 0:
+        raise ValueError(f"Invalid integer value: {value!r}")
+    return int(value)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_SCALAR_CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    bool: _to_bool,
+    int: _to_int,
+    float: float,
+    str: str,
+    decimal.Decimal: _to_decimal,
+    datetime.datetime: _iso_converter(datetime.datetime),
+    datetime.date: _iso_converter(datetime.date),
+    datetime.time: _iso_converter(datetime.time),
+}
+
+
+def _compile_json_converter(annotation: Any) -> Callable[[Any], Any]:
+    """Compiles a converter coercing a (non-None) JSON value to the given annotation."""
+    inner_annotation = _optional_inner_type(annotation)
+    if inner_annotation is not None:
+        inner_converter = _compile_json_converter(inner_annotation)
+        return lambda value: None if value is None else inner_converter(value)
+
+    origin = get_origin(annotation)
+    if origin in (list, tuple, set, frozenset):
+        args = get_args(annotation)
+        item_converter = _compile_json_converter(args[0]) if args else _identity
+
+        def convert_items(value):
+            return origin(None if item is None else item_converter(item) for item in value)
+
+        return convert_items
+
+    if _is_dto(annotation):
+        return lambda value: _map_json_to_dto(annotation, value, coerce_types=True)
+    if annotation in _SCALAR_CONVERTERS:
+        return _SCALAR_CONVERTERS[annotation]
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return _instance_converter(annotation)
+
+    return _identity
+
+
+def _compile_xml_converter(annotation: Any) -> Callable[[Element], Any]:
+    """Compiles a converter coercing the content of an XML element to the given annotation."""
+    inner_annotation = _optional_inner_type(annotation)
+    if inner_annotation is not None:
+        return _compile_xml_converter(inner_annotation)
+
+    origin = get_origin(annotation)
+    if origin in (list, tuple, set, frozenset):
+        # Every child of the element is an item
+        args = get_args(annotation)
+        item_converter = _compile_xml_converter(args[0]) if args else _compile_xml_converter(Any)
+        return lambda element: origin(item_converter(child) for child in element)
+
+    if _is_dto(annotation):
+        return lambda element: _parse_element(annotation, element, coerce_types=True)
+
+    text_converter = _compile_text_converter(annotation)
+    return lambda element: None if element.text is None else text_converter(element.text)
+
+
+def _compile_text_converter(annotation: Any) -> Callable[[str], Any] | None:
+    """
+    Compiles a converter coercing a text value (e.g. an XML attribute) to the given annotation,
+    None for the nested DTOs and collections that no text can hold.
+    """
+    inner_annotation = _optional_inner_type(annotation)
+    if inner_annotation is not None:
+        return _compile_text_converter(inner_annotation)
+    if get_origin(annotation) in (list, tuple, set, frozenset) or _is_dto(annotation):
+        return None
+    return _compile_json_converter(annotation)
 
 
 def extract_parameters(signature: inspect.Signature, args: tuple, kwargs: dict):
@@ -153,6 +856,7 @@ def extract_parameters(signature: inspect.Signature, args: tuple, kwargs: dict):
     query_params = {}
     form_params = {}
     json_body = {}
+    streamed_body = None
 
     for param_name, param in signature.parameters.items():
         param_value = bound_args.arguments.get(param_name)
@@ -190,6 +894,20 @@ def extract_parameters(signature: inspect.Signature, args: tuple, kwargs: dict):
             form_params[param_key] = param_value
         elif issubclass(origin, JsonBody):
             json_body[param_key] = param_value
+        elif issubclass(origin, FileBody | StreamBody) and param_value is not None:
+            streamed_body = param_value if isinstance(param_value, FileBody | StreamBody) else origin(param_value)
+
+    # A pre-encoded JSON document is the whole body, it is sent without a decode/encode round-trip
+    if any(isinstance(value, bytes | bytearray | memoryview) for value in json_body.values()):
+        if len(json_body) > 1:
+            raise InvalidParameterValueError("A pre-encoded JsonBody must be the only JsonBody parameter")
+        [json_body] = json_body.values()
+
+    # Streamed uploads are the whole body too, they take the place of the JSON body
+    if streamed_body is not None:
+        if json_body or form_params:
+            raise InvalidParameterValueError("A FileBody or StreamBody must be the only body parameter")
+        json_body = streamed_body
 
     return path_params, query_params, form_params, json_body
 
@@ -18,6 +18,7 @@ setup_args = {
     "keywords": ["request", "declarative", "api", "rest", "rest client"],
     "url": "https://github.com/birddevelper/dequest",
     "download_url": "https://github.com/birddevelper/dequest",
+    "entry_points": {"console_scripts": ["dequest-loadtest = dequest.loadtest:main"]},
 }
 
 install_requires = [
@@ -1,8 +1,10 @@
 import asyncio
 
+import httpx
 import pytest
 
 from dequest import CircuitBreaker, FormParameter, JsonBody, QueryParameter, async_client, get_cache
+from dequest.http import HttpResponse
 from dequest.utils import generate_cache_key
 
 
@@ -13,20 +15,20 @@ class TestDTO:
         self.key = key
 
 
-async def fake_succesful_async_request(method, url, headers, json, params, data, timeout, consume):
-    return {"key": "value"}
+async def fake_succesful_async_request(method, url, headers, json, params, data, timeout, consume, **kwargs):
+    return HttpResponse(200, httpx.Headers(), {"key": "value"})
 
 
-async def fake_succesful_async_request_for_json(method, url, headers, json, params, data, timeout, consume):
-    return json
+async def fake_succesful_async_request_for_json(method, url, headers, json, params, data, timeout, consume, **kwargs):
+    return HttpResponse(200, httpx.Headers(), json)
 
 
-async def fake_succesful_async_request_for_params(method, url, headers, json, params, data, timeout, consume):
-    return params
+async def fake_succesful_async_request_for_params(method, url, headers, json, params, data, timeout, consume, **kwargs):
+    return HttpResponse(200, httpx.Headers(), params)
 
 
-async def fake_succesful_async_request_for_data(method, url, headers, json, params, data, timeout, consume):
-    return data
+async def fake_succesful_async_request_for_data(method, url, headers, json, params, data, timeout, consume, **kwargs):
+    return HttpResponse(200, httpx.Headers(), data)
 
 
 @pytest.mark.asyncio
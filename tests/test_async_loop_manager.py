@@ -1,9 +1,14 @@
 import asyncio
+import os
+import signal
 import threading
 from unittest.mock import patch
 
+import httpx
 import pytest
 
+from dequest import DequestClient, DequestConfig, async_client
+from dequest.config import LoopRouting
 from dequest.utils import AsyncLoopManager  # Adjust import path as needed
 
 
@@ -57,3 +62,138 @@ def test_get_event_loop_thread_safety():
         thread.join()
 
     assert len(set(results)) == 1, "Expected all threads to get the same event loop instance"
+
+
+@pytest.fixture
+def sharded_loops():
+    AsyncLoopManager._stop()
+    DequestConfig.config(async_loop_shards=3)
+    yield
+    AsyncLoopManager._stop()
+    DequestConfig.config(async_loop_shards=1, async_loop_routing=LoopRouting.ROUND_ROBIN)
+
+
+@pytest.mark.usefixtures("sharded_loops")
+def test_round_robin_over_the_loop_shards():
+    loops = [AsyncLoopManager.get_event_loop() for _ in range(6)]
+
+    assert loops[:3] == loops[3:]
+    assert len(set(loops)) == 3  # noqa: PLR2004
+    assert all(loop.is_running() for loop in loops)
+    assert len({thread.name for thread in threading.enumerate() if thread.name.startswith("dequest-loop-")}) == 3  # noqa: PLR2004
+
+
+@pytest.mark.usefixtures("sharded_loops")
+def test_round_robin_after_the_loops_are_stopped(monkeypatch):
+    loops = AsyncLoopManager.get_event_loops()
+
+    def stopped_meanwhile():
+        AsyncLoopManager._stop()
+        return loops
+
+    monkeypatch.setattr(AsyncLoopManager, "get_event_loops", stopped_meanwhile)
+
+    with pytest.raises(RuntimeError, match="shut down"):
+        AsyncLoopManager.get_event_loop()
+
+
+@pytest.mark.usefixtures("sharded_loops")
+def test_client_routing_keeps_a_client_on_one_loop():
+    DequestConfig.config(async_loop_routing=LoopRouting.CLIENT)
+    clients = [DequestClient() for _ in range(10)]
+
+    first = [AsyncLoopManager.get_event_loop(client) for client in clients]
+    second = [AsyncLoopManager.get_event_loop(client) for client in clients]
+
+    assert first == second
+    assert len(set(first)) > 1
+
+
+@pytest.mark.usefixtures("sharded_loops")
+def test_async_client_calls_are_spread_over_the_shards():
+    threads = set()
+
+    async def handler(_request):
+        threads.add(threading.current_thread().name)
+        return httpx.Response(200, json={})
+
+    client = DequestClient(async_transport=httpx.MockTransport(handler))
+
+    @async_client(url="https://api.example.com/users", client=client)
+    def get_users():
+        pass
+
+    for future in [get_users() for _ in range(6)]:
+        future.result(timeout=5)
+
+    assert threads == {"dequest-loop-0", "dequest-loop-1", "dequest-loop-2"}
+
+
+@pytest.fixture
+def restart_loops():
+    AsyncLoopManager._stop()
+    yield
+    AsyncLoopManager._stop()
+    AsyncLoopManager._shut_down = False
+
+
+def _slow_client(delay: float) -> DequestClient:
+    async def handler(_request):
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"name": "Alice"})
+
+    return DequestClient(async_transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.usefixtures("restart_loops")
+def test_shutdown_drains_in_flight_requests_and_callbacks():
+    client = _slow_client(0.1)
+    responses = []
+
+    async def on_response(response):
+        await asyncio.sleep(0.1)
+        responses.append(response)
+
+    @async_client(url="https://api.example.com/users/1", callback=on_response, client=client)
+    def get_user():
+        pass
+
+    futures = [get_user() for _ in range(3)]
+    report = AsyncLoopManager.shutdown(timeout=5)
+
+    assert report.dropped == 0
+    assert report.completed >= 6  # noqa: PLR2004
+    assert responses == [{"name": "Alice"}] * 3
+    assert all(future.done() and future.exception() is None for future in futures)
+    assert all(http_client.is_closed for http_client in client._async_http_clients.values())
+    with pytest.raises(RuntimeError, match="shut down"):
+        get_user()
+
+
+@pytest.mark.usefixtures("restart_loops")
+def test_shutdown_drops_work_past_the_deadline(caplog):
+    @async_client(url="https://api.example.com/users/1", client=_slow_client(10))
+    def get_user():
+        pass
+
+    future = get_user()
+    report = AsyncLoopManager.shutdown(timeout=0.1)
+
+    assert report.dropped == 1
+    assert future.cancelled()
+    assert "Dropped 1 in-flight tasks" in caplog.text
+
+
+@pytest.mark.usefixtures("restart_loops")
+def test_signal_handler_shuts_down_and_chains():
+    received = []
+    previous = signal.signal(signal.SIGUSR1, lambda signum, _frame: received.append(signum))
+    try:
+        loop = AsyncLoopManager.get_event_loop()
+        AsyncLoopManager.install_signal_handlers((signal.SIGUSR1,), timeout=1)
+        os.kill(os.getpid(), signal.SIGUSR1)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+    assert received == [signal.SIGUSR1]
+    assert loop.is_closed()
@@ -0,0 +1,130 @@
+import httpx
+import pytest
+import respx
+
+from dequest import DequestClient, PathParameter, sync_client
+from dequest.cache.cache_drivers import InMemoryCacheDriver
+from dequest.clients._http_cache import get_auto_cache_ttl
+from dequest.config import DequestConfig
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected_ttl"),
+    [
+        ({"Cache-Control": "max-age=60"}, 60),
+        ({"Cache-Control": "public, max-age=60, s-maxage=300"}, 300),
+        ({"Cache-Control": "max-age=60", "Age": "20"}, 40),
+        ({"Cache-Control": "max-age=60, stale-while-revalidate=30"}, 60),
+        ({"Cache-Control": "private, max-age=600"}, None),
+        ({"Cache-Control": "max-age=60", "Vary": "Accept-Language"}, None),
+        ({"Cache-Control": "max-age=60", "Vary": "*"}, None),
+        ({"Cache-Control": "max-age=60", "Vary": "Accept-Encoding"}, 60),
+        ({"Cache-Control": 'max-age="120"'}, 120),
+        ({"Cache-Control": "no-cache"}, 0),
+        ({"Cache-Control": "no-store, max-age=60"}, None),
+        ({"Expires": "Wed, 21 Oct 2026 07:28:00 GMT", "Date": "Wed, 21 Oct 2026 07:18:00 GMT"}, 600),
+        ({"Expires": "0"}, 0),
+        ({"Cache-Control": "max-age=60", "Expires": "Wed, 21 Oct 2026 07:28:00 GMT"}, 60),
+        ({}, 0),
+    ],
+)
+def test_ttl_from_response_headers(headers, expected_ttl):
+    assert get_auto_cache_ttl(httpx.Headers(headers)) == expected_ttl
+
+
+def test_vary_on_headers_of_the_cache_key():
+    headers = httpx.Headers({"Cache-Control": "max-age=60", "Vary": "Accept-Language, Accept-Encoding"})
+
+    assert get_auto_cache_ttl(headers, vary_on={"accept-language"}) == 60  # noqa: PLR2004
+    assert get_auto_cache_ttl(headers, vary_on={"authorization"}) is None
+
+
+def test_ttl_is_bounded_by_config():
+    DequestConfig.config(cache_auto_min_ttl=10, cache_auto_max_ttl=3600)
+    try:
+        assert get_auto_cache_ttl(httpx.Headers({"Cache-Control": "max-age=1"})) == 10  # noqa: PLR2004
+        assert get_auto_cache_ttl(httpx.Headers({"Cache-Control": "max-age=86400"})) == 3600  # noqa: PLR2004
+        assert get_auto_cache_ttl(httpx.Headers()) == 10  # noqa: PLR2004
+        assert get_auto_cache_ttl(httpx.Headers({"Cache-Control": "no-store"})) is None
+    finally:
+        DequestConfig.config(cache_auto_min_ttl=0, cache_auto_max_ttl=24 * 60 * 60)
+
+
+@respx.mock
+def test_auto_ttl_follows_the_upstream():
+    route = respx.get(url__regex=r"https://api\.example\.com/users/\d+").mock(
+        side_effect=lambda request: httpx.Response(
+            200,
+            json={"path": request.url.path},
+            headers={"Cache-Control": "max-age=60" if request.url.path == "/users/1" else "no-store"},
+        ),
+    )
+    driver = InMemoryCacheDriver()
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl="auto",
+        client=DequestClient(cache_driver=driver),
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    for _ in range(2):
+        get_user(1)
+        get_user(2)
+
+    assert route.call_count == 3  # noqa: PLR2004
+    [entry] = [entry for entry in driver.store.values() if entry]
+    assert entry["expires_at"] is not None
+
+
+@respx.mock
+def test_auto_ttl_no_cache_is_revalidated_on_every_call():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"name": "Alice"}, headers={"Cache-Control": "no-cache", "ETag": '"v1"'})
+
+    respx.get("https://api.example.com/users/1").mock(side_effect=handler)
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl="auto",
+        revalidate=True,
+        client=DequestClient(cache_driver=InMemoryCacheDriver()),
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    assert [get_user(1) for _ in range(3)] == [{"name": "Alice"}] * 3
+    assert [request.headers.get("If-None-Match") for request in requests] == [None, '"v1"', '"v1"']
+
+
+@respx.mock
+def test_auto_ttl_caches_responses_varying_on_the_key_headers():
+    route = respx.get("https://api.example.com/users/1").respond(
+        200,
+        json={"name": "Alice"},
+        headers={"Cache-Control": "max-age=60", "Vary": "Accept-Language"},
+    )
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl="auto",
+        headers={"Accept-Language": "de"},
+        vary_on=["Accept-Language"],
+        client=DequestClient(cache_driver=InMemoryCacheDriver()),
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+    get_user(1)
+
+    assert route.call_count == 1
@@ -0,0 +1,133 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+import respx
+
+from dequest import ConsumerType, DequestClient, DequestConfig, PathParameter, async_client, sync_client
+from dequest.exceptions import DequestError
+
+URL = "https://api.example.com/artifacts/1"
+BODY = bytes(range(256)) * 100
+
+
+@pytest.fixture
+def small_chunks():
+    DequestConfig.config(stream_chunk_size=1024)
+    yield
+    DequestConfig.config(stream_chunk_size=64 * 1024)
+
+
+@sync_client(url="https://api.example.com/artifacts/{artifact_id}", consume=ConsumerType.BYTES)
+def get_artifact_bytes(artifact_id: PathParameter[int]):
+    pass
+
+
+@sync_client(url="https://api.example.com/artifacts/{artifact_id}", consume=ConsumerType.STREAM)
+def stream_artifact(artifact_id: PathParameter[int]):
+    pass
+
+
+@respx.mock
+def test_bytes_are_not_decoded():
+    respx.get(URL).respond(200, content=BODY)
+
+    assert get_artifact_bytes(1) == BODY
+
+
+@pytest.mark.usefixtures("small_chunks")
+@respx.mock
+def test_stream_yields_chunks():
+    respx.get(URL).respond(200, content=BODY)
+
+    stream = stream_artifact(1)
+
+    assert stream.status_code == 200  # noqa: PLR2004
+    chunks = list(stream)
+    assert b"".join(chunks) == BODY
+    assert {len(chunk) for chunk in chunks[:-1]} == {1024}
+    assert stream.response.is_closed
+
+
+@respx.mock
+def test_stream_writes_to_a_file(tmp_path):
+    respx.get(URL).respond(200, content=BODY)
+    path = tmp_path / "artifact.bin"
+
+    assert stream_artifact(1).write_to(path) == len(BODY)
+    assert path.read_bytes() == BODY
+
+    file = io.BytesIO()
+    stream_artifact(1).write_to(file)
+    assert file.getvalue() == BODY
+
+
+@respx.mock
+def test_stream_writes_into_a_buffer():
+    respx.get(URL).respond(200, content=BODY)
+    buffer = bytearray(len(BODY) + 10)
+
+    assert stream_artifact(1).write_to(memoryview(buffer)) == len(BODY)
+    assert buffer[: len(BODY)] == BODY
+
+    with pytest.raises(ValueError, match="does not fit"):
+        stream_artifact(1).write_to(bytearray(10))
+    with pytest.raises(TypeError, match="read-only"):
+        stream_artifact(1).write_to(memoryview(b"read-only"))
+
+
+@respx.mock
+def test_stream_error_status_raises():
+    respx.get(URL).respond(404, json={"error": "not found"})
+
+    with pytest.raises(DequestError, match="404"):
+        stream_artifact(1)
+
+
+def test_stream_is_released_by_the_context_manager():
+    client = DequestClient(transport=httpx.MockTransport(lambda _request: httpx.Response(200, content=BODY)))
+
+    @sync_client(url=URL, consume=ConsumerType.STREAM, client=client)
+    def stream():
+        pass
+
+    with stream() as response_stream:
+        pass
+
+    assert response_stream.response.is_closed
+
+
+def test_binary_responses_cannot_be_cached_or_mapped():
+    with pytest.raises(ValueError, match="cannot be cached"):
+        sync_client(url=URL, consume=ConsumerType.STREAM, enable_cache=True)
+
+    @sync_client(url=URL, consume=ConsumerType.BYTES, dto_class=dict)
+    def get_mapped():
+        pass
+
+    with pytest.raises(DequestError, match="BYTES cannot be used with dto_class"):
+        get_mapped()
+
+
+@pytest.mark.asyncio
+async def test_async_stream_is_handed_to_the_callback():
+    client = DequestClient(async_transport=httpx.MockTransport(lambda _request: httpx.Response(200, content=BODY)))
+    received = asyncio.Event()
+    buffer = io.BytesIO()
+    streams = []
+
+    async def save(stream):
+        streams.append(stream)
+        await stream.write_to(buffer)
+        received.set()
+
+    @async_client(url=URL, consume=ConsumerType.STREAM, callback=save, client=client)
+    def stream_artifact_async():
+        pass
+
+    await asyncio.wrap_future(stream_artifact_async())
+    await asyncio.wait_for(received.wait(), 1)
+
+    assert buffer.getvalue() == BODY
+    assert streams[0].response.is_closed
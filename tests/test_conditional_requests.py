@@ -0,0 +1,276 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import respx
+
+from dequest import DequestClient, PathParameter, async_client, sync_client
+from dequest.cache.cache_drivers import InMemoryCacheDriver
+from dequest.clients._http_cache import get_stale_key
+from dequest.config import DequestConfig
+from dequest.exceptions import DequestError
+from dequest.metrics import InMemoryMetricsCollector
+from dequest.utils import generate_cache_key
+
+URL = "https://api.example.com/users/1"
+
+
+def _upstream(requests, etag='"v1"'):
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, json={"name": "Alice"}, headers={"ETag": etag})
+
+    return handler
+
+
+def _expire(client):
+    # Drops the fresh entry like its TTL would, the stale copy with the validators stays
+    client.cache.delete_key(generate_cache_key(URL, {}))
+
+
+@respx.mock
+def test_expired_response_is_revalidated():
+    requests = []
+    respx.get(URL).mock(side_effect=_upstream(requests))
+    client = DequestClient(cache_driver=InMemoryCacheDriver())
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl=60,
+        revalidate=True,
+        client=client,
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    assert get_user(1) == {"name": "Alice"}
+    _expire(client)
+    assert get_user(1) == {"name": "Alice"}
+    # Renewed by the 304, served from the cache again
+    assert get_user(1) == {"name": "Alice"}
+
+    assert len(requests) == 2  # noqa: PLR2004
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+
+@respx.mock
+def test_changed_response_replaces_the_cached_one():
+    requests = []
+    route = respx.get(URL).mock(side_effect=_upstream(requests))
+    client = DequestClient(cache_driver=InMemoryCacheDriver())
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl=60,
+        revalidate=True,
+        client=client,
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+    _expire(client)
+    route.mock(return_value=httpx.Response(200, json={"name": "Bob"}, headers={"Last-Modified": "Wed, 21 Oct 2026"}))
+    assert get_user(1) == {"name": "Bob"}
+
+    _expire(client)
+    route.mock(side_effect=lambda request: httpx.Response(304 if request.headers.get("If-Modified-Since") else 500))
+    assert get_user(1) == {"name": "Bob"}
+
+
+@respx.mock
+def test_revalidation_is_reported_to_metrics():
+    respx.get(URL).mock(side_effect=_upstream([]))
+    client = DequestClient(cache_driver=InMemoryCacheDriver())
+    collector = InMemoryMetricsCollector()
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl=60,
+        revalidate=True,
+        client=client,
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    DequestConfig.config(metrics_collector=collector)
+    try:
+        get_user(1)
+        _expire(client)
+        get_user(1)
+    finally:
+        DequestConfig.config(metrics_collector=None)
+
+    assert collector.cache_events[("InMemoryCacheDriver", "revalidated")] == 1
+    assert collector.cache_events[("InMemoryCacheDriver", "miss")] == 2  # noqa: PLR2004
+
+
+class _CountingDriver(InMemoryCacheDriver):
+    def __init__(self):
+        super().__init__()
+        self.round_trips = 0
+
+    def get_key(self, key):
+        self.round_trips += 1
+        return super().get_key(key)
+
+    def get_many(self, keys):
+        self.round_trips += 1
+        return [super(_CountingDriver, self).get_key(key) for key in keys]
+
+
+@respx.mock
+def test_revalidation_is_opt_in():
+    requests = []
+    respx.get(URL).mock(side_effect=_upstream(requests))
+    driver = _CountingDriver()
+    client = DequestClient(cache_driver=driver)
+
+    @sync_client(url="https://api.example.com/users/{user_id}", enable_cache=True, cache_ttl=60, client=client)
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+    _expire(client)
+    get_user(1)
+
+    assert "If-None-Match" not in requests[1].headers
+    assert list(driver.store) == [generate_cache_key(URL, {})]
+    assert driver.round_trips == 2  # noqa: PLR2004
+
+
+@respx.mock
+def test_stale_copy_is_read_with_the_cached_response():
+    respx.get(URL).mock(side_effect=_upstream([]))
+    driver = _CountingDriver()
+    client = DequestClient(cache_driver=driver)
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl=60,
+        revalidate=True,
+        client=client,
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+    _expire(client)
+    get_user(1)
+
+    assert driver.round_trips == 2  # noqa: PLR2004
+
+
+@respx.mock
+def test_stale_copy_ttl_is_a_multiple_of_the_cache_ttl():
+    respx.get(URL).mock(side_effect=_upstream([]))
+    driver = InMemoryCacheDriver()
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl=600,
+        revalidate=True,
+        client=DequestClient(cache_driver=driver),
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+
+    stale_entry = driver.store[get_stale_key(generate_cache_key(URL, {}))]
+    assert stale_entry["expires_at"] - time.time() == pytest.approx(600 * DequestConfig.CACHE_STALE_TTL_FACTOR, abs=2)
+
+
+@respx.mock
+def test_map_revalidates_in_batches():
+    requests = []
+    respx.get(URL).mock(side_effect=_upstream(requests))
+    client = DequestClient(cache_driver=InMemoryCacheDriver())
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl=60,
+        revalidate=True,
+        client=client,
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user.map([1])
+    _expire(client)
+
+    assert get_user.map([1]) == [{"name": "Alice"}]
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_async_expired_response_is_revalidated():
+    requests = []
+    client = DequestClient(
+        cache_driver=InMemoryCacheDriver(),
+        async_transport=httpx.MockTransport(_upstream(requests)),
+    )
+
+    @async_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl=60,
+        revalidate=True,
+        client=client,
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    await asyncio.wrap_future(get_user(1))
+    _expire(client)
+    await asyncio.wrap_future(get_user(1))
+
+    assert [request.headers.get("If-None-Match") for request in requests] == [None, '"v1"']
+    assert client.cache.get_key(generate_cache_key(URL, {})) == '{"name": "Alice"}'
+
+
+@pytest.mark.parametrize("enable_cache", [False, True])
+def test_unsolicited_304_is_an_error(enable_cache):
+    client = DequestClient(
+        cache_driver=InMemoryCacheDriver(),
+        transport=httpx.MockTransport(lambda _request: httpx.Response(304)),
+    )
+
+    @sync_client(URL, enable_cache=enable_cache, cache_ttl=60 if enable_cache else None, revalidate=True, client=client)
+    def get_user():
+        pass
+
+    with pytest.raises(DequestError, match="304"):
+        get_user()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("enable_cache", [False, True])
+async def test_async_unsolicited_304_is_an_error(enable_cache):
+    client = DequestClient(
+        cache_driver=InMemoryCacheDriver(),
+        async_transport=httpx.MockTransport(lambda _request: httpx.Response(304)),
+    )
+
+    @async_client(
+        URL,
+        enable_cache=enable_cache,
+        cache_ttl=60 if enable_cache else None,
+        revalidate=True,
+        client=client,
+    )
+    def get_user():
+        pass
+
+    with pytest.raises(DequestError, match="304"):
+        await asyncio.wrap_future(get_user())
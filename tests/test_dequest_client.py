@@ -0,0 +1,264 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dequest import CircuitBreaker, DequestClient, PathParameter, async_client, get_cache, sync_client
+from dequest.cache.cache_drivers import InMemoryCacheDriver
+from dequest.clients import get_default_client
+from dequest.exceptions import CircuitBreakerOpenError
+
+
+def _transport(requests):
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    return httpx.MockTransport(handler)
+
+
+def test_sync_client_uses_the_transport_of_its_client():
+    requests = []
+    client = DequestClient(transport=_transport(requests))
+
+    @sync_client(url="https://users.example.com/users/{user_id}", client=client)
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    assert get_user(1) == {"path": "/users/1"}
+    assert len(requests) == 1
+    assert client.http_client is client.http_client
+
+
+@pytest.mark.asyncio
+async def test_async_client_uses_the_transport_of_its_client():
+    requests = []
+    client = DequestClient(async_transport=_transport(requests))
+    responses = asyncio.Queue()
+
+    @async_client(url="https://users.example.com/users/{user_id}", client=client, callback=responses.put)
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+
+    assert await asyncio.wait_for(responses.get(), timeout=2) == {"path": "/users/1"}
+    assert len(requests) == 1
+    assert client.get_async_http_client() is client.get_async_http_client()
+
+
+def _cookie_transport(requests):
+    def handler(request):
+        requests.append(request)
+        headers = {"Set-Cookie": "session=userA; Path=/"} if request.url.path == "/login" else {}
+        return httpx.Response(200, json={}, headers=headers)
+
+    return handler
+
+
+def test_response_cookies_are_not_shared_between_calls():
+    requests = []
+    client = DequestClient(transport=httpx.MockTransport(_cookie_transport(requests)))
+
+    @sync_client(url="https://users.example.com/login", client=client)
+    def login():
+        pass
+
+    @sync_client(url="https://users.example.com/profile", client=client)
+    def get_profile():
+        pass
+
+    login()
+    get_profile()
+
+    assert "Cookie" not in requests[1].headers
+    assert not client.http_client.cookies
+
+
+@pytest.mark.asyncio
+async def test_async_response_cookies_are_not_shared_between_calls():
+    requests = []
+    client = DequestClient(async_transport=httpx.MockTransport(_cookie_transport(requests)))
+
+    @async_client(url="https://users.example.com/login", client=client)
+    def login():
+        pass
+
+    @async_client(url="https://users.example.com/profile", client=client)
+    def get_profile():
+        pass
+
+    await asyncio.wrap_future(login())
+    await asyncio.wrap_future(get_profile())
+
+    assert "Cookie" not in requests[1].headers
+
+
+def test_clients_have_separate_caches():
+    users_requests, orders_requests = [], []
+    users = DequestClient(cache_driver=InMemoryCacheDriver(), transport=_transport(users_requests))
+    orders = DequestClient(cache_driver=InMemoryCacheDriver(), transport=_transport(orders_requests))
+
+    @sync_client(url="https://api.example.com/items", enable_cache=True, client=users)
+    def get_users_items():
+        pass
+
+    @sync_client(url="https://api.example.com/items", enable_cache=True, client=orders)
+    def get_orders_items():
+        pass
+
+    for _ in range(3):
+        get_users_items()
+        get_orders_items()
+
+    assert len(users_requests) == len(orders_requests) == 1
+    assert users.cache is not orders.cache
+    assert users.cache is not get_cache()
+
+
+def test_default_client_uses_the_global_cache():
+    assert get_default_client() is get_default_client()
+    assert get_default_client().cache is get_cache()
+    assert DequestClient(cache_provider="in_memory").cache is not get_cache()
+
+
+def test_functions_share_the_circuit_breaker_of_their_client():
+    client = DequestClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(500)),
+        circuit_breaker=CircuitBreaker(failure_threshold=1, recovery_timeout=30),
+    )
+
+    @sync_client(url="https://flaky.example.com/a", client=client)
+    def get_a():
+        pass
+
+    @sync_client(url="https://flaky.example.com/b", client=client)
+    def get_b():
+        pass
+
+    with pytest.raises(Exception, match="500"):
+        get_a()
+    with pytest.raises(CircuitBreakerOpenError):
+        get_b()
+
+
+def test_close_releases_the_connection_pool():
+    client = DequestClient(transport=_transport([]))
+    http_client = client.http_client
+
+    client.close()
+
+    assert http_client.is_closed
+    assert client.http_client is not http_client
+
+
+def test_namespaced_cache_keys():
+    driver = InMemoryCacheDriver()
+    client = DequestClient(cache_driver=driver, namespace="users", cache_version=2)
+
+    client.cache.set_key("key", "value")
+
+    assert list(driver.store) == ["users:v2:key"]
+    assert client.cache.get_key("key") == "value"
+    assert DequestClient(cache_driver=driver, namespace="users", cache_version=3).cache.get_key("key") is None
+
+
+def test_namespaced_client_shares_the_global_cache_driver():
+    client = DequestClient(namespace="users")
+
+    assert client.cache.driver is get_cache().driver
+    assert client.cache.key_prefix == "users:"
+
+
+def test_invalidate_only_deletes_the_namespace():
+    driver = InMemoryCacheDriver()
+    users = DequestClient(cache_driver=driver, namespace="users", cache_version=1)
+    orders = DequestClient(cache_driver=driver, namespace="orders")
+    users.cache.set_key("key", "user")
+    orders.cache.set_key("key", "order")
+
+    users.invalidate()
+
+    assert users.cache.get_key("key") is None
+    assert orders.cache.get_key("key") == "order"
+
+
+def test_decorated_function_invalidation():
+    requests = []
+    client = DequestClient(cache_driver=InMemoryCacheDriver(), namespace="users", transport=_transport(requests))
+
+    @sync_client(url="https://users.example.com/users/{user_id}", enable_cache=True, client=client)
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+    get_user(2)
+    get_user.invalidate(1)
+    get_user(1)
+    get_user(2)
+    assert [request.url.path for request in requests] == ["/users/1", "/users/2", "/users/1"]
+
+    get_user.invalidate_all()
+    get_user(2)
+    assert len(requests) == 4  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_async_decorated_function_invalidation():
+    requests = []
+    client = DequestClient(cache_driver=InMemoryCacheDriver(), async_transport=_transport(requests))
+
+    @async_client(url="https://users.example.com/users/{user_id}", enable_cache=True, client=client)
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    await asyncio.wrap_future(get_user(1))
+    get_user.invalidate(1)
+    await asyncio.wrap_future(get_user(1))
+
+    assert len(requests) == 2  # noqa: PLR2004
+
+
+def test_cache_varies_on_headers():
+    requests = []
+    language = "en"
+    client = DequestClient(cache_driver=InMemoryCacheDriver(), transport=_transport(requests))
+
+    @sync_client(
+        url="https://users.example.com/users",
+        enable_cache=True,
+        headers=lambda: {"Accept-Language": language},
+        vary_on=["accept-language"],
+        client=client,
+    )
+    def get_users():
+        pass
+
+    get_users()
+    get_users()
+    language = "fr"
+    get_users()
+    get_users.invalidate()
+    get_users()
+
+    assert len(requests) == 3  # noqa: PLR2004
+
+
+def test_client_cache_key_func():
+    calls = []
+
+    def cache_key(url, params, headers):
+        calls.append((url, params, headers))
+        return headers["Authorization"].removeprefix("Bearer ").split(".")[0] + ":" + url
+
+    driver = InMemoryCacheDriver()
+    client = DequestClient(cache_driver=driver, cache_key_func=cache_key, transport=_transport([]))
+
+    @sync_client(url="https://users.example.com/me", enable_cache=True, auth_token="alice.secret", client=client)  # noqa: S106
+    def get_me():
+        pass
+
+    get_me()
+
+    assert list(driver.store) == ["alice:https://users.example.com/me"]
+    assert calls[0][2]["Authorization"] == "Bearer alice.secret"
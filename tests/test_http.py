@@ -25,7 +25,8 @@ async def test_async_request_success():
             consume=ConsumerType.JSON,
         )
 
-    assert response == mock_response
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.data == mock_response
 
 
 @pytest.mark.asyncio
@@ -45,3 +45,24 @@ def test_clear():
 
     assert cache.get_key("key") is None
     assert cache.get_key("key2") is None
+
+
+def test_get_many_and_set_many():
+    cache = InMemoryCacheDriver()
+
+    cache.set_many({"key": "value", "key2": "value2"}, 10)
+
+    assert cache.get_many(["key", "missing", "key2"]) == ["value", None, "value2"]
+
+
+def test_delete_prefix():
+    cache = InMemoryCacheDriver()
+    cache.set_key("users:1", "a")
+    cache.set_key("users:2", "b")
+    cache.set_key("orders:1", "c")
+
+    cache.delete_prefix("users:")
+
+    assert cache.get_key("users:1") is None
+    assert cache.get_key("users:2") is None
+    assert cache.get_key("orders:1") == "c"
@@ -0,0 +1,104 @@
+import json
+import random
+
+import httpx
+import pytest
+
+from dequest import PathParameter, async_client, sync_client
+from dequest.loadtest import FakeUpstream, LoadReport, latency_sampler, main, run_async_load, run_sync_load
+
+
+@pytest.mark.parametrize("distribution", ["constant", "uniform", "exponential", "lognormal"])
+def test_latency_sampler_keeps_the_mean(distribution):
+    sample = latency_sampler(distribution, 0.02, rng=random.Random(7))  # noqa: S311
+
+    latencies = [sample() for _ in range(20_000)]
+
+    assert all(latency >= 0 for latency in latencies)
+    assert sum(latencies) / len(latencies) == pytest.approx(0.02, rel=0.05)
+
+
+def test_latency_sampler_invalid_distribution():
+    with pytest.raises(ValueError, match="Invalid latency distribution"):
+        latency_sampler("pareto", 0.02)
+
+
+def test_fake_upstream_throttles_with_retry_after():
+    with FakeUpstream(throttle_rate=1.0, retry_after=3) as upstream:
+        response = httpx.get(f"{upstream.url}/items/1")
+
+    assert response.status_code == httpx.codes.TOO_MANY_REQUESTS
+    assert response.headers["Retry-After"] == "3"
+    assert upstream.responses == {429: 1}
+
+
+def test_fake_upstream_serves_keep_alive_connections():
+    with FakeUpstream() as upstream, httpx.Client(base_url=upstream.url) as client:
+        responses = [client.get(f"/items/{i}") for i in range(3)]
+
+    assert [response.json()["path"] for response in responses] == ["/items/0", "/items/1", "/items/2"]
+    assert upstream.requests == len(responses)
+
+
+def test_run_sync_load_reports_amplification_of_retries():
+    with FakeUpstream(error_rate=1.0) as upstream:
+
+        @sync_client(
+            url=f"{upstream.url}/items/{{item_id}}",
+            retries=1,
+            retry_on_exceptions=(httpx.HTTPError,),
+            retry_delay=0,
+        )
+        def get_item(item_id: PathParameter[int]):
+            pass
+
+        report = run_sync_load(get_item, concurrency=4, calls=20)
+        report.upstream_responses = upstream.responses.copy()
+
+    assert report.calls == 20  # noqa: PLR2004
+    assert report.failures == {"HTTP 500": 20}
+    assert report.amplification == 2  # noqa: PLR2004
+
+
+def test_run_async_load():
+    with FakeUpstream() as upstream:
+
+        @async_client(url=f"{upstream.url}/items/{{item_id}}")
+        def get_item(item_id: PathParameter[int]):
+            pass
+
+        report = run_async_load(get_item, concurrency=5, calls=20)
+        report.upstream_responses = upstream.responses.copy()
+
+    assert report.calls == 20  # noqa: PLR2004
+    assert not report.failures
+    assert report.amplification == 1
+    assert report.throughput > 0
+
+
+def test_run_async_load_counts_calls_failing_before_they_are_scheduled():
+    def fail(index):
+        raise ValueError(f"invalid item {index}")
+
+    report = run_async_load(fail, concurrency=2, calls=5)
+
+    assert report.calls == 5  # noqa: PLR2004
+    assert report.failures == {"ValueError": 5}
+
+
+def test_load_report_percentiles():
+    report = LoadReport(calls=100, elapsed=2.0, latencies=[i / 1000 for i in range(1, 101)])
+
+    summary = report.as_dict()
+
+    assert summary["throughput_rps"] == 50  # noqa: PLR2004
+    assert summary["latency_ms"] == {"p50": 50, "p90": 90, "p99": 99, "max": 100}
+
+
+def test_main_prints_json_report(capsys):
+    exit_code = main(["--calls", "10", "--concurrency", "2", "--latency-ms", "0", "--keys", "1", "--json"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert exit_code == 0
+    assert report["calls"] == 10  # noqa: PLR2004
+    assert report["upstream_requests"] == 10  # noqa: PLR2004
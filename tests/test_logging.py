@@ -0,0 +1,160 @@
+import logging
+
+import pytest
+import respx
+from httpx import Response
+
+from dequest import DequestClient, PathParameter, sync_client
+from dequest.cache.cache_drivers import InMemoryCacheDriver
+from dequest.config import DequestConfig
+from dequest.exceptions import DequestError
+from dequest.utils import CallSummary, LazyRepr, get_logger, is_logged
+
+
+@pytest.fixture
+def sample_rate():
+    yield
+    DequestConfig.LOG_SAMPLE_RATE = 1.0
+
+
+def _summaries(caplog):
+    return [record for record in caplog.records if hasattr(record, "dequest")]
+
+
+@respx.mock
+def test_sync_client_logs_one_summary_per_call(caplog):
+    respx.get("https://api.example.com/users/1").mock(return_value=Response(200, json={"name": "Alice"}))
+
+    @sync_client(url="https://api.example.com/users/{user_id}")
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    with caplog.at_level(logging.INFO, logger="dequest"):
+        get_user(1)
+
+    summaries = _summaries(caplog)
+    assert len(summaries) == 1
+    summary = summaries[0].dequest
+    assert summary["client"].endswith("get_user")
+    assert summary["method"] == "GET"
+    assert summary["url"] == "https://api.example.com/users/1"
+    assert summary["outcome"] == "ok"
+    assert summary["attempts"] == 1
+    assert summary["cache_hit"] is False
+    assert summary["duration_ms"] >= 0
+
+
+@respx.mock
+def test_sync_client_summary_reports_errors(caplog):
+    respx.get("https://api.example.com/data").mock(return_value=Response(500))
+
+    @sync_client(url="https://api.example.com/data")
+    def get_data():
+        pass
+
+    with caplog.at_level(logging.INFO, logger="dequest"), pytest.raises(DequestError):
+        get_data()
+
+    assert [record.dequest["outcome"] for record in _summaries(caplog)] == ["error"]
+
+
+@respx.mock
+def test_sampling_suppresses_per_request_records(caplog, sample_rate):
+    respx.get("https://api.example.com/data").mock(return_value=Response(200, json={}))
+    DequestConfig.config(log_sample_rate=0)
+
+    @sync_client(url="https://api.example.com/data")
+    def get_data():
+        pass
+
+    with caplog.at_level(logging.INFO, logger="dequest"):
+        get_data()
+
+    assert caplog.records == []
+
+
+@respx.mock
+def test_sampling_keeps_or_drops_all_the_records_of_a_call(caplog, sample_rate, monkeypatch):
+    respx.get("https://api.example.com/data").mock(return_value=Response(200, json={}))
+    DequestConfig.config(log_sample_rate=0.5)
+    draws = iter([0.1, 0.9])
+    monkeypatch.setattr("dequest.utils.random.random", lambda: next(draws))
+
+    @sync_client(url="https://api.example.com/data")
+    def get_data():
+        pass
+
+    with caplog.at_level(logging.DEBUG, logger="dequest"):
+        get_data()
+        sampled_in = len(caplog.records)
+        get_data()
+
+    assert sampled_in > 1
+    assert len(caplog.records) == sampled_in
+
+
+def test_nested_call_restores_the_sampling_of_the_outer_call(caplog, sample_rate, monkeypatch):
+    DequestConfig.config(log_sample_rate=0.5)
+    draws = iter([0.9, 0.1])
+    monkeypatch.setattr("dequest.utils.random.random", lambda: next(draws))
+    logger = get_logger()
+
+    with caplog.at_level(logging.DEBUG, logger="dequest"):
+        outer, outer_sampling = CallSummary.start(logger, "outer", "GET", "https://api.example.com/outer")
+        inner, inner_sampling = CallSummary.start(logger, "inner", "GET", "https://api.example.com/inner")
+        assert is_logged(logger, logging.DEBUG)
+        CallSummary.finish(inner, inner_sampling, logger)
+
+        assert not is_logged(logger, logging.DEBUG)
+        CallSummary.finish(outer, outer_sampling, logger)
+
+
+@respx.mock
+def test_summary_is_the_only_info_record(caplog):
+    respx.get("https://api.example.com/data").mock(return_value=Response(200, json={}))
+
+    @sync_client(
+        url="https://api.example.com/data",
+        enable_cache=True,
+        cache_ttl=60,
+        client=DequestClient(cache_driver=InMemoryCacheDriver()),
+    )
+    def get_data():
+        pass
+
+    with caplog.at_level(logging.INFO, logger="dequest"):
+        get_data()
+        get_data()
+
+    assert caplog.records == _summaries(caplog)
+    assert [record.dequest["cache_hit"] for record in caplog.records] == [False, True]
+
+
+@respx.mock
+def test_no_summary_when_info_is_disabled(caplog):
+    respx.get("https://api.example.com/data").mock(return_value=Response(200, json={}))
+
+    @sync_client(url="https://api.example.com/data")
+    def get_data():
+        pass
+
+    with caplog.at_level(logging.WARNING, logger="dequest"):
+        get_data()
+
+    assert _summaries(caplog) == []
+
+
+def test_lazy_repr_truncates_large_responses():
+    response = {"items": list(range(10_000)), "text": "x" * 10_000}
+
+    rendered = str(LazyRepr(response))
+
+    assert len(rendered) < len(response["text"])
+    assert "..." in rendered
+
+
+def test_get_logger_attaches_a_single_null_handler():
+    for _ in range(3):
+        logger = get_logger()
+
+    assert sum(isinstance(handler, logging.NullHandler) for handler in logger.handlers) == 1
@@ -0,0 +1,149 @@
+import pytest
+import respx
+from httpx import HTTPError, Response
+
+from dequest import CircuitBreaker, ConsumerType, DequestConfig, PathParameter, get_cache, sync_client
+from dequest.cache import Cache
+from dequest.cache.cache_drivers import InMemoryCacheDriver
+from dequest.circuit_breaker import CircuitBreakerState
+from dequest.exceptions import DequestError
+from dequest.metrics import InMemoryMetricsCollector, OpenTelemetryMetricsCollector, PrometheusMetricsCollector
+
+
+@pytest.fixture
+def collector():
+    collector = InMemoryMetricsCollector()
+    DequestConfig.config(METRICS_COLLECTOR=collector)
+    yield collector
+    DequestConfig.config(METRICS_COLLECTOR=None)
+
+
+@respx.mock
+def test_request_metrics(collector):
+    respx.get("https://api.example.com/users/1").mock(return_value=Response(200, json={"name": "Alice"}))
+    get_cache().clear()
+
+    @sync_client(url="https://api.example.com/users/{user_id}", enable_cache=True)
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+    get_user(1)
+    snapshot = collector.snapshot()
+
+    client = "test_request_metrics.<locals>.get_user"
+    assert snapshot["latency"][(client, "GET", "api.example.com")]["count"] == 1
+    assert snapshot["responses"] == {(client, "GET", "api.example.com", 200): 1}
+    assert snapshot["in_flight"] == {(client, "api.example.com"): 0}
+    assert snapshot["bytes_received"][(client, "api.example.com")] == len(b'{"name":"Alice"}')
+    assert snapshot["cache_events"] == {("in_memory", "miss"): 1, ("in_memory", "hit"): 1}
+    assert collector.cache_hit_ratio("in_memory") == 0.5  # noqa: PLR2004
+
+
+@respx.mock
+def test_stream_metrics_are_recorded_once_the_body_is_read(collector):
+    body = b"x" * 1000
+    respx.get("https://api.example.com/files/1").mock(return_value=Response(200, content=body))
+
+    @sync_client(url="https://api.example.com/files/{file_id}", consume=ConsumerType.STREAM)
+    def download(file_id: PathParameter[int]):
+        pass
+
+    stream = download(1)
+    client = "test_stream_metrics_are_recorded_once_the_body_is_read.<locals>.download"
+    assert collector.snapshot()["in_flight"] == {(client, "api.example.com"): 1}
+
+    assert b"".join(stream) == body
+    stream.close()
+    snapshot = collector.snapshot()
+    assert snapshot["in_flight"] == {(client, "api.example.com"): 0}
+    assert snapshot["latency"][(client, "GET", "api.example.com")]["count"] == 1
+    assert snapshot["bytes_received"][(client, "api.example.com")] == len(body)
+
+
+def test_evictions_are_labeled_with_the_cache_provider(collector):
+    cache = Cache(provider="sessions", driver=InMemoryCacheDriver())
+    cache.set_key("session", "value", 60)
+    cache.driver.store["session"]["expires_at"] = 0
+
+    assert cache.get_key("session") is None
+    assert collector.snapshot()["cache_events"] == {("sessions", "eviction"): 1, ("sessions", "miss"): 1}
+
+
+@respx.mock
+def test_retry_and_breaker_metrics(collector):
+    respx.get("https://api.example.com/users/1").mock(return_value=Response(500))
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30, name="users")
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        retries=2,
+        retry_delay=0,
+        retry_on_exceptions=(HTTPError,),
+        circuit_breaker=breaker,
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    with pytest.raises(DequestError):
+        get_user(1)
+    snapshot = collector.snapshot()
+
+    assert breaker.get_state() == CircuitBreakerState.OPEN
+    client = "test_retry_and_breaker_metrics.<locals>.get_user"
+    assert snapshot["retries"] == {client: 2}
+    assert snapshot["responses"] == {(client, "GET", "api.example.com", 500): 3}
+    assert snapshot["breaker_transitions"] == {("users", "CLOSED", "OPEN"): 1}
+
+
+@respx.mock
+def test_prometheus_metrics_collector():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    DequestConfig.config(METRICS_COLLECTOR=PrometheusMetricsCollector(registry=registry))
+    respx.get("https://api.example.com/users/1").mock(return_value=Response(200, json={}))
+
+    @sync_client(url="https://api.example.com/users/{user_id}")
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    try:
+        get_user(1)
+    finally:
+        DequestConfig.config(METRICS_COLLECTOR=None)
+
+    client = "test_prometheus_metrics_collector.<locals>.get_user"
+    labels = {"client": client, "method": "GET", "host": "api.example.com", "status": "200"}
+    assert registry.get_sample_value("dequest_request_duration_seconds_count", labels) == 1
+    assert registry.get_sample_value("dequest_requests_in_flight", {"client": client, "host": "api.example.com"}) == 0
+
+
+@respx.mock
+def test_opentelemetry_metrics_collector():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.metrics import MeterProvider  # noqa: PLC0415
+    from opentelemetry.sdk.metrics.export import InMemoryMetricReader  # noqa: PLC0415
+
+    reader = InMemoryMetricReader()
+    DequestConfig.config(METRICS_COLLECTOR=OpenTelemetryMetricsCollector(MeterProvider(metric_readers=[reader])))
+    respx.get("https://api.example.com/users/1").mock(return_value=Response(200, json={}))
+
+    @sync_client(url="https://api.example.com/users/{user_id}")
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    try:
+        get_user(1)
+    finally:
+        DequestConfig.config(METRICS_COLLECTOR=None)
+
+    metrics = {
+        metric.name: metric
+        for resource_metrics in reader.get_metrics_data().resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+    }
+    duration_point = metrics["dequest.request.duration"].data.data_points[0]
+    assert duration_point.count == 1
+    assert duration_point.attributes["http.response.status_code"] == 200  # noqa: PLR2004
+    assert duration_point.attributes["client"] == "test_opentelemetry_metrics_collector.<locals>.get_user"
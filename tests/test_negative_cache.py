@@ -0,0 +1,118 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from dequest import ConsumerType, DequestClient, DequestConfig, PathParameter, async_client, sync_client
+from dequest.cache.cache_drivers import InMemoryCacheDriver
+from dequest.exceptions import DequestError
+
+
+def _client():
+    return DequestClient(cache_driver=InMemoryCacheDriver())
+
+
+@respx.mock
+def test_not_found_is_cached_with_negative_cache_ttl():
+    route = respx.get("https://api.example.com/users/1").mock(return_value=httpx.Response(404))
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl=60,
+        negative_cache_ttl=30,
+        client=_client(),
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    for _ in range(3):
+        with pytest.raises(DequestError, match="404 Not Found") as exc_info:
+            get_user(1)
+        assert isinstance(exc_info.value.__cause__, httpx.HTTPStatusError)
+
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_negative_cache_follows_config():
+    route = respx.get("https://api.example.com/users/1").mock(return_value=httpx.Response(500))
+    gone = respx.get("https://api.example.com/users/2").mock(return_value=httpx.Response(410))
+
+    @sync_client(url="https://api.example.com/users/{user_id}", enable_cache=True, client=_client())
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    DequestConfig.config(negative_cache_ttl=30)
+    try:
+        for _ in range(2):
+            with pytest.raises(DequestError):
+                get_user(1)
+            with pytest.raises(DequestError):
+                get_user(2)
+    finally:
+        DequestConfig.config(negative_cache_ttl=0)
+
+    assert route.call_count == 2  # noqa: PLR2004
+    assert gone.call_count == 1
+
+
+@respx.mock
+def test_negative_cache_is_disabled_by_default():
+    route = respx.get("https://api.example.com/users/1").mock(return_value=httpx.Response(404))
+
+    @sync_client(url="https://api.example.com/users/{user_id}", enable_cache=True, client=_client())
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    for _ in range(2):
+        with pytest.raises(DequestError):
+            get_user(1)
+
+    assert route.call_count == 2  # noqa: PLR2004
+
+
+@respx.mock
+def test_falsy_responses_are_cache_hits():
+    empty_text = respx.get("https://api.example.com/motd").mock(return_value=httpx.Response(200, text=""))
+    no_content = respx.get("https://api.example.com/ping").mock(return_value=httpx.Response(204))
+    client = _client()
+
+    @sync_client(url="https://api.example.com/motd", enable_cache=True, consume=ConsumerType.TEXT, client=client)
+    def get_motd():
+        pass
+
+    @sync_client(url="https://api.example.com/ping", enable_cache=True, client=client)
+    def ping():
+        pass
+
+    assert [get_motd(), get_motd()] == ["", ""]
+    assert [ping(), ping()] == [None, None]
+    assert empty_text.call_count == no_content.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_async_not_found_is_cached():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(404)
+
+    client = DequestClient(cache_driver=InMemoryCacheDriver(), async_transport=httpx.MockTransport(handler))
+
+    @async_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        negative_cache_ttl=30,
+        client=client,
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    for _ in range(2):
+        with pytest.raises(DequestError, match="404"):
+            await asyncio.wrap_future(get_user(1))
+
+    assert len(requests) == 1
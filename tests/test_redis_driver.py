@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock, call, patch
+
+from dequest.cache.cache_driver_factory import CacheDriverFactory
+from dequest.cache.cache_drivers import RedisDriver
+from dequest.config import DequestConfig
+
+
+def test_get_many_uses_a_single_mget():
+    driver = RedisDriver("localhost")
+    driver.client = MagicMock()
+    driver.client.mget.return_value = ["value", None]
+
+    assert driver.get_many(["key", "missing"]) == ["value", None]
+    driver.client.mget.assert_called_once_with(["dequest:key", "dequest:missing"])
+
+
+def test_get_many_with_ttl_reads_the_values_and_ttls_in_one_pipeline():
+    driver = RedisDriver("localhost")
+    driver.client = MagicMock()
+    pipeline = driver.client.pipeline.return_value.__enter__.return_value
+    pipeline.execute.return_value = [["value", "forever", None], 1500, -1, -2]
+
+    assert driver.get_many_with_ttl(["key", "forever", "missing"]) == [("value", 1.5), ("forever", None), (None, None)]
+    pipeline.mget.assert_called_once_with(["dequest:key", "dequest:forever", "dequest:missing"])
+    assert pipeline.pttl.call_count == 3  # noqa: PLR2004
+    pipeline.execute.assert_called_once()
+
+
+def test_set_many_uses_a_pipeline():
+    driver = RedisDriver("localhost")
+    driver.client = MagicMock()
+    pipeline = driver.client.pipeline.return_value.__enter__.return_value
+
+    driver.set_many({"key": "value", "key2": "value2"}, 60)
+
+    driver.client.pipeline.assert_called_once_with(transaction=False)
+    assert pipeline.set.call_count == 2  # noqa: PLR2004
+    pipeline.set.assert_any_call("dequest:key", "value", ex=60)
+    pipeline.execute.assert_called_once()
+
+
+def test_factory_passes_pool_settings():
+    DequestConfig.config(redis_max_connections=32, redis_socket_timeout=0.5)
+    try:
+        with patch("dequest.cache.cache_drivers.redis_driver.redis.StrictRedis") as strict_redis:
+            CacheDriverFactory.create_driver("redis")
+    finally:
+        DequestConfig.config(redis_max_connections=None, redis_socket_timeout=None)
+
+    kwargs = strict_redis.call_args.kwargs
+    assert kwargs["max_connections"] == 32  # noqa: PLR2004
+    assert kwargs["socket_timeout"] == 0.5  # noqa: PLR2004
+
+
+def test_delete_prefix_scans_and_unlinks_in_batches():
+    driver = RedisDriver("localhost")
+    driver.client = MagicMock()
+    driver.client.scan_iter.return_value = iter(["dequest:users:1", "dequest:users:2", "dequest:users:3"])
+
+    driver.delete_prefix("users:", batch_size=2)
+
+    driver.client.scan_iter.assert_called_once_with(match="dequest:users:*", count=2)
+    assert driver.client.unlink.call_args_list == [
+        call("dequest:users:1", "dequest:users:2"),
+        call("dequest:users:3"),
+    ]
+
+
+def test_delete_prefix_escapes_glob_characters():
+    driver = RedisDriver("localhost", key_prefix="app[1]:")
+    driver.client = MagicMock()
+    driver.client.scan_iter.return_value = iter([])
+
+    driver.delete_prefix("*")
+
+    driver.client.scan_iter.assert_called_once_with(match=r"app\[1\]:\**", count=1000)
+    driver.client.unlink.assert_not_called()
+
+
+def test_clear_only_deletes_prefixed_keys():
+    driver = RedisDriver("localhost")
+    driver.client = MagicMock()
+    driver.client.scan_iter.return_value = iter(["dequest:key"])
+
+    driver.clear()
+
+    driver.client.scan_iter.assert_called_once_with(match="dequest:*", count=1000)
+    driver.client.unlink.assert_called_once_with("dequest:key")
+    driver.client.flushdb.assert_not_called()
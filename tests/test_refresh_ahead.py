@@ -0,0 +1,192 @@
+import asyncio
+import itertools
+import time
+
+import httpx
+import pytest
+
+from dequest import DequestClient, PathParameter, async_client, sync_client
+from dequest.cache.cache_drivers import InMemoryCacheDriver
+from dequest.clients._refresh import RefreshAhead
+from dequest.utils import AsyncLoopManager
+
+
+def _client(requests, status_code=200):
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(status_code, json={"path": request.url.path, "version": len(requests)})
+
+    return DequestClient(
+        cache_driver=InMemoryCacheDriver(),
+        transport=httpx.MockTransport(handler),
+        async_transport=httpx.MockTransport(handler),
+    )
+
+
+def _wait_for(condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_read_entries_are_refreshed_ahead_of_expiration():
+    requests = []
+
+    @sync_client(
+        url="https://api.example.com/config/{name}",
+        enable_cache=True,
+        cache_ttl=1,
+        refresh_ahead=0.2,
+        client=_client(requests),
+    )
+    def get_config(name: PathParameter[str]):
+        pass
+
+    assert get_config("flags")["version"] == 1
+    assert get_config("flags")["version"] == 1
+
+    assert _wait_for(lambda: len(requests) == 2)  # noqa: PLR2004
+    assert _wait_for(lambda: get_config("flags")["version"] == 2)  # noqa: PLR2004
+
+
+def test_unread_entries_are_left_to_expire():
+    requests = []
+
+    @sync_client(
+        url="https://api.example.com/config/{name}",
+        enable_cache=True,
+        cache_ttl=1,
+        refresh_ahead=0.1,
+        client=_client(requests),
+    )
+    def get_config(name: PathParameter[str]):
+        pass
+
+    get_config("flags")
+    time.sleep(0.3)
+
+    assert requests == ["/config/flags"]
+
+
+def test_refreshes_rebuild_the_request_headers():
+    tokens = itertools.count()
+    authorizations = []
+
+    def handler(request):
+        authorizations.append(request.headers["Authorization"])
+        return httpx.Response(200, json={"version": len(authorizations)})
+
+    @sync_client(
+        url="https://api.example.com/config",
+        enable_cache=True,
+        cache_ttl=1,
+        refresh_ahead=0.2,
+        auth_token=lambda: f"token-{next(tokens)}",
+        client=DequestClient(cache_driver=InMemoryCacheDriver(), transport=httpx.MockTransport(handler)),
+    )
+    def get_config():
+        pass
+
+    get_config()
+    get_config()
+
+    assert _wait_for(lambda: len(authorizations) == 2)  # noqa: PLR2004
+    # The second call read the cache, the refresh sends the third token
+    assert authorizations == ["Bearer token-0", "Bearer token-2"]
+
+
+@pytest.fixture
+def restart_loops():
+    yield
+    AsyncLoopManager._stop()
+    AsyncLoopManager._shut_down = False
+
+
+@pytest.mark.usefixtures("restart_loops")
+def test_nothing_is_scheduled_once_the_loops_are_shut_down():
+    refresher = RefreshAhead(0.5)
+    refresher.schedule("key", 60, lambda: None)
+    assert refresher.pending() == 1
+
+    AsyncLoopManager.shutdown()
+    assert refresher.pending() == 0
+
+    refresher.schedule("key", 60, lambda: None)
+    assert refresher.pending() == 0
+
+
+def test_refresh_ahead_validation():
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        RefreshAhead(1.5)
+    with pytest.raises(ValueError, match="requires enable_cache"):
+        sync_client(url="https://api.example.com/config", refresh_ahead=0.8)
+
+
+@pytest.mark.asyncio
+async def test_async_read_entries_are_refreshed():
+    requests = []
+
+    @async_client(
+        url="https://api.example.com/config/{name}",
+        enable_cache=True,
+        cache_ttl=1,
+        refresh_ahead=0.2,
+        client=_client(requests),
+    )
+    def get_config(name: PathParameter[str]):
+        pass
+
+    await asyncio.wrap_future(get_config("flags"))
+    await asyncio.wrap_future(get_config("flags"))
+    for _ in range(300):
+        if len(requests) == 2:  # noqa: PLR2004
+            break
+        await asyncio.sleep(0.01)
+
+    assert requests == ["/config/flags", "/config/flags"]
+
+
+def test_warm_prefills_the_cache():
+    requests = []
+
+    @sync_client(url="https://api.example.com/users/{user_id}", enable_cache=True, client=_client(requests))
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    assert get_user.warm([(1,), (2,), {"user_id": 3}]) == 3  # noqa: PLR2004
+    get_user(1)
+    get_user(user_id=3)
+
+    assert sorted(requests) == ["/users/1", "/users/2", "/users/3"]
+
+
+def test_warm_logs_failures(caplog):
+    @sync_client(url="https://api.example.com/users/{user_id}", enable_cache=True, client=_client([], 500))
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    assert get_user.warm([(1,)]) == 0
+    assert "Failed to warm the cache of" in caplog.text
+
+
+def test_async_warm_prefills_the_cache():
+    requests = []
+
+    @async_client(url="https://api.example.com/users/{user_id}", enable_cache=True, client=_client(requests))
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    assert get_user.warm([(1,), (2,)]).result(timeout=3) == 2  # noqa: PLR2004
+    get_user(1).result(timeout=3)
+
+    assert sorted(requests) == ["/users/1", "/users/2"]
+
+
+def test_warm_requires_the_cache():
+    @sync_client(url="https://api.example.com/users/{user_id}")
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    with pytest.raises(ValueError, match="requires enable_cache"):
+        get_user.warm([(1,)])
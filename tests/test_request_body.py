@@ -0,0 +1,101 @@
+import functools
+import gzip
+import json
+
+import pytest
+import respx
+
+from dequest import DequestConfig, JsonBody, sync_client
+from dequest.config import Compression
+from dequest.exceptions import DequestError
+
+URL = "https://api.example.com/reports"
+
+
+@pytest.fixture
+def compression():
+    DequestConfig.config(request_compression=Compression.GZIP, request_compression_min_size=100)
+    yield
+    DequestConfig.config(request_compression=None, request_compression_min_size=1024)
+
+
+@sync_client(url=URL, method="POST")
+def post_report(rows: JsonBody):
+    pass
+
+
+@pytest.mark.usefixtures("compression")
+@respx.mock
+def test_large_body_is_compressed():
+    route = respx.post(URL).respond(200, json={})
+    rows = [{"id": i, "name": f"row {i}"} for i in range(100)]
+
+    post_report(rows)
+
+    request = route.calls.last.request
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(gzip.decompress(request.content)) == {"rows": rows}
+
+
+@pytest.mark.usefixtures("compression")
+@respx.mock
+def test_small_body_is_not_compressed():
+    route = respx.post(URL).respond(200, json={})
+
+    post_report([1])
+
+    request = route.calls.last.request
+    assert "Content-Encoding" not in request.headers
+    assert json.loads(request.content) == {"rows": [1]}
+
+
+@respx.mock
+def test_zstd_compression():
+    zstandard = pytest.importorskip("zstandard")
+    route = respx.post(URL).respond(200, json={})
+    DequestConfig.config(request_compression=Compression.ZSTD, request_compression_min_size=0)
+    try:
+        post_report([1, 2, 3])
+    finally:
+        DequestConfig.config(request_compression=None, request_compression_min_size=1024)
+
+    request = route.calls.last.request
+    assert request.headers["Content-Encoding"] == "zstd"
+    assert json.loads(zstandard.ZstdDecompressor().decompress(request.content)) == {"rows": [1, 2, 3]}
+
+
+@respx.mock
+def test_pre_encoded_body_is_sent_as_is():
+    route = respx.post(URL).respond(200, json={})
+
+    @sync_client(url=URL, method="POST")
+    def post_raw_report(report: JsonBody):
+        pass
+
+    post_raw_report(b'{"rows": [1, 2]}')
+    post_raw_report(memoryview(b"[3]"))
+
+    assert [call.request.content for call in route.calls] == [b'{"rows": [1, 2]}', b"[3]"]
+    assert route.calls.last.request.headers["Content-Type"] == "application/json"
+
+
+def test_pre_encoded_body_must_be_the_only_json_body():
+    @sync_client(url=URL, method="POST")
+    def post_raw_report(report: JsonBody, name: JsonBody):
+        pass
+
+    with pytest.raises(DequestError, match="must be the only JsonBody"):
+        post_raw_report(b"{}", "monthly")
+
+
+@respx.mock
+def test_custom_request_json_encoder():
+    route = respx.post(URL).respond(200, json={})
+    DequestConfig.config(request_json_encoder=functools.partial(json.dumps, separators=(",", ":")))
+    try:
+        post_report([1, 2])
+    finally:
+        DequestConfig.config(request_json_encoder=None)
+
+    assert route.calls.last.request.content == b'{"rows":[1,2]}'
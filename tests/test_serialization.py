@@ -0,0 +1,41 @@
+import pytest
+
+from dequest import DequestConfig
+from dequest.config import JsonBackend
+from dequest.serialization import get_json_codec, json_dumps, json_loads
+
+BACKEND_MODULES = {
+    JsonBackend.STDLIB: "json",
+    JsonBackend.ORJSON: "orjson",
+    JsonBackend.UJSON: "ujson",
+    JsonBackend.MSGSPEC: "msgspec",
+}
+
+
+@pytest.fixture
+def json_backend(request):
+    pytest.importorskip(BACKEND_MODULES[request.param])
+    DequestConfig.config(JSON_BACKEND=request.param)
+    yield request.param
+    DequestConfig.config(JSON_BACKEND=JsonBackend.STDLIB)
+
+
+@pytest.mark.parametrize("json_backend", list(JsonBackend), indirect=True)
+def test_json_round_trip(json_backend):
+    document = {"name": "Zoë", "grades": [14, 15.5], "active": True, "address": None}
+
+    encoded = json_dumps(document)
+
+    assert isinstance(encoded, bytes)
+    assert json_loads(encoded) == document
+    assert json_loads(encoded.decode()) == document
+
+
+def test_default_json_backend_is_stdlib():
+    assert DequestConfig.JSON_BACKEND == JsonBackend.STDLIB
+    assert json_dumps({"key": "value"}) == b'{"key": "value"}'
+
+
+def test_invalid_json_backend():
+    with pytest.raises(ValueError, match="Invalid JSON backend"):
+        get_json_codec("simplejson")
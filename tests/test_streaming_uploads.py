@@ -0,0 +1,174 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+import respx
+
+from dequest import (
+    ConsumerType,
+    DequestClient,
+    DequestConfig,
+    FileBody,
+    JsonBody,
+    StreamBody,
+    async_client,
+    sync_client,
+)
+from dequest.exceptions import DequestError, InvalidParameterValueError
+
+URL = "https://api.example.com/uploads"
+REPORT = b"id,amount\n" + b"1,100\n" * 10_000
+
+
+@pytest.fixture
+def small_chunks():
+    DequestConfig.config(stream_chunk_size=1024)
+    yield
+    DequestConfig.config(stream_chunk_size=64 * 1024)
+
+
+@sync_client(url=URL, method="POST")
+def upload_file(report: FileBody):
+    pass
+
+
+@sync_client(url=URL, method="POST")
+def upload_stream(report: StreamBody):
+    pass
+
+
+@pytest.mark.usefixtures("small_chunks")
+@respx.mock
+def test_file_path_is_streamed_with_its_size(tmp_path):
+    route = respx.post(URL).respond(200, json={})
+    path = tmp_path / "report.csv"
+    path.write_bytes(REPORT)
+
+    upload_file(path)
+
+    request = route.calls.last.request
+    assert request.content == REPORT
+    assert request.headers["Content-Length"] == str(len(REPORT))
+    assert request.headers["Content-Type"] == "application/octet-stream"
+    assert "Transfer-Encoding" not in request.headers
+
+
+@respx.mock
+def test_file_object_with_content_type():
+    route = respx.post(URL).respond(200, json={})
+
+    upload_file(FileBody(io.BytesIO(REPORT), content_type="text/csv"))
+
+    request = route.calls.last.request
+    assert request.content == REPORT
+    assert request.headers["Content-Type"] == "text/csv"
+    assert request.headers["Transfer-Encoding"] == "chunked"
+
+
+@respx.mock
+def test_file_object_is_rewound_for_retries():
+    route = respx.post(URL).mock(side_effect=[httpx.ConnectError("refused"), httpx.Response(200, json={})])
+
+    @sync_client(url=URL, method="POST", retries=1, retry_on_exceptions=(httpx.ConnectError,), retry_delay=0)
+    def upload_with_retries(report: FileBody):
+        pass
+
+    file = io.BytesIO(b"header\n" + REPORT)
+    file.readline()
+    upload_with_retries(file)
+
+    assert route.calls.last.request.content == REPORT
+
+
+class _Pipe(io.BytesIO):
+    def seekable(self):
+        return False
+
+
+@respx.mock
+def test_unseekable_file_object_is_not_retried():
+    route = respx.post(URL).mock(side_effect=[httpx.ConnectError("refused"), httpx.Response(200, json={})])
+
+    @sync_client(url=URL, method="POST", retries=1, retry_on_exceptions=(httpx.ConnectError,), retry_delay=0)
+    def upload_with_retries(report: FileBody):
+        pass
+
+    with pytest.raises(DequestError, match="can only be sent once"):
+        upload_with_retries(_Pipe(REPORT))
+
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_generator_is_streamed_chunked():
+    route = respx.post(URL).respond(200, json={})
+
+    upload_stream(chunk for chunk in (b"first,", b"second"))
+
+    request = route.calls.last.request
+    assert request.content == b"first,second"
+    assert request.headers["Transfer-Encoding"] == "chunked"
+
+
+def test_generator_cannot_be_sent_twice():
+    body = StreamBody(iter([b"chunk"]))
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=request.read()))
+
+    @sync_client(url=URL, method="POST", consume=ConsumerType.TEXT, client=DequestClient(transport=transport))
+    def upload(report: StreamBody):
+        pass
+
+    assert upload(body) == "chunk"
+    with pytest.raises(DequestError, match="only be sent once"):
+        upload(body)
+
+
+def test_stream_must_be_the_only_body():
+    @sync_client(url=URL, method="POST")
+    def upload_with_name(report: FileBody, name: JsonBody):
+        pass
+
+    with pytest.raises(InvalidParameterValueError, match="only body parameter"):
+        upload_with_name(io.BytesIO(REPORT), "monthly")
+
+
+@pytest.mark.asyncio
+async def test_async_generator_is_streamed():
+    received = []
+
+    async def handler(request):
+        received.append(await request.aread())
+        return httpx.Response(200, json={})
+
+    @async_client(url=URL, method="POST", client=DequestClient(async_transport=httpx.MockTransport(handler)))
+    def upload(report: StreamBody):
+        pass
+
+    async def chunks():
+        for row in (b"1,100\n", b"2,200\n"):
+            await asyncio.sleep(0)
+            yield row
+
+    await asyncio.wrap_future(upload(chunks()))
+
+    assert received == [b"1,100\n2,200\n"]
+
+
+@pytest.mark.asyncio
+async def test_async_file_upload(tmp_path):
+    received = []
+
+    async def handler(request):
+        received.append((await request.aread(), request.headers["Content-Length"]))
+        return httpx.Response(200, json={})
+
+    @async_client(url=URL, method="POST", client=DequestClient(async_transport=httpx.MockTransport(handler)))
+    def upload(report: FileBody):
+        pass
+
+    path = tmp_path / "report.csv"
+    path.write_bytes(REPORT)
+    await asyncio.wrap_future(upload(str(path)))
+
+    assert received == [(REPORT, str(len(REPORT)))]
@@ -3,12 +3,14 @@ import http
 import json
 import time
 import urllib
+from dataclasses import dataclass
 
 import pytest
 import respx
 from httpx import HTTPError, Response
 
-from dequest import ConsumerType, FormParameter, JsonBody, PathParameter, sync_client
+from dequest import ConsumerType, DequestClient, FormParameter, JsonBody, PathParameter, sync_client
+from dequest.cache.cache_drivers import InMemoryCacheDriver
 from dequest.circuit_breaker import CircuitBreaker, CircuitBreakerState
 from dequest.exceptions import DequestError, InvalidParameterValueError
 
@@ -729,3 +731,86 @@ def test_sync_client_post_method_with_only_mapped_form_data():
         "birthday": ["2000-01-01"],
     }
     assert request.content.decode() == "name=Alice&grade=14&city=New+York&birthday=2000-01-01"
+
+
+@respx.mock
+def test_sync_client_xml_response_with_type_coercion():
+    data = (
+        "<students><student><name>Alice</name><grade>14</grade></student><student><name>Bob</name></student></students>"
+    )
+    expected_grade = 14
+    respx.get("https://api.example.com/classes/1").mock(return_value=Response(text=data, status_code=200))
+
+    @dataclass
+    class StudentDTO:
+        name: str
+        grade: int | None = None
+
+    @sync_client(
+        url="https://api.example.com/classes/{class_id}",
+        dto_class=StudentDTO,
+        consume=ConsumerType.XML,
+        coerce_types=True,
+    )
+    def get_students(class_id: PathParameter[int]):
+        pass
+
+    students = get_students(1)
+
+    assert students == [StudentDTO("Alice", expected_grade), StudentDTO("Bob")]
+
+
+@respx.mock
+def test_sync_client_map_returns_results_in_order():
+    respx.get(url__regex=r"https://api\.example\.com/users/\d+").mock(
+        side_effect=lambda request: Response(200, json={"path": request.url.path}),
+    )
+
+    @sync_client(url="https://api.example.com/users/{user_id}")
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    assert get_user.map([1, 2, 3]) == [{"path": f"/users/{i}"} for i in (1, 2, 3)]
+
+
+@respx.mock
+def test_sync_client_map_batches_cache_accesses():
+    class CountingDriver(InMemoryCacheDriver):
+        def __init__(self):
+            super().__init__()
+            self.calls = []
+
+        def get_key(self, key):
+            self.calls.append("get_key")
+            return super().get_key(key)
+
+        def get_many(self, keys):
+            self.calls.append("get_many")
+            return [super(CountingDriver, self).get_key(key) for key in keys]
+
+        def set_many(self, mapping, expire=None):
+            self.calls.append("set_many")
+            super().set_many(mapping, expire)
+
+    route = respx.get(url__regex=r"https://api\.example\.com/users/\d+").mock(
+        side_effect=lambda request: Response(200, json={"path": request.url.path}),
+    )
+    driver = CountingDriver()
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        enable_cache=True,
+        cache_ttl=60,
+        client=DequestClient(cache_driver=driver),
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    get_user(1)
+    driver.calls.clear()
+
+    assert get_user.map([1, 2, 3]) == [{"path": f"/users/{i}"} for i in (1, 2, 3)]
+    assert driver.calls == ["get_many", "set_many"]
+    assert route.call_count == 3  # noqa: PLR2004
+    assert get_user.map([1, 2, 3]) == [{"path": f"/users/{i}"} for i in (1, 2, 3)]
+    assert route.call_count == 3  # noqa: PLR2004
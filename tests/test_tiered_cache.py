@@ -0,0 +1,267 @@
+import time
+
+import pytest
+
+from dequest.cache import Cache
+from dequest.cache.cache_driver_factory import CacheDriverFactory
+from dequest.cache.cache_drivers import InMemoryCacheDriver, RedisDriver, TieredCacheDriver
+from dequest.config import CacheProvider, DequestConfig
+from dequest.metrics import InMemoryMetricsCollector
+
+
+class CountingDriver(InMemoryCacheDriver):
+    def __init__(self):
+        super().__init__()
+        self.gets = 0
+
+    def get_key(self, key):
+        self.gets += 1
+        return super().get_key(key)
+
+
+class FakePubSub:
+    def __init__(self):
+        self.handlers = {}
+
+    def subscribe(self, **handlers):
+        self.handlers |= handlers
+
+    def psubscribe(self, **handlers):
+        self.handlers |= handlers
+
+    def run_in_thread(self, sleep_time, daemon):
+        return self
+
+
+class FakeRedisClient:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+        self.published = []
+        self.connection_pool = type("Pool", (), {"connection_kwargs": {"db": 2}})()
+
+    def pubsub(self, ignore_subscribe_messages):
+        return self._pubsub
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+class FakeRedisDriver(CountingDriver):
+    def __init__(self):
+        super().__init__()
+        self.client = FakeRedisClient(FakePubSub())
+
+
+def test_l1_serves_repeated_reads():
+    l2 = CountingDriver()
+    driver = TieredCacheDriver(l2)
+    l2.set_key("key", "value")
+
+    assert [driver.get_key("key") for _ in range(5)] == ["value"] * 5
+    assert l2.gets == 1
+    assert driver.stats()["l1"] == {"hits": 4, "misses": 1, "hit_ratio": 0.8, "evictions": 0, "size": 1}
+    assert driver.stats()["l2"] == {"hits": 1, "misses": 0, "hit_ratio": 1.0}
+
+
+def test_set_key_writes_both_tiers():
+    l2 = CountingDriver()
+    driver = TieredCacheDriver(l2)
+
+    driver.set_key("key", "value", 60)
+
+    assert l2.get_key("key") == "value"
+    assert driver.get_key("key") == "value"
+    assert driver.stats()["l2"]["hits"] == 0
+
+
+def test_l1_entries_expire_after_l1_ttl():
+    l2 = CountingDriver()
+    driver = TieredCacheDriver(l2, l1_ttl=0.05)
+    driver.set_key("key", "value")
+
+    time.sleep(0.1)
+
+    assert driver.get_key("key") == "value"
+    assert l2.gets == 1
+
+
+def test_l1_is_bounded_lru():
+    driver = TieredCacheDriver(CountingDriver(), l1_max_entries=2)
+    driver.set_key("a", 1)
+    driver.set_key("b", 2)
+    driver.get_key("a")
+
+    driver.set_key("c", 3)
+
+    assert list(driver._l1) == ["a", "c"]
+    assert driver.stats()["l1"]["evictions"] == 1
+
+
+def test_delete_and_clear_evict_l1():
+    l2 = CountingDriver()
+    driver = TieredCacheDriver(l2)
+    driver.set_key("a", 1)
+    driver.set_key("b", 2)
+
+    driver.delete_key("a")
+    assert driver.get_key("a") is None
+
+    driver.clear()
+    assert driver.get_key("b") is None
+    assert driver.stats()["l1"]["size"] == 0
+
+
+def test_pubsub_invalidation_evicts_other_workers_entries():
+    l2 = FakeRedisDriver()
+    driver = TieredCacheDriver(l2, invalidation="pubsub")
+    driver.set_key("key", "value")
+    handler = l2.client._pubsub.handlers["dequest:invalidate"]
+    [(_, own_message)] = l2.client.published
+
+    # Own writes are ignored, the entry just written stays in L1
+    handler({"data": own_message})
+    assert "key" in driver._l1
+
+    handler({"data": "another-worker:key:key"})
+    assert "key" not in driver._l1
+
+
+def test_keyspace_invalidation():
+    l2 = FakeRedisDriver()
+    driver = TieredCacheDriver(l2, invalidation="keyspace")
+    l2.set_key("users:1", "value")
+    driver.get_key("users:1")
+
+    l2.client._pubsub.handlers["__keyspace@2__:*"]({"channel": "__keyspace@2__:users:1", "data": "set"})
+
+    assert "users:1" not in driver._l1
+    assert l2.client.published == []
+
+
+def test_keyspace_events_of_own_writes_keep_l1(monkeypatch):
+    l2 = FakeRedisDriver()
+    driver = TieredCacheDriver(l2, invalidation="keyspace")
+    handler = l2.client._pubsub.handlers["__keyspace@2__:*"]
+    driver.set_key("users:1", "value", 60)
+
+    handler({"channel": "__keyspace@2__:users:1", "data": "set"})
+    handler({"channel": "__keyspace@2__:users:1", "data": "expire"})
+    assert driver.get_key_l1("users:1") == "value"
+
+    handler({"channel": "__keyspace@2__:users:1", "data": "del"})
+    assert "users:1" not in driver._l1
+
+    # Past the window, a write event comes from another worker
+    monkeypatch.setattr("dequest.cache.cache_drivers.tiered_driver._OWN_WRITE_WINDOW", 0)
+    driver.set_many({"users:2": "value"}, 60)
+    handler({"channel": "__keyspace@2__:users:2", "data": "set"})
+    assert "users:2" not in driver._l1
+
+
+def test_l1_ttl_is_capped_at_the_remaining_l2_ttl():
+    l2 = CountingDriver()
+    driver = TieredCacheDriver(l2, l1_ttl=60)
+    l2.set_key("key", "value", 2)
+    l2.set_key("other", "value")
+
+    driver.get_many(["key", "other"])
+
+    assert driver._l1["key"][1] <= time.monotonic() + 2
+    assert driver._l1["other"][1] > time.monotonic() + 50
+
+
+def test_delete_prefix_evicts_matching_l1_entries():
+    l2 = FakeRedisDriver()
+    driver = TieredCacheDriver(l2, invalidation="pubsub")
+    driver.set_key("users:1", "a")
+    driver.set_key("orders:1", "b")
+
+    driver.delete_prefix("users:")
+
+    assert list(driver._l1) == ["orders:1"]
+    assert l2.get_key("users:1") is None
+    assert l2.client.published[-1] == ("dequest:invalidate", f"{driver._id}:prefix:users:")
+
+    driver.set_key("users:2", "c")
+    l2.client._pubsub.handlers["dequest:invalidate"]({"data": "another-worker:prefix:users:"})
+    assert list(driver._l1) == ["orders:1"]
+
+
+def test_keys_ending_with_a_star_are_not_prefixes():
+    l2 = FakeRedisDriver()
+    driver = TieredCacheDriver(l2, invalidation="pubsub")
+    handler = l2.client._pubsub.handlers["dequest:invalidate"]
+    driver.set_key("users*", "a")
+    driver.set_key("users:1", "b")
+
+    driver.delete_key("users*")
+    assert list(driver._l1) == ["users:1"]
+
+    driver.set_key("users*", "a")
+    handler({"data": "another-worker:key:users*"})
+    assert list(driver._l1) == ["users:1"]
+
+
+def test_keyspace_events_of_keys_ending_with_a_star_evict_the_key_only():
+    l2 = FakeRedisDriver()
+    driver = TieredCacheDriver(l2, invalidation="keyspace")
+    l2.set_many({"users*": "a", "users:1": "b"})
+    driver.get_many(["users*", "users:1"])
+
+    l2.client._pubsub.handlers["__keyspace@2__:*"]({"channel": "__keyspace@2__:users*", "data": "del"})
+
+    assert list(driver._l1) == ["users:1"]
+
+
+def test_keyspace_invalidation_strips_the_redis_key_prefix():
+    l2 = FakeRedisDriver()
+    l2.key_prefix = "dequest:"
+    driver = TieredCacheDriver(l2, invalidation="keyspace")
+    l2.set_key("users:1", "value")
+    driver.get_key("users:1")
+
+    l2.client._pubsub.handlers["__keyspace@2__:*"]({"channel": "__keyspace@2__:dequest:users:1", "data": "set"})
+
+    assert "users:1" not in driver._l1
+
+
+def test_invalidation_requires_redis():
+    with pytest.raises(ValueError, match="requires a RedisDriver"):
+        TieredCacheDriver(InMemoryCacheDriver(), invalidation="pubsub")
+
+
+def test_tier_events_are_reported_to_metrics():
+    collector = InMemoryMetricsCollector()
+    DequestConfig.config(metrics_collector=collector)
+    try:
+        cache = Cache("tiered", TieredCacheDriver(CountingDriver()))
+        cache.set_key("key", "value")
+        cache.get_key("key")
+    finally:
+        DequestConfig.config(metrics_collector=None)
+
+    assert collector.cache_hit_ratio("tiered.l1") == 1.0
+    assert collector.cache_hit_ratio("tiered") == 1.0
+
+
+def test_factory_builds_tiered_driver_from_config():
+    DequestConfig.config(tiered_l1_max_entries=10, tiered_l1_ttl=1)
+    try:
+        driver = CacheDriverFactory.create_driver(CacheProvider.TIERED)
+    finally:
+        DequestConfig.config(tiered_l1_max_entries=1024, tiered_l1_ttl=5)
+
+    assert isinstance(driver.l2, RedisDriver)
+    assert driver.l1_max_entries == 10  # noqa: PLR2004
+    assert driver.l1_ttl == 1
+
+
+def test_get_many_reads_l2_only_for_l1_misses():
+    l2 = CountingDriver()
+    l2.set_key("b", 2)
+    driver = TieredCacheDriver(l2)
+    driver.set_key("a", 1)
+
+    assert driver.get_many(["a", "b", "c"]) == [1, 2, None]
+    assert driver.stats()["l2"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+    assert driver.get_key_l1("b") == 2  # noqa: PLR2004
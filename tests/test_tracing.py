@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import HTTPError, Response
+
+from dequest import ConsumerType, DequestConfig, PathParameter, async_client, get_cache, sync_client
+from dequest.exceptions import DequestError
+from dequest.tracing import start_span
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+
+class UserDTO:
+    name: str
+
+    def __init__(self, name):
+        self.name = name
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    DequestConfig.config(TRACER=provider.get_tracer("dequest"))
+    yield exporter
+    DequestConfig.config(TRACER=None)
+
+
+def test_start_span_without_tracer():
+    with start_span("dequest.noop") as span:
+        assert span is None
+
+
+@respx.mock
+def test_sync_client_spans(exporter):
+    route = respx.get("https://api.example.com/users/1").mock(
+        side_effect=[Response(503), Response(200, json={"name": "Alice"})],
+    )
+    get_cache().clear()
+
+    @sync_client(
+        url="https://api.example.com/users/{user_id}",
+        dto_class=UserDTO,
+        enable_cache=True,
+        retries=1,
+        retry_delay=0,
+        retry_on_exceptions=(HTTPError,),
+    )
+    def get_user(user_id: PathParameter[int]):
+        pass
+
+    user = get_user(1)
+    spans = exporter.get_finished_spans()
+    call_span = spans[-1]
+
+    assert user.name == "Alice"
+    assert call_span.name == "dequest test_sync_client_spans.<locals>.get_user"
+    assert [span.name for span in spans] == [
+        "dequest.cache.lookup",
+        "GET",
+        "dequest.retry.backoff",
+        "dequest.cache.lookup",
+        "GET",
+        "dequest.map_json_to_dto",
+        call_span.name,
+    ]
+    assert all(span.parent.span_id == call_span.context.span_id for span in spans[:-1])
+    assert [span.attributes.get("http.response.status_code") for span in spans if span.name == "GET"] == [503, 200]
+    traceparent = route.calls[-1].request.headers["traceparent"]
+    assert traceparent.split("-")[1] == format(call_span.context.trace_id, "032x")
+
+
+@respx.mock
+def test_stream_span_ends_with_the_stream(exporter):
+    respx.get("https://api.example.com/files/1").mock(return_value=Response(200, content=b"data"))
+
+    @sync_client(url="https://api.example.com/files/{file_id}", consume=ConsumerType.STREAM)
+    def download(file_id: PathParameter[int]):
+        pass
+
+    with download(1) as stream:
+        assert "GET" not in [span.name for span in exporter.get_finished_spans()]
+        assert b"".join(stream) == b"data"
+
+    (span,) = [span for span in exporter.get_finished_spans() if span.name == "GET"]
+    assert span.attributes["http.response.status_code"] == 200  # noqa: PLR2004
+
+
+@respx.mock
+def test_failed_stream_span_records_the_error(exporter):
+    respx.get("https://api.example.com/files/1").mock(return_value=Response(404))
+
+    @sync_client(url="https://api.example.com/files/{file_id}", consume=ConsumerType.STREAM)
+    def download(file_id: PathParameter[int]):
+        pass
+
+    with pytest.raises(DequestError):
+        download(1)
+
+    (span,) = [span for span in exporter.get_finished_spans() if span.name == "GET"]
+    assert span.events[0].name == "exception"
+
+
+@pytest.mark.asyncio
+async def test_async_client_spans(exporter):
+    callback_called = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    async def callback(response):
+        loop.call_soon_threadsafe(callback_called.set)
+
+    with respx.mock:
+        respx.get("https://api.example.com/users/1").mock(return_value=Response(200, json={"name": "Alice"}))
+
+        @async_client(url="https://api.example.com/users/{user_id}", callback=callback)
+        def get_user(user_id: PathParameter[int]):
+            pass
+
+        get_user(1)
+        await asyncio.wait_for(callback_called.wait(), timeout=2)
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans["GET"].parent.span_id == spans["dequest test_async_client_spans.<locals>.get_user"].context.span_id
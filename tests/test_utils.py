@@ -1,8 +1,14 @@
+import datetime
+import decimal
+import enum
 from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import NamedTuple
 
 import pytest
 
-from dequest.utils import get_next_delay, map_json_to_dto
+from dequest.exceptions import InvalidParameterValueError
+from dequest.utils import generate_cache_key, get_next_delay, map_json_to_dto
 
 
 class AddressDTO:
@@ -106,6 +112,222 @@ def test_mapping_partial_dto_attributes_in_constructor():
     assert order.total_price == data["count"] * data["fee"]
 
 
+class Status(enum.Enum):
+    ACTIVE = "active"
+    BLOCKED = "blocked"
+
+
+@dataclass
+class AccountDTO:
+    id: int
+    balance: decimal.Decimal
+    rate: float
+    verified: bool
+    status: Status
+    created_at: datetime.datetime
+    addresses: list[AddressDTO]
+    manager: AddressDTO | None = None
+    tags: list[int] | None = None
+
+
+def test_mapping_with_type_coercion():
+    data = {
+        "id": "42",
+        "balance": 10.1,
+        "rate": "0.5",
+        "verified": "false",
+        "status": "blocked",
+        "created_at": "2024-05-01T10:30:00+00:00",
+        "addresses": [{"street": "123 Main St", "city": "Hometown"}],
+        "manager": None,
+        "tags": ["1", "2"],
+    }
+    expected_id = 42
+    expected_rate = 0.5
+
+    account = map_json_to_dto(AccountDTO, data, coerce_types=True)
+
+    assert account.id == expected_id
+    assert account.balance == decimal.Decimal("10.1")
+    assert account.rate == expected_rate
+    assert account.verified is False
+    assert account.status is Status.BLOCKED
+    assert account.created_at == datetime.datetime(2024, 5, 1, 10, 30, tzinfo=datetime.timezone.utc)
+    assert isinstance(account.addresses[0], AddressDTO)
+    assert account.addresses[0].city == "Hometown"
+    assert account.manager is None
+    assert account.tags == [1, 2]
+
+
+def test_mapping_without_type_coercion_keeps_raw_values():
+    data = {"id": "42", "balance": 10.1, "rate": "0.5", "verified": "false", "status": "blocked"}
+    data |= {"created_at": "2024-05-01T10:30:00+00:00", "addresses": [{"street": "123 Main St", "city": "Hometown"}]}
+
+    account = map_json_to_dto(AccountDTO, data)
+
+    assert account.id == "42"
+    assert account.verified == "false"
+    assert account.addresses == data["addresses"]
+
+
+def test_mapping_with_type_coercion_invalid_value():
+    data = {"id": "42", "balance": 1, "rate": 1, "verified": "maybe", "status": "active"}
+    data |= {"created_at": "2024-05-01", "addresses": []}
+
+    with pytest.raises(ValueError, match="Invalid boolean value"):
+        map_json_to_dto(AccountDTO, data, coerce_types=True)
+
+
+def test_mapping_with_type_coercion_rejects_non_integral_ints():
+    data = {"id": 1.9, "balance": 1, "rate": 1, "verified": True, "status": "active"}
+    data |= {"created_at": "2024-05-01", "addresses": []}
+
+    with pytest.raises(ValueError, match="Invalid integer value: 1.9"):
+        map_json_to_dto(AccountDTO, data, coerce_types=True)
+
+    assert map_json_to_dto(AccountDTO, data | {"id": 2.0}, coerce_types=True).id == 2  # noqa: PLR2004
+
+
+@dataclass(slots=True)
+class SlottedAddressDTO:
+    street: str
+    city: str
+
+
+class PointDTO(NamedTuple):
+    x: float
+    y: float
+    label: str = "origin"
+
+
+@dataclass(slots=True)
+class RouteDTO:
+    name: str
+    start: PointDTO
+    length: int = 0
+
+
+def test_mapping_slotted_dataclass():
+    data = [{"street": "123 Main St", "city": "Hometown"}, {"street": "456 Elm St", "city": "OtherTown"}]
+
+    addresses = map_json_to_dto(SlottedAddressDTO, data)
+
+    assert addresses == [SlottedAddressDTO("123 Main St", "Hometown"), SlottedAddressDTO("456 Elm St", "OtherTown")]
+    assert not hasattr(addresses[0], "__dict__")
+
+
+def test_mapping_named_tuple():
+    data = {"name": "Ring", "start": {"x": "1.5", "y": 2}, "length": "12"}
+    expected_length = 12
+
+    route = map_json_to_dto(RouteDTO, data, coerce_types=True)
+
+    assert route.start == PointDTO(1.5, 2.0)
+    assert route.length == expected_length
+
+
+def test_mapping_attrs_slotted_class():
+    attrs = pytest.importorskip("attrs")
+
+    @attrs.define
+    class TokenDTO:
+        value: str
+        _scope: str
+        expires_in: int = attrs.field(converter=int)
+
+    token = map_json_to_dto(TokenDTO, {"value": "abc", "_scope": "read", "expires_in": "60", "unknown": 1})
+
+    assert token == TokenDTO("abc", "read", 60)
+    assert not hasattr(token, "__dict__")
+
+
+def test_mapping_columnar():
+    data = {
+        "routes": [
+            {"name": "Ring", "start": {"x": 1, "y": 2}, "length": "12"},
+            {"name": "Loop", "start": {"x": 3, "y": 4}},
+        ],
+    }
+
+    columns = map_json_to_dto(RouteDTO, data, "routes", coerce_types=True, columnar=True)
+
+    assert columns == {
+        "name": ["Ring", "Loop"],
+        "start": [PointDTO(1.0, 2.0), PointDTO(3.0, 4.0)],
+        "length": [12, 0],
+    }
+
+
+def test_mapping_columnar_fills_missing_fields_with_their_defaults():
+    attrs = pytest.importorskip("attrs")
+
+    @dataclass
+    class TagDTO:
+        name: str
+        aliases: list[str] = field(default_factory=list)
+
+    @attrs.define
+    class LabelDTO:
+        name: str
+        _color: str = "grey"
+        aliases: list[str] = attrs.Factory(list)
+
+    data = [{"name": "a", "aliases": ["b"]}, {"name": "c"}]
+
+    assert map_json_to_dto(TagDTO, data, columnar=True) == {"name": ["a", "c"], "aliases": [["b"], []]}
+    assert map_json_to_dto(LabelDTO, data, columnar=True) == {
+        "name": ["a", "c"],
+        "_color": ["grey", "grey"],
+        "aliases": [["b"], []],
+    }
+
+
+def test_mapping_pydantic_model():
+    pydantic = pytest.importorskip("pydantic")
+
+    class CityModel(pydantic.BaseModel):
+        name: str
+        population: int
+
+    data = {"cities": [{"name": "Hometown", "population": "1200"}, {"name": "OtherTown", "population": 800}]}
+    expected_population = 1200
+
+    cities = map_json_to_dto(CityModel, data, "cities")
+    city = map_json_to_dto(CityModel, b'{"name": "Hometown", "population": 1200}')
+
+    assert cities == [CityModel(name="Hometown", population=1200), CityModel(name="OtherTown", population=800)]
+    assert city.population == expected_population
+
+
+def test_mapping_pydantic_model_validation_error():
+    pydantic = pytest.importorskip("pydantic")
+
+    class CityModel(pydantic.BaseModel):
+        name: str
+        population: int
+
+    with pytest.raises(pydantic.ValidationError):
+        map_json_to_dto(CityModel, '[{"name": "Hometown", "population": "many"}]')
+
+
+def test_mapping_msgspec_struct():
+    msgspec = pytest.importorskip("msgspec")
+
+    class CityStruct(msgspec.Struct):
+        name: str
+        population: int
+
+    raw = b'[{"name": "Hometown", "population": 1200}, {"name": "OtherTown", "population": 800}]'
+
+    assert map_json_to_dto(CityStruct, raw) == [CityStruct("Hometown", 1200), CityStruct("OtherTown", 800)]
+    assert map_json_to_dto(CityStruct, {"name": "Hometown", "population": "1200"}, coerce_types=True) == CityStruct(
+        "Hometown",
+        1200,
+    )
+    with pytest.raises(msgspec.ValidationError):
+        map_json_to_dto(CityStruct, {"name": "Hometown", "population": "1200"})
+
+
 def delay_gen() -> Iterator[float]:
     yield 1.5
     yield 2.5
@@ -135,3 +357,63 @@ def test_get_next_delay_generator_exhausted():
 
     with pytest.raises(StopIteration):
         get_next_delay(gen)
+
+
+def test_cache_key_is_stable_and_order_independent():
+    key = generate_cache_key("https://api.example.com/users", {"page": 1, "sort": "name"})
+
+    assert key == generate_cache_key("https://api.example.com/users", {"sort": "name", "page": 1})
+    assert key != generate_cache_key("https://api.example.com/users", {"page": 2, "sort": "name"})
+    assert generate_cache_key("https://api.example.com/users", None) == generate_cache_key(
+        "https://api.example.com/users",
+        {},
+    )
+
+
+def test_cache_key_does_not_collide_on_separators():
+    url = "https://api.example.com/users"
+
+    assert generate_cache_key(url, {"a": "1\n'b'=2"}) != generate_cache_key(url, {"a": "1", "b": 2})
+    assert generate_cache_key(url, {"a": "1"}) != generate_cache_key(url, {"a": 1})
+    assert generate_cache_key(url, None, {"a": "1"}) != generate_cache_key(url, {"a": "1"})
+
+
+def test_cache_key_supports_values_json_cannot_encode():
+    key = generate_cache_key("https://api.example.com/orders", {"since": datetime.date(2026, 1, 1)})
+
+    assert key == generate_cache_key("https://api.example.com/orders", {"since": datetime.date(2026, 1, 1)})
+
+
+def test_cache_key_canonicalizes_nested_containers():
+    url = "https://api.example.com/search"
+
+    assert generate_cache_key(url, {"a": {"x": 1, "y": 2}}) == generate_cache_key(url, {"a": {"y": 2, "x": 1}})
+    assert generate_cache_key(url, {"a": [{"x": 1, "y": {3, 1, 2}}]}) == generate_cache_key(
+        url,
+        {"a": [{"y": {2, 3, 1}, "x": 1}]},
+    )
+    assert generate_cache_key(url, {"a": [1, 2]}) != generate_cache_key(url, {"a": [2, 1]})
+    assert generate_cache_key(url, {"a": [1, 2]}) != generate_cache_key(url, {"a": (1, 2)})
+
+
+def test_cache_key_rejects_values_without_a_stable_repr():
+    class Filter:
+        pass
+
+    with pytest.raises(InvalidParameterValueError, match="Filter values cannot be part of a cache key"):
+        generate_cache_key("https://api.example.com/search", {"filter": {"nested": Filter()}})
+
+
+def test_cache_key_varies_on_headers_case_insensitively():
+    url = "https://api.example.com/users"
+
+    assert generate_cache_key(url, None, {"Accept-Language": "fr"}) == generate_cache_key(
+        url,
+        None,
+        {"accept-language": "fr"},
+    )
+    assert generate_cache_key(url, None, {"Accept-Language": "fr"}) != generate_cache_key(
+        url,
+        None,
+        {"Accept-Language": "de"},
+    )
@@ -1,6 +1,11 @@
+import datetime
+import io
+from collections.abc import Iterator
+from dataclasses import dataclass
+
 import pytest
 
-from dequest.utils import map_xml_to_dto
+from dequest.utils import iter_xml_to_dto, map_xml_to_dto
 
 
 class SimpleDTO:
@@ -21,6 +26,15 @@ class NestedDTO:
         self.details = details
 
 
+@dataclass
+class LibraryDTO:
+    name: str
+    opened: datetime.date
+    open_on_weekends: bool
+    books: list[NestedDTO]
+    visitors: list[int]
+
+
 def test_mapping_attributes():
     xml_data = '<Person name="John" age="30" />'
     expected_age = 30
@@ -122,3 +136,78 @@ def test_nested_dto_attributes_and_children():
     assert dto.title == "Python Guide"
     assert dto.details.name == "Alice"
     assert dto.details.age == expected_age
+
+
+def test_iter_xml_to_dto_root_children():
+    xml_data = '<People><Person name="Alice" age="25" /><Person><name>Bob</name><age>30</age></Person></People>'
+    expected_first_record_age = 25
+    expected_second_record_age = 30
+
+    dtos = iter_xml_to_dto(SimpleDTO, xml_data)
+
+    assert isinstance(dtos, Iterator)
+    dtos = list(dtos)
+    assert [dto.name for dto in dtos] == ["Alice", "Bob"]
+    assert dtos[0].age == expected_first_record_age
+    assert dtos[1].age == expected_second_record_age
+
+
+def test_iter_xml_to_dto_with_source_field():
+    xml_data = (
+        b"<Position><Salary>1000</Salary><Persons><Person><name>John</name><age>30</age></Person>"
+        b"<Person><name>Alex</name><age>31</age></Person></Persons><Persons /></Position>"
+    )
+
+    dtos = list(iter_xml_to_dto(SimpleDTO, io.BytesIO(xml_data), "Persons"))
+
+    assert [dto.name for dto in dtos] == ["John", "Alex"]
+
+
+def test_iter_xml_to_dto_nested_dto():
+    xml_data = (
+        "<Books><Book><title>Python Guide</title><details><name>Alice</name><age>25</age></details></Book>"
+        '<Book title="XML Guide"><details name="Bob" age="30" /></Book></Books>'
+    )
+    expected_age = 25
+
+    dtos = list(iter_xml_to_dto(NestedDTO, xml_data))
+
+    assert [dto.title for dto in dtos] == ["Python Guide", "XML Guide"]
+    assert dtos[0].details.age == expected_age
+    assert dtos[1].details.name == "Bob"
+
+
+def test_iter_xml_to_dto_missing_source_field():
+    xml_data = "<Position><Salary>1000</Salary></Position>"
+
+    with pytest.raises(ValueError, match="Source field 'Persons' not found"):
+        list(iter_xml_to_dto(SimpleDTO, xml_data, "Persons"))
+
+
+def test_mapping_with_type_coercion():
+    xml_data = (
+        '<Library name="Central" opened="1999-04-01"><open_on_weekends>true</open_on_weekends>'
+        "<books><Book><title>Python Guide</title><details><name>Alice</name><age>25</age></details></Book></books>"
+        "<visitors><day>120</day><day>98</day></visitors></Library>"
+    )
+    expected_age = 25
+
+    dto = map_xml_to_dto(LibraryDTO, xml_data, coerce_types=True)
+
+    assert dto.opened == datetime.date(1999, 4, 1)
+    assert dto.open_on_weekends is True
+    assert dto.books[0].title == "Python Guide"
+    assert dto.books[0].details.age == expected_age
+    assert dto.visitors == [120, 98]
+
+
+@pytest.mark.parametrize("coerce_types", [False, True])
+def test_nested_dto_is_mapped_from_the_child_element_not_the_attribute(coerce_types):
+    xml_data = '<Book title="XML Guide" details="summary"><details><name>Bob</name><age>30</age></details></Book>'
+    expected_age = 30
+
+    dto = map_xml_to_dto(NestedDTO, xml_data, coerce_types=coerce_types)
+
+    assert dto.title == "XML Guide"
+    assert dto.details.name == "Bob"
+    assert dto.details.age == expected_age